@@ -1,17 +1,30 @@
 from django.urls import path
 from rest_framework.routers import DefaultRouter
-from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView, TokenVerifyView
-from apps.user.views import UserView
+from rest_framework_simplejwt.views import TokenVerifyView
+from apps.user.views import UserView, TokenObtainPairWithClaimsView, TokenRefreshWithClaimsView
 from apps.credit_card.views import CreditCardView
+from apps.restaurant.views import RestaurantView
+from apps.order.views import CartView, OrderView, StoreOrderView
+from apps.sales.views import OrderExportView, SalesView
+from apps.common.views import DatabasePoolStatsView, EventStreamTicketView, ProfileView
 
 router = DefaultRouter(trailing_slash=False)
 router.register(r'users', UserView, basename='users')
 router.register(r'credit-cards', CreditCardView, basename='credit_cards')
+router.register(r'restaurants', RestaurantView, basename='restaurants')
+router.register(r'orders', OrderView, basename='orders')
+router.register(r'store-orders', StoreOrderView, basename='store_orders')
+router.register(r'cart', CartView, basename='cart')
+router.register(r'sales', SalesView, basename='sales')
+router.register(r'internal/profiles', ProfileView, basename='profiles')
 
 urlpatterns = [
-    path('token', TokenObtainPairView.as_view()),
-    path('token/refresh', TokenRefreshView.as_view()),
+    path('token', TokenObtainPairWithClaimsView.as_view()),
+    path('token/refresh', TokenRefreshWithClaimsView.as_view()),
     path('token/verify', TokenVerifyView.as_view()),
+    path('events/ticket', EventStreamTicketView.as_view()),
+    path('internal/db-pool', DatabasePoolStatsView.as_view()),
+    path('exports/orders', OrderExportView.as_view()),
 ]
 
 urlpatterns += router.urls
\ No newline at end of file
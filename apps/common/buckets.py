@@ -0,0 +1,133 @@
+"""
+the token buckets of the rate limits of apps.common.throttling
+
+a bucket holds up to `capacity` tokens refilled by `rate` tokens a second, and each request takes one of them.
+the buckets live in a table of memory shared by the gunicorn workers, created by share() in the master before
+the workers are forked (see configs/gunicorn.py), or in the process when it is not shared, like on runserver.
+the shared table is an anonymous mmap of fixed slots found by the hash of the keys,
+when the slots of a key are all taken the least recently updated bucket is dropped, likely refilled by then.
+
+the keys denied in the process are turned away in the process until their buckets are refilled,
+so a flood of the same key doesn't wait for the lock of the shared table.
+no django here, the master of gunicorn imports this module before django is set up.
+"""
+import collections
+import hashlib
+import mmap
+import multiprocessing
+import struct
+import threading
+import time
+import typing
+
+SLOT = struct.Struct('Qdd')  # the hash of the key, the tokens and when they were counted
+PROBES = 8  # the slots a key may take
+LOCAL_MAX_SIZE = 65536  # the buckets and the denied keys kept in the process
+
+
+def take_token(tokens: float, updated_at: float, now: float, rate: float,
+               capacity: float) -> typing.Tuple[float, float]:
+    """
+    returns the tokens left, and 0 when a token is taken or the seconds until one is refilled
+    """
+    tokens = min(capacity, tokens + (now - updated_at) * rate)
+    if tokens >= 1:
+        return tokens - 1, 0.0
+    return tokens, (1 - tokens) / rate
+
+
+class LocalBuckets:
+    def __init__(self, max_size: int = LOCAL_MAX_SIZE):
+        self.max_size = max_size
+        self.buckets = collections.OrderedDict()  # the least recently updated first
+        self.lock = threading.Lock()
+
+    def take(self, key: str, rate: float, capacity: float,
+             now: float) -> float:
+        with self.lock:
+            tokens, updated_at = self.buckets.pop(key, (capacity, now))
+            tokens, wait = take_token(tokens, updated_at, now, rate,
+                                      capacity)
+            self.buckets[key] = (tokens, now)
+            if len(self.buckets) > self.max_size:
+                self.buckets.popitem(last=False)
+        return wait
+
+    def clear(self):
+        with self.lock:
+            self.buckets.clear()
+
+
+class SharedBuckets:
+    def __init__(self, slots: int):
+        self.slots = slots
+        self.memory = mmap.mmap(-1, slots * SLOT.size)  # shared with the forked processes
+        self.lock = multiprocessing.Lock()
+
+    def take(self, key: str, rate: float, capacity: float,
+             now: float) -> float:
+        digest = int.from_bytes(
+            hashlib.blake2b(key.encode(), digest_size=8).digest(),
+            'little') or 1  # 0 is the empty slot
+        with self.lock:
+            oldest = None
+            for probe in range(PROBES):
+                offset = (digest + probe) % self.slots * SLOT.size
+                slot_digest, tokens, updated_at = SLOT.unpack_from(
+                    self.memory, offset)
+                if slot_digest == digest:
+                    break
+                if slot_digest == 0:
+                    tokens, updated_at = capacity, now
+                    break
+                if oldest is None or updated_at < oldest[1]:
+                    oldest = (offset, updated_at)
+            else:
+                offset = oldest[0]
+                tokens, updated_at = capacity, now
+            tokens, wait = take_token(tokens, updated_at, now, rate,
+                                      capacity)
+            SLOT.pack_into(self.memory, offset, digest, tokens, now)
+        return wait
+
+    def clear(self):
+        with self.lock:
+            self.memory[:] = bytes(len(self.memory))
+
+
+local = LocalBuckets()
+shared: typing.Optional[SharedBuckets] = None
+denied_until: typing.Dict[str, float] = {}
+
+
+def share(slots: int = 65536):
+    """
+    moves the buckets to a table shared with the processes forked afterwards
+    """
+    global shared
+    shared = SharedBuckets(slots)
+
+
+def take(key: str, rate: float, capacity: float) -> float:
+    """
+    takes a token from the bucket of the key, returns 0 or the seconds until a token is refilled
+    """
+    now = time.monotonic()  # the same clock for the processes of the host
+    until = denied_until.get(key)
+    if until is not None:
+        if now < until:
+            return until - now
+        denied_until.pop(key, None)
+    wait = (shared or local).take(key, rate, capacity, now)
+    if wait:
+        if len(denied_until) >= LOCAL_MAX_SIZE:
+            denied_until.clear()
+        denied_until[key] = now + wait
+    return wait
+
+
+def clear():
+    local.clear()
+    denied_until.clear()
+    if shared is not None:
+        shared.clear()
@@ -0,0 +1,110 @@
+"""
+the query budgets of the views
+
+a view declares the most queries a request to it may run, by `query_budget`,
+or by the actions of a viewset in `query_budgets` like {'list': 1}.
+a budget shouldn't grow with the rows a request reads, so it catches the N+1 queries.
+
+assert_query_budget() of apps.common.test checks the budget of an action over the datasets of different sizes,
+and QueryBudgetMiddleware counts the queries of each request against the budget of its view at runtime,
+logging or raising by settings.QUERY_BUDGET_MODE, which is off in production.
+"""
+import contextlib
+import logging
+import typing
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.db import connections
+from django.http.request import HttpRequest
+
+logger = logging.getLogger(__name__)
+
+MODES = ('log', 'raise')
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def get_budget(view: type, action: str = None) -> typing.Optional[int]:
+    """
+    returns the budget of the action of the view class, or of the whole view.
+    """
+    budgets = getattr(view, 'query_budgets', {})
+    if action in budgets:
+        return budgets[action]
+    return getattr(view, 'query_budget', None)
+
+
+def resolve_view(
+        request: HttpRequest, view_func: typing.Callable
+) -> typing.Tuple[typing.Optional[type], typing.Optional[str]]:
+    """
+    returns the class and the action of the view resolved for the request,
+    from the attributes which the as_view() of rest_framework leaves on the view function.
+    """
+    view = getattr(view_func, 'cls', None)
+    actions = getattr(view_func, 'actions', None) or {}
+    return view, actions.get(request.method.lower())
+
+
+def get_view_name(request: HttpRequest, view_func: typing.Callable) -> str:
+    view, action = resolve_view(request, view_func)
+    if view is None:
+        name = getattr(view_func, '__name__', type(view_func).__name__)
+        return f'{view_func.__module__}.{name}'
+    return view.__name__ if action is None else f'{view.__name__}.{action}'
+
+
+def get_view_budget(
+        request: HttpRequest, view_func: typing.Callable
+) -> typing.Tuple[str, typing.Optional[int]]:
+    """
+    returns the name and the budget of the view resolved for the request.
+    """
+    view, action = resolve_view(request, view_func)
+    budget = None if view is None else get_budget(view, action)
+    return get_view_name(request, view_func), budget
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class QueryBudgetMiddleware:
+    """
+    counts the queries of the requests to the views with the budgets, on every database.
+    QUERY_BUDGET_MODE 'log' logs the requests over the budgets, 'raise' fails them, for the tests and staging.
+    """
+    def __init__(self, get_response):
+        if not settings.QUERY_BUDGET_MODE:
+            raise MiddlewareNotUsed()
+        if settings.QUERY_BUDGET_MODE not in MODES:
+            raise ImproperlyConfigured(
+                f'QUERY_BUDGET_MODE should be one of {MODES}')
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest):
+        counter = QueryCounter()
+        with contextlib.ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+
+        name, budget = getattr(request, '_query_budget', (None, None))
+        if budget is not None and counter.count > budget:
+            message = (f'{request.method} {request.path} ran {counter.count} '
+                       f'queries over the budget {budget} of {name}')
+            if settings.QUERY_BUDGET_MODE == 'raise':
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
+
+    def process_view(self, request: HttpRequest, view_func, view_args,
+                     view_kwargs):
+        request._query_budget = get_view_budget(request, view_func)
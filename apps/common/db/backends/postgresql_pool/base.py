@@ -0,0 +1,84 @@
+"""
+PostgreSQL backend which keeps the connections in a per-process pool
+
+django closes the connection at the end of every request (CONN_MAX_AGE = 0),
+which returns the connection to the pool instead of closing it.
+both of the wsgi and asgi handlers close the connections on the request_finished signal,
+so the pool works the same with pangpangeats.wsgi and pangpangeats.asgi.
+the pool is configured by the POOL dictionary of the database settings, see apps.common.db.pool.ConnectionPool.
+"""
+import psycopg2.extensions
+from django.db.backends.postgresql import base
+from apps.common.db.backends.postgresql_pool.creation import DatabaseCreation
+from apps.common.db.pool import ConnectionPool, get_pool
+
+
+def is_healthy(connection) -> bool:
+    if connection.closed:
+        return False
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+    except psycopg2.Error:
+        return False
+    return True
+
+
+def close(connection):
+    if not connection.closed:
+        connection.close()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+
+    def get_pool(self, conn_params: dict) -> ConnectionPool:
+        key = (self.alias, ) + tuple(
+            conn_params.get(param)
+            for param in ('host', 'port', 'database', 'user'))
+        options = {
+            key.lower(): value
+            for key, value in self.settings_dict.get('POOL', {}).items()
+        }
+        return get_pool(
+            key, lambda: ConnectionPool(
+                connect=lambda: super(DatabaseWrapper, self).
+                get_new_connection(conn_params),
+                is_healthy=is_healthy,
+                close=close,
+                **options,
+            ))
+
+    def get_new_connection(self, conn_params):
+        connection = self.get_pool(conn_params).acquire()
+        options = self.settings_dict['OPTIONS']
+        self.isolation_level = options.get('isolation_level',
+                                           connection.isolation_level)
+        return connection
+
+    def _close(self):
+        if self.connection is None:
+            return
+        pool = self.get_pool(self.get_connection_params())
+        with self.wrap_database_errors:
+            pool.release(self.connection,
+                         discard=not self.reset_connection(self.connection))
+
+    def reset_connection(self, connection) -> bool:
+        """
+        rolls back the transaction left open on the connection.
+        returns False when the connection can't be reused.
+        """
+        if connection.closed:
+            return False
+        status = connection.info.transaction_status
+        if status == psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+            return True
+        if status in (psycopg2.extensions.TRANSACTION_STATUS_INTRANS,
+                      psycopg2.extensions.TRANSACTION_STATUS_INERROR):
+            try:
+                connection.rollback()
+            except psycopg2.Error:
+                return False
+            return True
+        return False  # busy or unknown
@@ -0,0 +1,14 @@
+from django.db.backends.postgresql import creation
+from apps.common.db.pool import close_pools
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    # postgres refuses to drop or copy a database with open connections, so the pooled ones are closed first
+
+    def _destroy_test_db(self, test_database_name, verbosity):
+        close_pools()
+        super()._destroy_test_db(test_database_name, verbosity)
+
+    def _clone_test_db(self, suffix, verbosity, keepdb=False):
+        close_pools()
+        super()._clone_test_db(suffix, verbosity, keepdb)
@@ -0,0 +1,193 @@
+import atexit
+import os
+import threading
+import time
+import typing
+
+Connection = typing.Any
+
+
+class PoolExhausted(Exception):
+    pass
+
+
+class _Entry:
+    __slots__ = ('connection', 'created_at', 'last_used_at')
+
+    def __init__(self, connection: Connection):
+        self.connection = connection
+        self.created_at = self.last_used_at = time.monotonic()
+
+
+class ConnectionPool:
+    """
+    a bounded pool of database connections of a single process
+
+    the idle connections are reused in LIFO order, so the rarely used ones get old and are recycled.
+    a connection is
+    1. closed when it is older than `max_lifetime` or it was idle longer than `max_idle` seconds
+    2. health checked when it was idle longer than `health_check_interval` seconds
+    3. waited at most `timeout` seconds for, when all of the `max_size` connections are in use
+    """
+    def __init__(
+        self,
+        connect: typing.Callable[[], Connection],
+        is_healthy: typing.Callable[[Connection], bool],
+        close: typing.Callable[[Connection], None],
+        max_size: int = 4,
+        max_lifetime: float = 600,
+        max_idle: float = 60,
+        health_check_interval: float = 10,
+        timeout: float = 5,
+    ):
+        self.connect = connect
+        self.is_healthy = is_healthy
+        self.close = close
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.max_idle = max_idle
+        self.health_check_interval = health_check_interval
+        self.timeout = timeout
+
+        self._condition = threading.Condition()
+        self._idle: typing.List[_Entry] = []
+        self._in_use: typing.Dict[int, _Entry] = {}
+        self._reserved = 0  # slots of the connections being created
+        self._counters = dict.fromkeys(
+            ('created', 'reused', 'recycled', 'health_check_failures',
+             'waits', 'timeouts'), 0)
+
+    def acquire(self) -> Connection:
+        deadline = time.monotonic() + self.timeout
+        while True:
+            entry = self._take_idle_or_reserve(deadline)
+            if entry is None:  # a slot is reserved for a new connection
+                return self._create()
+            now = time.monotonic()
+            if self._is_obsolete(entry, now):
+                self._discard(entry, 'recycled')
+                continue
+            if now - entry.last_used_at >= self.health_check_interval and not self.is_healthy(
+                    entry.connection):
+                self._discard(entry, 'health_check_failures')
+                continue
+            with self._condition:
+                self._counters['reused'] += 1
+            return entry.connection
+
+    def release(self, connection: Connection, discard: bool = False):
+        with self._condition:
+            entry = self._in_use.get(id(connection))
+        if entry is None:  # not from this pool, e.g. the pool was reset after a fork
+            self.close(connection)
+            return
+        entry.last_used_at = time.monotonic()
+        if discard or self._is_obsolete(entry, entry.last_used_at):
+            self._discard(entry, 'recycled')
+            return
+        with self._condition:
+            del self._in_use[id(connection)]
+            self._idle.append(entry)
+            self._condition.notify()
+
+    def close_idle(self):
+        with self._condition:
+            idle, self._idle = self._idle, []
+        for entry in idle:
+            self.close(entry.connection)
+
+    def stats(self) -> dict:
+        with self._condition:
+            return {
+                'max_size': self.max_size,
+                'size': len(self._idle) + len(self._in_use) + self._reserved,
+                'idle': len(self._idle),
+                'in_use': len(self._in_use),
+                **self._counters,
+            }
+
+    def _take_idle_or_reserve(self, deadline: float) -> typing.Optional[_Entry]:
+        with self._condition:
+            waited = False
+            while True:
+                if self._idle:
+                    entry = self._idle.pop()
+                    self._in_use[id(entry.connection)] = entry
+                    return entry
+                if len(self._in_use) + self._reserved < self.max_size:
+                    self._reserved += 1
+                    return None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._counters['timeouts'] += 1
+                    raise PoolExhausted(
+                        f'all {self.max_size} connections are in use')
+                if not waited:
+                    self._counters['waits'] += 1
+                    waited = True
+                self._condition.wait(remaining)
+
+    def _create(self) -> Connection:
+        try:
+            connection = self.connect()
+        except BaseException:
+            with self._condition:
+                self._reserved -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._reserved -= 1
+            self._in_use[id(connection)] = _Entry(connection)
+            self._counters['created'] += 1
+        return connection
+
+    def _discard(self, entry: _Entry, reason: str):
+        with self._condition:
+            self._in_use.pop(id(entry.connection), None)
+            self._counters[reason] += 1
+            self._condition.notify()
+        try:
+            self.close(entry.connection)
+        except Exception:  # the connection may be broken already
+            pass
+
+    def _is_obsolete(self, entry: _Entry, now: float) -> bool:
+        return (now - entry.created_at >= self.max_lifetime
+                or now - entry.last_used_at >= self.max_idle)
+
+
+# the pools of the current process
+_pools: typing.Dict[typing.Hashable, ConnectionPool] = {}
+_pools_pid = os.getpid()
+_pools_lock = threading.Lock()
+# pools inherited from the parent process by fork.
+# their connections share the sockets with the parent, so they are kept referenced to never be closed here.
+_inherited_pools: typing.List[ConnectionPool] = []
+
+
+def get_pool(key: typing.Hashable,
+             factory: typing.Callable[[], ConnectionPool]) -> ConnectionPool:
+    global _pools_pid
+    with _pools_lock:
+        if _pools_pid != os.getpid():
+            _inherited_pools.extend(_pools.values())
+            _pools.clear()
+            _pools_pid = os.getpid()
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = factory()
+        return pool
+
+
+def get_pools_stats() -> typing.List[dict]:
+    with _pools_lock:
+        pools = list(_pools.items()) if _pools_pid == os.getpid() else []
+    return [{'pool': str(key), **pool.stats()} for key, pool in pools]
+
+
+@atexit.register
+def close_pools():
+    with _pools_lock:
+        pools = list(_pools.values()) if _pools_pid == os.getpid() else []
+    for pool in pools:
+        pool.close_idle()
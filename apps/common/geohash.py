@@ -0,0 +1,152 @@
+"""
+geohash encoding and the cells covering a circle, for the spatial lookups without PostGIS
+
+a geohash is a prefix code of the cell containing the point,
+so the points in a cell are found by a range scan of an ordinary index, see prefix_range().
+"""
+import math
+import typing
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover, the distances are computed in python then
+    numpy = None
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+MAX_PRECISION = 12
+EARTH_RADIUS = 6371008.8  # mean radius in meters
+METERS_PER_DEGREE = math.pi * EARTH_RADIUS / 180
+
+
+def encode(latitude: float, longitude: float, precision: int = 9) -> str:
+    latitude_range = [-90.0, 90.0]
+    longitude_range = [-180.0, 180.0]
+    code = []
+    bits = 0
+    bit_count = 0
+    even = True  # the bits alternate between the longitude and latitude, starting from the longitude
+    while len(code) < precision:
+        value, value_range = (longitude,
+                              longitude_range) if even else (latitude,
+                                                             latitude_range)
+        middle = (value_range[0] + value_range[1]) / 2
+        if value >= middle:
+            bits = bits << 1 | 1
+            value_range[0] = middle
+        else:
+            bits = bits << 1
+            value_range[1] = middle
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            code.append(BASE32[bits])
+            bits = bit_count = 0
+    return ''.join(code)
+
+
+def cell_size(precision: int) -> typing.Tuple[float, float]:
+    """
+    returns the (height, width) of the cells in degrees
+    """
+    longitude_bits = math.ceil(precision * 5 / 2)
+    latitude_bits = precision * 5 // 2
+    return 180 / 2**latitude_bits, 360 / 2**longitude_bits
+
+
+def haversine(latitude1: float, longitude1: float, latitude2: float,
+              longitude2: float) -> float:
+    """
+    returns the great circle distance in meters
+    """
+    phi1, phi2 = math.radians(latitude1), math.radians(latitude2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(longitude2 - longitude1)
+    a = math.sin(d_phi / 2)**2 + math.cos(phi1) * math.cos(phi2) * math.sin(
+        d_lambda / 2)**2
+    return 2 * EARTH_RADIUS * math.asin(min(1.0, math.sqrt(a)))
+
+
+def haversine_many(latitude: float,
+                   longitude: float,
+                   latitudes: typing.Sequence[float],
+                   longitudes: typing.Sequence[float],
+                   use_numpy: bool = numpy is not None) -> typing.List[float]:
+    """
+    returns the distances in meters from the point to each of the points, in a single vectorized call with numpy.
+    the python fallback computes the same values with the same operations as haversine().
+    """
+    if not use_numpy:
+        return [
+            haversine(latitude, longitude, other_latitude, other_longitude)
+            for other_latitude, other_longitude in zip(latitudes, longitudes)
+        ]
+    latitudes = numpy.asarray(latitudes, dtype=numpy.float64)
+    longitudes = numpy.asarray(longitudes, dtype=numpy.float64)
+    phi1, phi2 = math.radians(latitude), numpy.radians(latitudes)
+    d_phi = phi2 - phi1
+    d_lambda = numpy.radians(longitudes - longitude)
+    a = numpy.sin(d_phi / 2)**2 + math.cos(phi1) * numpy.cos(phi2) * numpy.sin(
+        d_lambda / 2)**2
+    return (2 * EARTH_RADIUS *
+            numpy.arcsin(numpy.minimum(1.0, numpy.sqrt(a)))).tolist()
+
+
+def bounding_box(latitude: float, longitude: float,
+                 radius: float) -> typing.Tuple[float, float, float, float]:
+    """
+    returns the (south, north, west, east) degrees of the box containing the circle of `radius` meters.
+    west and east may be out of [-180, 180] when the box crosses the antimeridian.
+    """
+    radius_latitude = radius / METERS_PER_DEGREE
+    # the longitude degrees get shorter toward the poles, measured at the edge nearer to the pole
+    nearest_pole_latitude = min(abs(latitude) + radius_latitude, 89.9)
+    radius_longitude = min(
+        radius_latitude / math.cos(math.radians(nearest_pole_latitude)), 180)
+    return (max(latitude - radius_latitude, -90),
+            min(latitude + radius_latitude, 90), longitude - radius_longitude,
+            longitude + radius_longitude)
+
+
+def covering_cells(latitude: float,
+                   longitude: float,
+                   radius: float,
+                   max_cells: int = 16) -> typing.List[str]:
+    """
+    returns the geohash prefixes of the cells covering the circle of `radius` meters.
+
+    the finest precision whose cells covering the bounding box are at most `max_cells` is chosen,
+    so the cells hardly cover more than the box.
+    an empty prefix is returned when even the cells of the precision 1 are too many.
+    """
+    south, north, west, east = bounding_box(latitude, longitude, radius)
+    for precision in range(MAX_PRECISION, 0, -1):
+        height, width = cell_size(precision)
+        first_row = math.floor((south + 90) / height)
+        rows = math.floor((north + 90) / height) - first_row + 1
+        first_column = math.floor((west + 180) / width)
+        columns = math.floor((east + 180) / width) - first_column + 1
+        if rows * columns <= max_cells:
+            break
+    else:
+        return ['']
+
+    cells = set()
+    for row in range(first_row, first_row + rows):
+        cell_latitude = min((row + 0.5) * height - 90, 90)
+        for column in range(first_column, first_column + columns):
+            cell_longitude = ((column + 0.5) * width) % 360 - 180
+            cells.add(encode(cell_latitude, cell_longitude, precision))
+    return sorted(cells)
+
+
+def prefix_range(prefix: str) -> typing.Tuple[str, typing.Optional[str]]:
+    """
+    returns the [start, end) range of the geohashes starting with the prefix, end is None when unbounded.
+    the geohashes consist of digits and lowercase letters only, which sort the same in any collation.
+    """
+    end = prefix
+    while end and end[-1] == BASE32[-1]:  # carry like 'bz' -> 'c'
+        end = end[:-1]
+    if not end:
+        return prefix, None
+    return prefix, end[:-1] + BASE32[BASE32.index(end[-1]) + 1]
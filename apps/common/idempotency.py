@@ -0,0 +1,141 @@
+"""
+the Idempotency-Key header of the mutating endpoints
+
+the first request with a key runs the view and stores its response in the same transaction with the work,
+so the key is stored if and only if the work is committed.
+the retries with the same key get the stored response without running the view.
+
+a retry arriving while the first request is running waits for it:
+its INSERT of the key blocks on the unique index until the first transaction ends,
+then it replays the committed response, or runs the view by itself when the first one failed.
+"""
+import functools
+import hashlib
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.db import OperationalError, connection, transaction
+from django.http.request import HttpRequest
+from django.utils import timezone
+from django.utils.translation import ugettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.response import Response
+from apps.common.models import IdempotencyKey
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+LOCK_NOT_AVAILABLE = '55P03'  # the error code of postgres on the lock timeout
+
+
+class IdempotencyKeyMismatch(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = _(
+        'The idempotency key was used for another request.')
+    default_code = 'idempotency_key_mismatch'
+
+
+class IdempotencyKeyInProgress(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = _(
+        'A request with the idempotency key is still in progress.')
+    default_code = 'idempotency_key_in_progress'
+
+
+def get_fingerprint(request: HttpRequest) -> str:
+    digest = hashlib.sha256()
+    for part in (request.method.encode(), request.get_full_path().encode(),
+                 request.body):
+        digest.update(part)
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def acquire(user, key: str, fingerprint: str) -> IdempotencyKey:
+    """
+    returns the locked row of the key, inserting it when it doesn't exist.
+    the row is new when its status_code is None.
+    """
+    if connection.vendor == 'postgresql':
+        # wait for the request holding the key at most this long
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL lock_timeout = %s',
+                           [settings.IDEMPOTENCY_KEY_WAIT_TIMEOUT])
+    IdempotencyKey.objects.bulk_create(
+        (IdempotencyKey(user=user,
+                        key=key,
+                        fingerprint=fingerprint,
+                        expires=timezone.now() +
+                        timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL)), ),
+        ignore_conflicts=True)
+    record = IdempotencyKey.objects.select_for_update().get(user=user,
+                                                            key=key)
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL lock_timeout TO DEFAULT')
+
+    if record.status_code is not None and record.expires < timezone.now():
+        # reuse the row of the expired key, its response is forgotten
+        record.fingerprint = fingerprint
+        record.status_code = record.response = None
+        record.expires = timezone.now() + timedelta(
+            seconds=settings.IDEMPOTENCY_KEY_TTL)
+    return record
+
+
+def replay(record: IdempotencyKey, fingerprint: str) -> Response:
+    if record.fingerprint != fingerprint:
+        raise IdempotencyKeyMismatch()
+    response = Response(record.response, status=record.status_code)
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def idempotent(handler):
+    """
+    makes the handler of a view idempotent for the requests with the Idempotency-Key header.
+    the requests without the header run the handler as before.
+    only the responses returned by the handler are stored, the raised errors are rolled back with the work.
+    """
+    @functools.wraps(handler)
+    def wrapper(view, request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if key is None or not request.user.is_authenticated:
+            return handler(view, request, *args, **kwargs)
+        if not 0 < len(key) <= MAX_KEY_LENGTH:
+            raise ValidationError(
+                {HEADER: f'should be 1 to {MAX_KEY_LENGTH} characters'})
+        fingerprint = get_fingerprint(request)
+        with transaction.atomic():
+            try:
+                record = acquire(request.user, key, fingerprint)
+            except OperationalError as error:
+                if getattr(error.__cause__, 'pgcode', None) == LOCK_NOT_AVAILABLE:
+                    raise IdempotencyKeyInProgress() from error
+                raise
+            if record.status_code is not None:
+                return replay(record, fingerprint)
+            response = handler(view, request, *args, **kwargs)
+            record.status_code = response.status_code
+            record.response = response.data
+            record.save()
+            return response
+
+    return wrapper
+
+
+def purge_expired_keys(batch_size: int = 1000, sleep: float = 0.1) -> int:
+    """
+    deletes the expired keys in small batches, returns the number of the deleted keys.
+    """
+    deleted = 0
+    while True:
+        pks = list(
+            IdempotencyKey.objects.filter(
+                expires__lt=timezone.now()).values_list('pk',
+                                                        flat=True)[:batch_size])
+        if not pks:
+            return deleted
+        deleted += IdempotencyKey.objects.filter(pk__in=pks).delete()[0]
+        if sleep:
+            time.sleep(sleep)
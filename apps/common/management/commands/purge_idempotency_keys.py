@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from apps.common.idempotency import purge_expired_keys
+
+
+class Command(BaseCommand):
+    help = 'Deletes the expired idempotency keys, in small batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--sleep',
+                            type=float,
+                            default=0.1,
+                            help='seconds to sleep between the batches')
+
+    def handle(self, *args, **options):
+        deleted = purge_expired_keys(batch_size=options['batch_size'],
+                                     sleep=options['sleep'])
+        self.stdout.write(f'{deleted} expired idempotency keys deleted')
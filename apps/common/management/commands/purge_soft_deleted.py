@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from apps.common.purge import purge_soft_deleted
+
+
+class Command(BaseCommand):
+    help = 'Hard deletes the rows soft deleted more than the given days ago, in small batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days',
+                            type=int,
+                            default=settings.SOFT_DELETE_RETENTION_DAYS)
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--sleep',
+                            type=float,
+                            default=0.1,
+                            help='seconds to sleep between the batches')
+        parser.add_argument('--model',
+                            action='append',
+                            dest='models',
+                            help='label of a model to purge, like order.Order')
+
+    def handle(self, *args, **options):
+        results = purge_soft_deleted(
+            days=options['days'],
+            batch_size=options['batch_size'],
+            sleep=options['sleep'],
+            model_labels=options['models'],
+        )
+        for result in results:
+            self.stdout.write(
+                f'{result.model}: {result.deleted} rows purged, {result.skipped} skipped '
+                f'in {result.seconds:.2f}s ({result.rows_per_second:.1f} rows/s)')
@@ -0,0 +1,68 @@
+import datetime
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from apps.common.seed import PASSWORD, Seeder
+from apps.sales.rollups import get_day, rebuild
+from apps.user.models import UserRole
+
+
+class Command(BaseCommand):
+    help = 'Inserts a synthetic dataset of the users, the restaurants, the menus and the orders for the load tests.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10000)
+        parser.add_argument('--restaurants', type=int, default=1000)
+        parser.add_argument('--menus',
+                            type=int,
+                            default=10,
+                            help='menus of each restaurant')
+        parser.add_argument('--orders', type=int, default=100000)
+        parser.add_argument('--days',
+                            type=int,
+                            default=30,
+                            help='days the orders are spread over')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=10000)
+        parser.add_argument(
+            '--skew',
+            type=float,
+            default=1.1,
+            help='exponent of the zipf distribution of the orders, 0 for uniform')
+        parser.add_argument('--rollups',
+                            action='store_true',
+                            help='rebuild the sales rollups of the seeded days')
+
+    def handle(self, *args, **options):
+        if options['orders'] and min(options['users'], options['restaurants'],
+                                     options['menus']) < 1:
+            raise CommandError(
+                'the orders need the users, the restaurants and the menus')
+        started_at = time.perf_counter()
+
+        def log(message: str):
+            self.stdout.write(
+                f'[{time.perf_counter() - started_at:7.1f}s] {message}')
+
+        seeder = Seeder(seed=options['seed'],
+                        batch_size=options['batch_size'],
+                        skew=options['skew'],
+                        log=log)
+        with transaction.atomic():
+            owners = seeder.create_users(
+                max(1, options['restaurants'] // 2), UserRole.STORE_OWNER)
+            clients = seeder.create_users(options['users'])
+            cards = seeder.create_credit_cards(clients)
+            restaurants = seeder.create_restaurants(options['restaurants'],
+                                                    owners)
+            menus = seeder.create_menus(restaurants, options['menus'])
+            seeder.create_orders(options['orders'], clients, cards,
+                                 restaurants, menus, options['days'])
+            seeder.reset_sequences()
+
+        if options['rollups']:
+            until = get_day(seeder.now)
+            written = rebuild(until - datetime.timedelta(days=options['days']),
+                              until)
+            log(f'{written} sales rollups')
+        log(f'done, the password of the users is {PASSWORD}')
@@ -0,0 +1,101 @@
+"""
+the metrics of the requests in the text format of prometheus, served at /metrics
+
+MetricsMiddleware records each request by its view, with the action of the viewsets like OrderView.pay:
+1. the latency histogram, the counts by the status and the requests in progress
+2. the number and the time of the queries, and the time of the serializers, from the timings of apps.common.timing
+the metrics are aggregated in the process by prometheus_client, a few counter updates per request.
+
+the gunicorn workers are separate processes, so with PROMETHEUS_MULTIPROC_DIR set (see configs/gunicorn.py)
+each worker writes its metrics to the files of the directory, and /metrics of any worker sums them up.
+"""
+import functools
+import os
+import time
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http.request import HttpRequest
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, multiprocess
+from apps.common.budget import get_view_name
+
+REQUEST_LATENCY = Histogram('http_request_duration_seconds',
+                            'Latency of the requests',
+                            ('view', 'method'))
+REQUESTS = Counter('http_requests', 'Requests by the status',
+                   ('view', 'method', 'status'))
+REQUESTS_IN_PROGRESS = Gauge('http_requests_in_progress',
+                             'Requests being served', ('method', ),
+                             multiprocess_mode='livesum')
+QUERIES = Counter('http_request_db_queries', 'Queries run by the requests',
+                  ('view', ))
+QUERY_TIME = Counter('http_request_db_seconds',
+                     'Time of the queries run by the requests', ('view', ))
+SERIALIZER_TIME = Counter('http_request_serializer_seconds',
+                          'Time of the serializers of the requests',
+                          ('view', ))
+
+# the other methods are labeled as OTHER, so the labels are bounded
+METHODS = frozenset(
+    ('GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'))
+UNRESOLVED = 'unresolved'  # the view of the requests not found
+
+
+def get_registry() -> CollectorRegistry:
+    if 'PROMETHEUS_MULTIPROC_DIR' not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+# labels() takes a lock and a few lookups, so the children of the same labels are kept instead.
+# they are bounded by the views, the methods and the statuses.
+@functools.lru_cache(maxsize=None)
+def get_children(view: str, method: str, status: int) -> tuple:
+    return (REQUEST_LATENCY.labels(view, method),
+            REQUESTS.labels(view, method, status), QUERIES.labels(view),
+            QUERY_TIME.labels(view), SERIALIZER_TIME.labels(view))
+
+
+@functools.lru_cache(maxsize=None)
+def get_in_progress(method: str) -> Gauge:
+    return REQUESTS_IN_PROGRESS.labels(method)
+
+
+class MetricsMiddleware:
+    """
+    records the metrics of the requests, unless METRICS_ENABLED is off.
+    the latency of a streaming response is until its first byte.
+    """
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest):
+        method = request.method if request.method in METHODS else 'OTHER'
+        in_progress = get_in_progress(method)
+        in_progress.inc()
+        started_at = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            in_progress.dec()
+        elapsed = time.perf_counter() - started_at
+
+        latency, requests, queries, query_time, serializer_time = get_children(
+            getattr(request, '_metrics_view', UNRESOLVED), method,
+            response.status_code)
+        latency.observe(elapsed)
+        requests.inc()
+        timings = request.timings  # by TimingMiddleware, right after this one
+        if timings.queries:
+            queries.inc(timings.queries)
+            query_time.inc(timings.db)
+        if timings.serialize:
+            serializer_time.inc(timings.serialize)
+        return response
+
+    def process_view(self, request: HttpRequest, view_func, view_args,
+                     view_kwargs):
+        request._metrics_view = get_view_name(request, view_func)
@@ -0,0 +1,103 @@
+import hashlib
+import typing
+from datetime import datetime
+from django.db.models import Count, Max, Model, QuerySet
+from django.http.request import HttpRequest
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+
+class Validators(typing.NamedTuple):
+    etag: str
+    last_modified: typing.Optional[datetime]
+
+
+class ConditionalGetMixin:
+    """
+    answers the conditional GET requests of a viewset with 304 Not Modified
+
+    the validators are computed from the `modified` field of the model before the serializers run:
+    1. from the object itself for the detail
+    2. from the rows and the links of the page for the paginated list, no query is added to the pagination
+    3. by a single aggregate query of max(modified) for the list without pagination
+    the lists have the ETag only, without Last-Modified, since deleting a row never moves the latest modified time.
+    the responses vary by the Authorization header since the querysets are filtered by the user.
+    """
+    validators: typing.Optional[Validators] = None
+
+    def get_object_validators(self, instance: Model) -> Validators:
+        etag = f'W/"{instance.pk}-{instance.modified.timestamp():f}"'
+        return Validators(etag, instance.modified)
+
+    def get_queryset_validators(self, queryset: QuerySet) -> Validators:
+        # max(modified) misses the rows removed from the queryset, the count catches them
+        aggregated = queryset.order_by().aggregate(last_modified=Max('modified'),
+                                                   count=Count('pk'))
+        last_modified = aggregated['last_modified']
+        return self.build_validators(
+            aggregated['count'], last_modified and last_modified.timestamp())
+
+    def get_page_validators(self, page: typing.List[Model]) -> Validators:
+        # the links change with the rows of the pages around, while the rows of the page don't
+        return self.build_validators(
+            self.paginator.get_next_link(),
+            self.paginator.get_previous_link(),
+            *[(instance.pk, instance.modified.timestamp())
+              for instance in page])
+
+    def build_validators(self, *values) -> Validators:
+        # the path is hashed together since the query parameters select the page
+        digest = hashlib.md5(
+            repr((self.request.get_full_path(), ) +
+                 values).encode()).hexdigest()
+        return Validators(f'W/"{digest}"', None)
+
+    def get_not_modified_response(self, request: HttpRequest,
+                                  validators: Validators):
+        """
+        returns the 304 response if the client already holds the representation, otherwise None.
+        the validators are stored to be sent with the response.
+        """
+        self.validators = validators
+        last_modified = validators.last_modified
+        return get_conditional_response(
+            request,
+            etag=validators.etag,
+            last_modified=last_modified and int(last_modified.timestamp()),
+        )
+
+    def list(self, request: HttpRequest, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            validators = self.get_queryset_validators(queryset)
+        else:
+            validators = self.get_page_validators(page)
+        response = self.get_not_modified_response(request, validators)
+        if response is not None:
+            return response
+        if page is None:
+            return Response(self.get_serializer(queryset, many=True).data)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    def retrieve(self, request: HttpRequest, *args, **kwargs):
+        instance = self.get_object()
+        response = self.get_not_modified_response(
+            request, self.get_object_validators(instance))
+        if response is not None:
+            return response
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args,
+                                             **kwargs)
+        if self.validators is not None and response.status_code in (200, 304):
+            response['ETag'] = self.validators.etag
+            if self.validators.last_modified is not None:
+                response['Last-Modified'] = http_date(
+                    self.validators.last_modified.timestamp())
+            patch_vary_headers(response, ('Authorization', ))
+        return response
@@ -1,7 +1,59 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
 from model_utils.models import TimeStampedModel
+from safedelete.managers import SafeDeleteManager
 from safedelete.models import SafeDeleteModel
+from safedelete.queryset import SafeDeleteQueryset
+from pangpangeats.settings import AUTH_USER_MODEL
+
+# the condition which the default manager adds to every query
+ALIVE_CONDITION = models.Q(deleted__isnull=True)
+
+
+class BaseQuerySet(SafeDeleteQueryset):
+    def explain(self, *args, **kwargs):
+        # the soft delete filter is added lazily when the queryset is evaluated,
+        # explain() should show the plan of the query which is actually executed
+        self._filter_visibility()
+        return super().explain(*args, **kwargs)
+
+
+class BaseManager(SafeDeleteManager):
+    _queryset_class = BaseQuerySet
 
 
 class BaseModel(TimeStampedModel, SafeDeleteModel):
+    objects = BaseManager()
+
+    class Meta:
+        abstract = True
+
+
+def alive_index(*fields: str, name: str) -> models.Index:
+    """
+    a partial index only over the rows which are not soft deleted.
+    the queries of the default manager match its condition, so the soft deleted rows never bloat their scans.
+    """
+    return models.Index(fields=fields, name=name, condition=ALIVE_CONDITION)
+
+
+class IdempotencyKey(models.Model):
+    """
+    the response of a mutating request, replayed for the retries with the same Idempotency-Key header
+    see apps.common.idempotency
+    """
+    user = models.ForeignKey(
+        AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        db_index=False,  # indexed by idempotency_key_user_key_unique
+    )
+    key = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64)  # of the method, path and body
+    # both are null until the request is processed, which is never visible to the other transactions
+    status_code = models.PositiveSmallIntegerField(null=True)
+    response = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    expires = models.DateTimeField(db_index=True)
+
     class Meta:
-        abstract = True
\ No newline at end of file
+        constraints = (models.UniqueConstraint(
+            fields=('user', 'key'), name='idempotency_key_user_key_unique'), )
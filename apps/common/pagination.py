@@ -0,0 +1,165 @@
+import base64
+import json
+import typing
+from collections import OrderedDict
+from datetime import datetime
+from django.db.models import Q, QuerySet
+from django.utils.translation import ugettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class Cursor(typing.NamedTuple):
+    created: datetime
+    id: int
+    reverse: bool  # whether the cursor points to the previous page
+
+
+class KeysetPagination(BasePagination):
+    """
+    cursor pagination over the (created, id) fields of apps.common.models.BaseModel, the newest first
+
+    a page is fetched by a range condition on (created, id) with a LIMIT,
+    so the query never needs OFFSET or COUNT(*) and is served by an index ending with (created, id).
+    the cursors are opaque to the clients.
+    """
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = _('Invalid cursor')
+
+    def paginate_queryset(self, queryset: QuerySet, request, view=None):
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+
+        if reverse:
+            queryset = queryset.order_by('created', 'id')
+        else:
+            queryset = queryset.order_by('-created', '-id')
+        if self.cursor is not None:
+            queryset = queryset.filter(self.get_keyset_condition(self.cursor))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+        self.page = results
+        return results
+
+    def get_keyset_condition(self, cursor: Cursor) -> Q:
+        # the redundant bound on created lets the database scan the index range,
+        # the row after it only skips the rows sharing the same created
+        if cursor.reverse:
+            return Q(created__gte=cursor.created) & (
+                Q(created__gt=cursor.created) | Q(id__gt=cursor.id))
+        return Q(created__lte=cursor.created) & (
+            Q(created__lt=cursor.created) | Q(id__lt=cursor.id))
+
+    def get_page_size(self, request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def decode_cursor(self, request) -> typing.Optional[Cursor]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            payload = json.loads(
+                base64.urlsafe_b64decode(encoded.encode('ascii')))
+            return Cursor(created=datetime.fromisoformat(payload['c']),
+                          id=int(payload['i']),
+                          reverse=bool(payload.get('r')))
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, cursor: Cursor) -> str:
+        payload = {'c': cursor.created.isoformat(), 'i': cursor.id}
+        if cursor.reverse:
+            payload['r'] = 1
+        encoded = base64.urlsafe_b64encode(
+            json.dumps(payload, separators=(',', ':')).encode('ascii'))
+        return replace_query_param(self.base_url, self.cursor_query_param,
+                                   encoded.decode('ascii'))
+
+    def get_next_link(self) -> typing.Optional[str]:
+        if not self.has_next:
+            return None
+        if not self.page:  # an empty page reached by a previous cursor
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        last = self.page[-1]
+        return self.encode_cursor(Cursor(last.created, last.id, False))
+
+    def get_previous_link(self) -> typing.Optional[str]:
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        first = self.page[0]
+        return self.encode_cursor(Cursor(first.created, first.id, True))
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict([
+                ('next', self.get_next_link()),
+                ('previous', self.get_previous_link()),
+                ('results', data),
+            ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {
+                    'type': 'string',
+                    'nullable': True,
+                },
+                'previous': {
+                    'type': 'string',
+                    'nullable': True,
+                },
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'The pagination cursor value.',
+                'schema': {
+                    'type': 'string'
+                },
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Number of results to return per page.',
+                'schema': {
+                    'type': 'integer'
+                },
+            },
+        ]
+
+
+class ListPagination(LimitOffsetPagination):
+    """
+    limit/offset pagination of the results computed in python, e.g. sorted by the distance.
+    counting and slicing a list costs nothing unlike a queryset.
+    """
+    max_limit = 100
@@ -0,0 +1,167 @@
+"""
+profiles of single requests on demand of the staff, to find out why a request is slow in production
+
+a request of a staff user with the X-Profile header runs under a profiler:
+1. `X-Profile: sample` samples the stack of the request from another thread every PROFILE_SAMPLE_INTERVAL seconds,
+   cheap enough to stay on in production, saved as the collapsed stacks of the flame graphs (flamegraph.pl, speedscope)
+2. `X-Profile: cprofile` traces every call by cProfile, exact but slowing the request down, saved for pstats or snakeviz
+the name of the profile is returned in the X-Profile header of the response, downloaded at /api/internal/profiles/<name>.
+the profiles are limited to PROFILE_RATE_LIMIT a minute in each process, the other requests run as usual,
+with `X-Profile: rate-limited` in the response.
+the profiles are kept in PROFILE_DIR, only the latest PROFILE_MAX_FILES.
+"""
+import cProfile
+import collections
+import os
+import re
+import sys
+import threading
+import time
+import typing
+import uuid
+from django.conf import settings
+from django.http.request import HttpRequest
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from apps.user.authentication import StatelessJWTAuthentication
+from apps.user.models import User
+
+HEADER = 'HTTP_X_PROFILE'
+PROFILERS = {'sample': 'txt', 'cprofile': 'prof'}
+PROFILE_NAME = re.compile(r'[0-9a-f]{32}\.(?:txt|prof)')
+
+
+class RateLimiter:
+    """
+    allows `limit` calls in any `period` seconds, shared by the threads of the process
+    """
+    def __init__(self, limit: int, period: float):
+        self.limit = limit
+        self.period = period
+        self.calls = collections.deque()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> bool:
+        now = time.monotonic()
+        with self.lock:
+            while self.calls and self.calls[0] <= now - self.period:
+                self.calls.popleft()
+            if len(self.calls) >= self.limit:
+                return False
+            self.calls.append(now)
+            return True
+
+
+def get_stack(frame) -> str:
+    functions = []
+    while frame is not None:
+        functions.append(
+            f'{frame.f_globals.get("__name__", "?")}:{frame.f_code.co_name}')
+        frame = frame.f_back
+    return ';'.join(reversed(functions))
+
+
+class Sampler:
+    """
+    counts the stacks of a thread sampled from another thread, written as the collapsed stacks
+    """
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self.thread_id = threading.get_ident()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[get_stack(frame)] += 1
+
+    def enable(self):
+        self.thread.start()
+
+    def disable(self):
+        self.stopped.set()
+        self.thread.join()
+
+    def dump_stats(self, path: str):
+        with open(path, 'w') as file:
+            for stack, count in self.stacks.most_common():
+                file.write(f'{stack} {count}\n')
+
+
+def get_profiler(name: str):
+    if name == 'cprofile':
+        return cProfile.Profile()
+    return Sampler(settings.PROFILE_SAMPLE_INTERVAL)
+
+
+def authenticate(request: HttpRequest) -> typing.Optional[User]:
+    try:
+        result = StatelessJWTAuthentication().authenticate(request)
+    except (AuthenticationFailed, InvalidToken, TokenError):
+        return None
+    return result[0] if result else None
+
+
+def get_profile_path(name: str) -> str:
+    return os.path.join(settings.PROFILE_DIR, name)
+
+
+def get_profiles() -> typing.List[os.DirEntry]:
+    """
+    the profiles in PROFILE_DIR, the latest first
+    """
+    try:
+        entries = [
+            entry for entry in os.scandir(settings.PROFILE_DIR)
+            if PROFILE_NAME.fullmatch(entry.name)
+        ]
+    except FileNotFoundError:
+        return []
+    return sorted(entries,
+                  key=lambda entry: entry.stat().st_mtime,
+                  reverse=True)
+
+
+def remove_old_profiles():
+    for entry in get_profiles()[settings.PROFILE_MAX_FILES:]:
+        try:
+            os.remove(entry.path)
+        except FileNotFoundError:  # removed by another process
+            pass
+
+
+class ProfilingMiddleware:
+    """
+    profiles the requests of the staff with the X-Profile header
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.rate_limiter = RateLimiter(settings.PROFILE_RATE_LIMIT, 60)
+
+    def __call__(self, request: HttpRequest):
+        profiler_name = request.META.get(HEADER)
+        if profiler_name not in PROFILERS:
+            return self.get_response(request)
+        user = authenticate(request)
+        if user is None or not user.is_staff:
+            return self.get_response(request)
+        if not self.rate_limiter.acquire():
+            response = self.get_response(request)
+            response['X-Profile'] = 'rate-limited'
+            return response
+
+        profiler = get_profiler(profiler_name)
+        profiler.enable()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+        name = f'{uuid.uuid4().hex}.{PROFILERS[profiler_name]}'
+        os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+        profiler.dump_stats(get_profile_path(name))
+        remove_old_profiles()
+        response['X-Profile'] = name
+        return response
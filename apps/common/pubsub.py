@@ -0,0 +1,195 @@
+"""
+publish/subscribe of the events pushed to the clients, see apps.common.sse
+
+the subscribers live in the event loop of the ASGI process, the publishers may run in any thread or process.
+the broker is chosen by settings.EVENT_BROKER:
+1. LocalBroker delivers the events published in the same process, enough for a single ASGI process
+2. PostgresBroker relays the events by LISTEN/NOTIFY, so the events published by the WSGI workers reach the ASGI processes
+
+the events are fire and forget, a client missing some of them (while reconnecting) should fetch the state again.
+"""
+import asyncio
+import functools
+import json
+import logging
+import select
+import threading
+import time
+import typing
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class Event(typing.NamedTuple):
+    name: str
+    data: str
+
+
+class Subscription:
+    """
+    the bounded queue of the events of some channels, read by a single stream.
+    a subscriber falling behind by more than `max_size` events is closed instead of buffering without limit,
+    the stream ends then and the client reconnects.
+    """
+    def __init__(self, broker: 'LocalBroker', channels: typing.Sequence[str],
+                 max_size: int):
+        self.broker = broker
+        self.channels = tuple(channels)
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(max_size)
+        self.closed = False
+
+    def put(self, event: Event):
+        # called in the event loop of the subscription
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.close()
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+    async def get(self) -> typing.Optional[Event]:
+        """
+        returns the next event, or None when the subscription was closed for falling behind.
+        """
+        return await self.queue.get()
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.broker.unsubscribe(self)
+
+
+class Broker:
+    """
+    the interface of the brokers
+    """
+    def publish(self, channel: str, event: Event):
+        raise NotImplementedError
+
+    def subscribe(self, channels: typing.Sequence[str],
+                  max_size: int = None) -> Subscription:
+        """
+        should be called in the event loop which reads the subscription.
+        """
+        raise NotImplementedError
+
+    def unsubscribe(self, subscription: Subscription):
+        raise NotImplementedError
+
+
+class LocalBroker(Broker):
+    def __init__(self):
+        self.subscriptions: typing.Dict[str, typing.Set[Subscription]] = {}
+        self.lock = threading.Lock()
+
+    def publish(self, channel: str, event: Event):
+        with self.lock:
+            subscriptions = tuple(self.subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.put, event)
+            except RuntimeError:  # the loop is closed
+                subscription.close()
+
+    def subscribe(self, channels: typing.Sequence[str],
+                  max_size: int = None) -> Subscription:
+        subscription = Subscription(
+            self, channels, max_size or settings.EVENT_STREAM_QUEUE_SIZE)
+        with self.lock:
+            for channel in subscription.channels:
+                self.subscriptions.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self.lock:
+            for channel in subscription.channels:
+                subscriptions = self.subscriptions.get(channel)
+                if subscriptions is None:
+                    continue
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self.subscriptions[channel]
+
+
+class PostgresBroker(LocalBroker):
+    """
+    publishes the events by NOTIFY, and a thread of each subscribing process LISTENs to them.
+    a single postgres channel carries all the channels, so each process holds a single extra connection.
+    the payloads of NOTIFY are limited to 8000 bytes, so the events should be small.
+    """
+    CHANNEL = 'pangpangeats_events'
+    POLL_INTERVAL = 5  # seconds
+    RECONNECT_DELAY = 1
+
+    def __init__(self):
+        super().__init__()
+        self.listener: typing.Optional[threading.Thread] = None
+
+    def publish(self, channel: str, event: Event):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)',
+                           [self.CHANNEL,
+                            json.dumps([channel, event.name, event.data])])
+
+    def subscribe(self, channels: typing.Sequence[str],
+                  max_size: int = None) -> Subscription:
+        with self.lock:
+            if self.listener is None:
+                self.listener = threading.Thread(target=self.listen,
+                                                 name='event-listener',
+                                                 daemon=True)
+                self.listener.start()
+        return super().subscribe(channels, max_size)
+
+    def listen(self):
+        while True:
+            try:
+                self.relay()
+            except Exception:
+                logger.exception('the event listener is disconnected')
+                time.sleep(self.RECONNECT_DELAY)
+
+    def relay(self):
+        import psycopg2
+        listening = psycopg2.connect(**connection.get_connection_params())
+        try:
+            listening.autocommit = True
+            with listening.cursor() as cursor:
+                cursor.execute(f'LISTEN {self.CHANNEL}')
+            while True:
+                if not select.select((listening, ), (), (),
+                                     self.POLL_INTERVAL)[0]:
+                    continue
+                listening.poll()
+                while listening.notifies:
+                    channel, name, data = json.loads(
+                        listening.notifies.pop(0).payload)
+                    super().publish(channel, Event(name, data))
+        finally:
+            listening.close()
+
+
+@functools.lru_cache(maxsize=None)
+def get_broker() -> Broker:
+    return import_string(settings.EVENT_BROKER)()
+
+
+def publish(channels: typing.Iterable[str], event: Event):
+    """
+    publishes the event to the channels when the current transaction is committed.
+    """
+    channels = tuple(channels)
+
+    def publish_on_commit():
+        broker = get_broker()
+        for channel in channels:
+            broker.publish(channel, event)
+
+    transaction.on_commit(publish_on_commit)
@@ -0,0 +1,122 @@
+"""
+hard deletion of the rows soft deleted long ago
+
+SafeDeleteModel never removes the rows, so they are purged by a periodic job:
+    python manage.py purge_soft_deleted --days 30
+or from a scheduler by calling purge_soft_deleted().
+"""
+import logging
+import time
+import typing
+from datetime import timedelta
+from django.apps import apps
+from django.conf import settings
+from django.db import OperationalError, connection, models, transaction
+from django.db.models.deletion import ProtectedError, RestrictedError
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class PurgeResult(typing.NamedTuple):
+    model: str
+    deleted: int  # the purged rows of the model itself
+    skipped: int  # the rows protected or locked by the others
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.deleted / self.seconds if self.seconds else 0.0
+
+
+def get_purgeable_queryset(model: typing.Type[models.Model],
+                           deleted_before) -> models.QuerySet:
+    queryset = model.all_objects.filter(deleted__lt=deleted_before)
+    for relation in model._meta.related_objects:
+        if relation.many_to_many:
+            # the row still belongs to a row of the other side, e.g. a selection of an order
+            queryset = queryset.filter(
+                **{f'{relation.name}__isnull': True})
+    return queryset
+
+
+def delete_batch(model: typing.Type[models.Model],
+                 pks: typing.List[int]) -> typing.Tuple[int, int]:
+    """
+    deletes the rows in a short transaction, returns the numbers of the deleted and skipped rows.
+    the SET_NULL and CASCADE relations are handled by django's collector,
+    the rows referenced by PROTECT or RESTRICT relations are skipped.
+    """
+    label = model._meta.label
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            # give up instead of waiting behind the locks of the requests on the hot rows
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL lock_timeout = %s',
+                               [settings.SOFT_DELETE_PURGE_LOCK_TIMEOUT])
+        try:
+            _, counts = model._base_manager.filter(pk__in=pks).delete()
+            return counts.get(label, 0), 0
+        except (ProtectedError, RestrictedError):
+            pass  # raised before deleting anything
+        # some of the rows are still referenced, delete them one by one
+        deleted = skipped = 0
+        for pk in pks:
+            try:
+                _, counts = model._base_manager.filter(pk=pk).delete()
+                deleted += counts.get(label, 0)
+            except (ProtectedError, RestrictedError):
+                skipped += 1
+        return deleted, skipped
+
+
+def purge_model(model: typing.Type[models.Model],
+                deleted_before,
+                batch_size: int,
+                sleep: float) -> PurgeResult:
+    queryset = get_purgeable_queryset(model, deleted_before).order_by('pk')
+    started_at = time.monotonic()
+    deleted = skipped = 0
+    last_pk = 0
+    while True:
+        pks = list(
+            queryset.filter(pk__gt=last_pk).values_list('pk',
+                                                        flat=True)[:batch_size])
+        if not pks:
+            break
+        last_pk = pks[-1]
+        try:
+            batch_deleted, batch_skipped = delete_batch(model, pks)
+        except OperationalError as error:  # lock timeout
+            logger.warning('skipped %d rows of %s: %s', len(pks),
+                           model._meta.label, error)
+            batch_deleted, batch_skipped = 0, len(pks)
+        deleted += batch_deleted
+        skipped += batch_skipped
+        if sleep:
+            time.sleep(sleep)  # let the requests take the locks in between
+    return PurgeResult(model._meta.label, deleted, skipped,
+                       time.monotonic() - started_at)
+
+
+def purge_soft_deleted(
+    days: int,
+    batch_size: int = 500,
+    sleep: float = 0.1,
+    model_labels: typing.Sequence[str] = None,
+) -> typing.List[PurgeResult]:
+    """
+    purges the rows soft deleted more than `days` ago, model by model in batches of `batch_size` rows.
+    the models are purged in the order of settings.SOFT_DELETE_PURGE_MODELS,
+    so the orders are purged before the selections which they hold.
+    """
+    deleted_before = timezone.now() - timedelta(days=days)
+    results = []
+    for label in model_labels or settings.SOFT_DELETE_PURGE_MODELS:
+        result = purge_model(apps.get_model(label), deleted_before,
+                             batch_size, sleep)
+        logger.info('purged %d rows of %s (%.1f rows/s, %d skipped)',
+                    result.deleted, result.model, result.rows_per_second,
+                    result.skipped)
+        results.append(result)
+    return results
@@ -0,0 +1,40 @@
+"""
+the JSON renderer of the responses by orjson, writing the bytes at once in rust
+
+the output is the same as the one of rest_framework, compact and in UTF-8 with U+2028 and U+2029 escaped,
+but NaN and Infinity, which are null instead of the error of rest_framework.
+the types orjson doesn't know, like Decimal, the lazy translation strings or the querysets,
+are turned by the encoder of rest_framework, and the datetimes in UTC end with Z like by the encoder.
+without orjson, or for what it can't do like the indents of the browsable API or the integers over 64 bits,
+the stdlib json of rest_framework renders them.
+"""
+from rest_framework import renderers
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover, rendered by the stdlib json then
+    orjson = None
+
+default = JSONEncoder().default
+
+
+class JSONRenderer(renderers.JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (orjson is None or self.ensure_ascii or not self.compact
+                or not self.strict or data is None
+                or self.get_indent(accepted_media_type, renderer_context
+                                   or {}) is not None):
+            return super().render(data, accepted_media_type,
+                                  renderer_context)
+        try:
+            rendered = orjson.dumps(data,
+                                    default=default,
+                                    option=orjson.OPT_NON_STR_KEYS
+                                    | orjson.OPT_UTC_Z)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type,
+                                  renderer_context)
+        # the same escapes as rest_framework, JSON is a strict subset of javascript then
+        rendered = rendered.replace(b'\xe2\x80\xa8', b'\\u2028')
+        return rendered.replace(b'\xe2\x80\xa9', b'\\u2029')
@@ -0,0 +1,263 @@
+"""
+synthetic datasets for the load tests, see the seed command
+
+the rows are inserted by bulk_create() in batches with explicit primary keys after the existing ones,
+so the foreign keys are known without reading the rows back, and the sequences are reset at the end.
+every user shares a single password hash, computed once instead of per user.
+the orderers, the restaurants and the menus are picked by a zipf distribution over their primary keys,
+the lower keys being the heavy users, the popular restaurants and their best menus.
+the same seed builds the same dataset on an empty database.
+"""
+import datetime
+import itertools
+import random
+import typing
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, models
+from django.utils import timezone
+from apps.common.geohash import encode as encode_geohash
+from apps.credit_card.models import CreditCard
+from apps.order.models import Order, OrderStatus, Selection
+from apps.restaurant.models import BusinessInformation, Location, MenuInformation, Restaurant
+from apps.user.models import User, UserRole
+
+PASSWORD = 'thePas123Q'
+NAMES = ('홍길동', '김철수', '이영희', '박민수', '최지우', '정우성', '강하늘', '윤아름')
+MENU_NAMES = ('후라이드치킨', '양념치킨', '콜라', '떡볶이', '김밥', '짜장면', '짬뽕', '탕수육',
+              '피자', '햄버거', '감자튀김', '냉면', '비빔밥', '돈까스', '라면')
+# around Seoul
+LATITUDES = (37.42, 37.70)
+LONGITUDES = (126.76, 127.18)
+# the orders placed in the last hour may be in progress, the older ones are done
+ACTIVE_PERIOD = datetime.timedelta(hours=1)
+ACTIVE_STATUSES = (OrderStatus.PENDING, OrderStatus.PAID,
+                   OrderStatus.PREPARING, OrderStatus.DELIVERING)
+CANCEL_RATIO = 0.05
+
+
+class Menus(typing.NamedTuple):
+    # the menus of the restaurant at an offset are at the offset times per_restaurant
+    pks: range
+    prices: typing.List[int]
+    per_restaurant: int
+
+
+class Seeder:
+    def __init__(self,
+                 seed: int = 0,
+                 batch_size: int = 10000,
+                 skew: float = 1.1,
+                 log: typing.Callable[[str], None] = None):
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.skew = skew
+        self.log = log or (lambda message: None)
+        self.password = make_password(PASSWORD)
+        self.now = timezone.now()
+
+    def get_next_pk(self, model: typing.Type[models.Model]) -> int:
+        # the soft deleted rows hold their keys too
+        manager = getattr(model, 'all_objects', model.objects)
+        return (manager.aggregate(last=models.Max('pk'))['last'] or 0) + 1
+
+    def get_cum_weights(self, count: int) -> typing.List[float]:
+        return list(
+            itertools.accumulate(1 / rank**self.skew
+                                 for rank in range(1, count + 1)))
+
+    def insert(self, model: typing.Type[models.Model], count: int,
+               build: typing.Callable[[int], typing.Iterable[models.Model]]
+               ) -> range:
+        """
+        inserts the rows built for each primary key of the next `count` keys, a batch at a time.
+        returns the keys.
+        """
+        first = self.get_next_pk(model)
+        pks = range(first, first + count)
+        for start in range(0, count, self.batch_size):
+            model.objects.bulk_create(
+                itertools.chain.from_iterable(
+                    map(build, pks[start:start + self.batch_size])))
+        self.log(f'{count} {model._meta.verbose_name_plural}')
+        return pks
+
+    def create_users(self, count: int, role: str = UserRole.CLIENT) -> range:
+        # the same fields with UserManager.create_user()
+        return self.insert(
+            User, count, lambda pk: (User(pk=pk,
+                                          phone_number=f'010{pk:08d}',
+                                          name=self.rng.choice(NAMES),
+                                          role=role,
+                                          password=self.password), ))
+
+    def create_credit_cards(self, owners: range) -> range:
+        """
+        creates a card of each owner, the card of an owner is at the same offset in the returned keys.
+        """
+        first = self.get_next_pk(CreditCard)
+        return self.insert(
+            CreditCard, len(owners), lambda pk: (CreditCard(
+                pk=pk,
+                owner_id=owners[pk - first],
+                owner_first_name='길동',
+                owner_last_name='홍',
+                alias=f'카드 {pk}',
+                card_number=f'4{self.rng.randrange(10**15):015d}',
+                cvc=f'{self.rng.randrange(1000):03d}',
+                expiry_year=self.now.year + 3,
+                expiry_month=self.rng.randint(1, 12)), ))
+
+    def create_restaurants(self, count: int, owners: range) -> range:
+        """
+        creates the restaurants with their locations and business informations at the same offsets.
+        """
+        locations = self.insert(Location, count, self.build_location)
+        informations = self.insert(
+            BusinessInformation, count, lambda pk: (BusinessInformation(
+                pk=pk,
+                owner_name=self.rng.choice(NAMES),
+                business_name=f'식당 {pk}',
+                business_registration_number=f'{self.rng.randrange(10**10):010d}'
+            ), ))
+        first = self.get_next_pk(Restaurant)
+        return self.insert(
+            Restaurant, count, lambda pk: (Restaurant(
+                pk=pk,
+                owner_id=owners[(pk - first) % len(owners)],
+                name=f'식당 {pk}',
+                picture='restaurant_pictures/sample.jpg',
+                minimum_order_cost=self.rng.choice((0, 10000, 15000)),
+                minimum_delivery_cost=self.rng.choice((0, 2000, 3000)),
+                telephone_number='0212341234',
+                description='',
+                notice='',
+                origin_information='',
+                nuturition_facts='',
+                allergens_facts='',
+                location_id=locations[pk - first],
+                business_information_id=informations[pk - first]), ))
+
+    def build_location(self, pk: int):
+        latitude = self.rng.uniform(*LATITUDES)
+        longitude = self.rng.uniform(*LONGITUDES)
+        # bulk_create() skips Location.save(), which sets the geohash
+        return (Location(pk=pk,
+                         address=f'주소 {pk}',
+                         latitude=latitude,
+                         longitude=longitude,
+                         geohash=encode_geohash(latitude, longitude,
+                                                Location.GEOHASH_PRECISION)),
+                )
+
+    def create_menus(self, restaurants: range, per_restaurant: int) -> Menus:
+        """
+        creates `per_restaurant` menus of each restaurant, the menus of a restaurant have consecutive keys.
+        """
+        first = self.get_next_pk(MenuInformation)
+        prices = []
+
+        def build(pk: int):
+            restaurant_index, index = divmod(pk - first, per_restaurant)
+            prices.append(self.rng.randrange(10, 300) * 100)
+            return (MenuInformation(pk=pk,
+                                    restaurant_id=restaurants[restaurant_index],
+                                    name=MENU_NAMES[index % len(MENU_NAMES)],
+                                    description='',
+                                    picture='menu_pictures/sample.jpg',
+                                    price=prices[-1]), )
+
+        pks = self.insert(MenuInformation, len(restaurants) * per_restaurant,
+                          build)
+        return Menus(pks, prices, per_restaurant)
+
+    def get_status(self, created: datetime.datetime) -> int:
+        if self.now - created < ACTIVE_PERIOD:
+            return self.rng.choice(ACTIVE_STATUSES)
+        if self.rng.random() < CANCEL_RATIO:
+            return OrderStatus.CANCELED
+        return OrderStatus.DELIVERED
+
+    def create_orders(self, count: int, orderers: range, cards: range,
+                      restaurants: range, menus: Menus, days: int):
+        """
+        creates the orders of 1 to 3 menus of a restaurant, placed in the last `days` days,
+        with their selections and the rows of their many-to-many relation.
+        """
+        orderer_weights = self.get_cum_weights(len(orderers))
+        restaurant_weights = self.get_cum_weights(len(restaurants))
+        menu_weights = self.get_cum_weights(menus.per_restaurant)
+        restaurant_names = dict(
+            Restaurant.objects.filter(pk__in=restaurants).values_list(
+                'pk', 'name'))
+        next_selection = self.get_next_pk(Selection)
+        first = self.get_next_pk(Order)
+        period = datetime.timedelta(days=days).total_seconds()
+        through = Order.selections.through
+
+        for start in range(first, first + count, self.batch_size):
+            size = min(self.batch_size, first + count - start)
+            orders, selections, links = [], [], []
+            picked_orderers = self.rng.choices(range(len(orderers)),
+                                               cum_weights=orderer_weights,
+                                               k=size)
+            picked_restaurants = self.rng.choices(
+                range(len(restaurants)),
+                cum_weights=restaurant_weights,
+                k=size)
+            for pk, orderer_index, restaurant_index in zip(
+                    range(start, start + size), picked_orderers,
+                    picked_restaurants):
+                orderer = orderers[orderer_index]
+                restaurant = restaurants[restaurant_index]
+                menu_indexes = set(
+                    self.rng.choices(range(menus.per_restaurant),
+                                     cum_weights=menu_weights,
+                                     k=self.rng.randint(1, 3)))
+                created = self.now - datetime.timedelta(
+                    seconds=self.rng.random() * period)
+                total_cost = 0
+                for menu_index in sorted(menu_indexes):
+                    menu_offset = restaurant_index * menus.per_restaurant + menu_index
+                    price = menus.prices[menu_offset]
+                    amount = self.rng.randint(1, 3)
+                    total_cost += price * amount
+                    selections.append(
+                        Selection(pk=next_selection,
+                                  orderer_id=orderer,
+                                  menu_id=menus.pks[menu_offset],
+                                  amount=amount,
+                                  request='',
+                                  unit_price=price,
+                                  menu_name=MENU_NAMES[menu_index %
+                                                       len(MENU_NAMES)],
+                                  restaurant_name=restaurant_names[restaurant],
+                                  created=created))
+                    links.append(through(order_id=pk,
+                                         selection_id=next_selection))
+                    next_selection += 1
+                orders.append(
+                    Order(pk=pk,
+                          orderer_id=orderer,
+                          restaurant_id=restaurant,
+                          total_cost=total_cost,
+                          status=self.get_status(created),
+                          purchased_credit_card_id=cards[orderer_index],
+                          created=created))
+            Order.objects.bulk_create(orders)
+            Selection.objects.bulk_create(selections)
+            through.objects.bulk_create(links)
+            self.log(f'{start - first + size}/{count} orders')
+
+    def reset_sequences(self):
+        """
+        moves the sequences of postgres past the explicit keys, nothing to do for sqlite.
+        """
+        statements = connection.ops.sequence_reset_sql(
+            no_style(), [
+                User, CreditCard, Location, BusinessInformation, Restaurant,
+                MenuInformation, Selection, Order
+            ])
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
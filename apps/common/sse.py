@@ -0,0 +1,165 @@
+"""
+server-sent events over ASGI, for pushing the events of apps.common.pubsub to the clients
+
+the streams are plain ASGI applications beside django, so an idle stream costs a task and a queue, not a thread.
+they are served only through pangpangeats.asgi, the WSGI workers never hold the long-lived connections.
+"""
+import asyncio
+import secrets
+import typing
+from urllib.parse import parse_qs
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, connection
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken, TokenError
+from apps.common.pubsub import Event, Subscription, get_broker
+from apps.user.authentication import StatelessJWTAuthentication
+from apps.user.models import User
+
+
+def format_event(event: Event) -> bytes:
+    lines = [f'event: {event.name}']
+    lines += [f'data: {line}' for line in event.data.splitlines()]
+    return ('\n'.join(lines) + '\n\n').encode()
+
+
+TICKET_KEY = 'event-stream-ticket:{}'
+
+
+def create_ticket(raw_token: str) -> str:
+    """
+    exchanges the access token for a ticket opening a stream once within EVENT_STREAM_TICKET_TTL seconds.
+    the EventSource of the browsers can't set the headers, so the ticket is sent in the query string,
+    where it is logged by the proxies, instead of the access token.
+    """
+    ticket = secrets.token_urlsafe(32)
+    cache.set(TICKET_KEY.format(ticket), raw_token,
+              settings.EVENT_STREAM_TICKET_TTL)
+    return ticket
+
+
+def redeem_ticket(ticket: str) -> typing.Optional[bytes]:
+    key = TICKET_KEY.format(ticket)
+    raw_token = cache.get(key)
+    # only the one which deleted the ticket may use it
+    if raw_token is None or not cache.delete(key):
+        return None
+    return raw_token.encode()
+
+
+def get_raw_token(scope: dict) -> typing.Optional[bytes]:
+    """
+    reads the access token from the Authorization header,
+    or redeems the ticket query parameter of create_ticket for it.
+    """
+    authentication = StatelessJWTAuthentication()
+    for name, value in scope['headers']:
+        if name == b'authorization':
+            return authentication.get_raw_token(value)
+    tickets = parse_qs(scope.get('query_string', b'').decode()).get('ticket')
+    return redeem_ticket(tickets[0]) if tickets else None
+
+
+def authenticate(scope: dict) -> typing.Optional[User]:
+    raw_token = get_raw_token(scope)
+    if raw_token is None:
+        return None
+    authentication = StatelessJWTAuthentication()
+    try:
+        return authentication.get_user(
+            authentication.get_validated_token(raw_token))
+    except (AuthenticationFailed, InvalidToken, TokenError):
+        return None
+
+
+async def send_response(send, status: int, body: bytes):
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'text/plain; charset=utf-8')],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+class EventStream:
+    """
+    the ASGI application streaming the events of the channels of the authenticated user
+
+    `get_channels` takes the user and returns the channels, it runs in a thread so it may query the database.
+    a comment is sent every EVENT_STREAM_HEARTBEAT seconds to keep the proxies from closing the idle streams.
+    the events are written one by one, awaiting the flow control of the server,
+    so a slow client fills its own subscription until it is closed, without holding the other streams.
+    """
+    def __init__(self, get_channels: typing.Callable[[User],
+                                                     typing.List[str]]):
+        self.get_channels = get_channels
+
+    def subscribe(self, scope: dict) -> typing.Optional[typing.List[str]]:
+        try:
+            user = authenticate(scope)
+            return None if user is None else self.get_channels(user)
+        finally:
+            if not connection.in_atomic_block:  # leaves the connections of the tests alone
+                close_old_connections()
+
+    async def __call__(self, scope: dict, receive, send):
+        if scope['type'] != 'http':
+            raise ValueError(f'unsupported scope type {scope["type"]}')
+        if scope['method'] != 'GET':
+            return await send_response(send, 405, b'Method Not Allowed')
+        channels = await sync_to_async(self.subscribe)(scope)
+        if channels is None:
+            return await send_response(send, 401, b'Unauthorized')
+
+        subscription = get_broker().subscribe(channels)
+        disconnected = asyncio.ensure_future(self.wait_for_disconnect(receive))
+        try:
+            await send({
+                'type':
+                'http.response.start',
+                'status':
+                200,
+                'headers': [
+                    (b'content-type', b'text/event-stream'),
+                    (b'cache-control', b'no-cache'),
+                    (b'x-accel-buffering', b'no'),  # for nginx
+                ],
+            })
+            await self.send_body(
+                send, f'retry: {settings.EVENT_STREAM_RETRY}\n\n'.encode())
+            await self.stream(subscription, disconnected, send)
+        finally:
+            subscription.close()
+            disconnected.cancel()
+
+    async def stream(self, subscription: Subscription,
+                     disconnected: asyncio.Future, send):
+        while True:
+            received = asyncio.ensure_future(subscription.get())
+            done, _ = await asyncio.wait(
+                (received, disconnected),
+                timeout=settings.EVENT_STREAM_HEARTBEAT,
+                return_when=asyncio.FIRST_COMPLETED)
+            if disconnected in done:
+                received.cancel()
+                return
+            if received not in done:
+                received.cancel()
+                await self.send_body(send, b': ping\n\n')
+                continue
+            event = received.result()
+            if event is None:  # fell behind
+                return await self.send_body(send, b'', more_body=False)
+            await self.send_body(send, format_event(event))
+
+    async def wait_for_disconnect(self, receive):
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+
+    async def send_body(self, send, body: bytes, more_body: bool = True):
+        await send({
+            'type': 'http.response.body',
+            'body': body,
+            'more_body': more_body,
+        })
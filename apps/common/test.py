@@ -1,7 +1,24 @@
 import typing
+from django.conf import settings
+from django.test.runner import DiscoverRunner
 from apps.user.models import User, UserRole
 
 
+class TestRunner(DiscoverRunner):
+    """
+    runs the tests with the rate limits of apps.common.throttling off,
+    the tests log in many times from the same address. the tests of the limits turn them on.
+    """
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.rate_limit_enabled = settings.RATE_LIMIT_ENABLED
+        settings.RATE_LIMIT_ENABLED = False
+
+    def teardown_test_environment(self, **kwargs):
+        settings.RATE_LIMIT_ENABLED = self.rate_limit_enabled
+        super().teardown_test_environment(**kwargs)
+
+
 def create_sample_user_and_get_token(api_client, phone_number) -> typing.List:
     user: User = User.objects.create_user(phone_number=phone_number,
                                           name='홍길동',
@@ -14,4 +31,112 @@ def create_sample_user_and_get_token(api_client, phone_number) -> typing.List:
             'password': 'thePas123Q',
         },
     )
-    return (user, response.data['access'])
\ No newline at end of file
+    return (user, response.data['access'])
+
+
+def create_sample_restaurant(owner: User,
+                             name='팡팡치킨',
+                             latitude=37.5665,
+                             longitude=126.9780,
+                             menu_prices=(18000, 2000)):
+    from apps.restaurant.models import BusinessInformation, Location, MenuInformation, Restaurant
+
+    restaurant = Restaurant.objects.create(
+        owner=owner,
+        name=name,
+        picture='restaurant_pictures/sample.jpg',
+        minimum_order_cost=15000,
+        minimum_delivery_cost=3000,
+        telephone_number='0212341234',
+        description='바삭한 치킨',
+        notice='',
+        origin_information='닭고기: 국내산',
+        nuturition_facts='',
+        allergens_facts='',
+        location=Location.objects.create(address='서울특별시 중구 세종대로 110',
+                                         latitude=latitude,
+                                         longitude=longitude),
+        business_information=BusinessInformation.objects.create(
+            owner_name='홍길동',
+            business_name=name,
+            business_registration_number='1234567890'),
+    )
+    for i, price in enumerate(menu_prices):
+        MenuInformation.objects.create(restaurant=restaurant,
+                                       name=f'메뉴{i}',
+                                       description='',
+                                       picture='menu_pictures/sample.jpg',
+                                       price=price)
+    return restaurant
+
+
+def create_sample_credit_card(owner: User, alias='홍길동의 카드'):
+    from apps.credit_card.models import CreditCard
+
+    return CreditCard.objects.create(owner=owner,
+                                     owner_first_name='길동',
+                                     owner_last_name='홍',
+                                     alias=alias,
+                                     card_number='4111111111111111',
+                                     cvc='123',
+                                     expiry_year=2032,
+                                     expiry_month=12)
+
+
+def create_sample_order(orderer: User, menus, amounts, created=None, **kwargs):
+    """
+    creates the order of the amounts of the menus of a restaurant,
+    with the selections keeping the prices and the names like apps.order.checkout.
+    """
+    from apps.order.models import Order, Selection
+
+    order = Order.objects.create(
+        orderer=orderer,
+        restaurant=menus[0].restaurant,
+        total_cost=sum(menu.price * amount
+                       for menu, amount in zip(menus, amounts)),
+        **kwargs)
+    order.selections.add(*(Selection.objects.create(
+        orderer=orderer,
+        menu=menu,
+        amount=amount,
+        request='',
+        unit_price=menu.price,
+        menu_name=menu.name,
+        restaurant_name=menu.restaurant.name)
+                           for menu, amount in zip(menus, amounts)))
+    if created is not None:  # not editable by create()
+        Order.objects.filter(pk=order.pk).update(created=created)
+        order.refresh_from_db()
+    return order
+
+
+def assert_query_budget(test_case,
+                        view: type,
+                        action: typing.Optional[str],
+                        populate: typing.Callable[[int], typing.Any],
+                        request: typing.Callable[[], typing.Any],
+                        sizes=(1, 10)):
+    """
+    asserts the request runs the same number of queries within the budget of the action of the view,
+    after populating the dataset up to each of the sizes.
+    """
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from apps.common.budget import get_budget
+
+    budget = get_budget(view, action)
+    test_case.assertIsNotNone(budget,
+                              f'{view.__name__} has no budget for {action}')
+    counts = []
+    for size in sizes:
+        populate(size)
+        with CaptureQueriesContext(connection) as queries:
+            response = request()
+        test_case.assertLess(response.status_code, 400)
+        test_case.assertLessEqual(
+            len(queries), budget,
+            f'{len(queries)} queries over the budget {budget} of {size} rows')
+        counts.append(len(queries))
+    test_case.assertEqual(len(set(counts)), 1,
+                          f'the queries grow with the rows: {counts}')
@@ -0,0 +1,61 @@
+from unittest import mock
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from apps.common import budget
+from apps.common.budget import QueryBudgetExceeded, get_budget
+from apps.credit_card.views import CreditCardView
+from apps.sales.views import SalesView
+from apps.user.models import User, UserRole
+
+
+class QueryBudgetMiddlewareTest(APITestCase):
+    ENDPOINT = '/api/credit-cards'
+    """
+    Test the query budgets checked at runtime
+
+    the middleware should work like:
+    1. the budget of the action should come before the budget of the view
+    2. a request over the budget should be logged by the log mode
+    3. a request over the budget should fail by the raise mode
+    4. a request within the budget should pass silently
+    5. nothing should be counted when the mode is off
+    """
+    def setUp(self):
+        # no request before the settings are overridden, the middleware is loaded by the first one
+        user = User.objects.create_user(phone_number='01012341234',
+                                        name='홍길동',
+                                        password='thePas123Q',
+                                        role=UserRole.CLIENT)
+        self.client.force_authenticate(user)
+
+    def test_get_budget_should_success(self):
+        self.assertEqual(get_budget(CreditCardView, 'list'), 1)
+        self.assertIsNone(get_budget(CreditCardView, 'unknown'))
+        self.assertEqual(get_budget(SalesView, 'list'), 3)
+
+    @override_settings(QUERY_BUDGET_MODE='log')
+    def test_log_mode_should_log_the_request_over_budget(self):
+        with mock.patch.dict(CreditCardView.query_budgets, {'list': 0}):
+            with self.assertLogs(budget.logger, 'WARNING') as logs:
+                response = self.client.get(self.ENDPOINT)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('ran 1 queries over the budget 0 of CreditCardView.list',
+                      logs.output[0])
+
+    @override_settings(QUERY_BUDGET_MODE='raise')
+    def test_raise_mode_should_fail_the_request_over_budget(self):
+        with mock.patch.dict(CreditCardView.query_budgets, {'list': 0}):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.client.get(self.ENDPOINT)
+
+    @override_settings(QUERY_BUDGET_MODE='raise')
+    def test_request_within_budget_should_success(self):
+        with mock.patch.object(budget.logger, 'warning') as warning:
+            response = self.client.get(self.ENDPOINT)
+        self.assertEqual(response.status_code, 200)
+        warning.assert_not_called()
+
+    def test_off_mode_should_not_count(self):
+        with mock.patch.dict(CreditCardView.query_budgets, {'list': 0}):
+            response = self.client.get(self.ENDPOINT)
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,90 @@
+import threading
+from unittest import mock
+from django.test import SimpleTestCase
+from apps.common.db.pool import ConnectionPool, PoolExhausted
+
+
+class FakeConnection:
+    def __init__(self):
+        self.healthy = True
+        self.closed = False
+
+
+class ConnectionPoolTest(SimpleTestCase):
+    """
+    Test the per-process database connection pool
+
+    the pool should work like:
+    1. the released connections should be reused
+    2. the size of the pool should be bounded, waiting for a release until the timeout
+    3. the old and idle connections should be recycled
+    4. the idle connections should be health checked before reused
+    """
+    def create_pool(self, **kwargs) -> ConnectionPool:
+        def close(connection: FakeConnection):
+            connection.closed = True
+
+        return ConnectionPool(connect=FakeConnection,
+                              is_healthy=lambda connection: connection.healthy,
+                              close=close,
+                              **kwargs)
+
+    def test_released_connection_should_be_reused(self):
+        pool = self.create_pool()
+        connection = pool.acquire()
+        pool.release(connection)
+        self.assertIs(pool.acquire(), connection)
+        self.assertEqual(pool.stats()['created'], 1)
+        self.assertEqual(pool.stats()['reused'], 1)
+
+    def test_acquiring_from_full_pool_should_fail_after_timeout(self):
+        pool = self.create_pool(max_size=2, timeout=0.01)
+        pool.acquire()
+        pool.acquire()
+        with self.assertRaises(PoolExhausted):
+            pool.acquire()
+        self.assertEqual(pool.stats()['timeouts'], 1)
+
+    def test_acquiring_from_full_pool_should_wait_for_release(self):
+        pool = self.create_pool(max_size=1, timeout=5)
+        connection = pool.acquire()
+        threading.Timer(0.05, pool.release, (connection, )).start()
+        self.assertIs(pool.acquire(), connection)
+        self.assertEqual(pool.stats()['waits'], 1)
+
+    def test_discarded_connection_should_be_closed(self):
+        pool = self.create_pool(max_size=1)
+        connection = pool.acquire()
+        pool.release(connection, discard=True)
+        self.assertTrue(connection.closed)
+        self.assertIsNot(pool.acquire(), connection)
+
+    def test_old_connection_should_be_recycled(self):
+        pool = self.create_pool(max_lifetime=10)
+        with mock.patch('time.monotonic', return_value=0):
+            connection = pool.acquire()
+            pool.release(connection)
+        with mock.patch('time.monotonic', return_value=11):
+            self.assertIsNot(pool.acquire(), connection)
+        self.assertTrue(connection.closed)
+        self.assertEqual(pool.stats()['recycled'], 1)
+
+    def test_idle_connection_should_be_health_checked(self):
+        pool = self.create_pool(health_check_interval=5, max_idle=60)
+        with mock.patch('time.monotonic', return_value=0):
+            connection = pool.acquire()
+            pool.release(connection)
+        connection.healthy = False
+        with mock.patch('time.monotonic', return_value=1):
+            self.assertIs(pool.acquire(), connection)  # not checked yet
+            pool.release(connection)
+        with mock.patch('time.monotonic', return_value=7):
+            self.assertIsNot(pool.acquire(), connection)
+        self.assertEqual(pool.stats()['health_check_failures'], 1)
+
+    def test_failed_connect_should_free_the_slot(self):
+        pool = self.create_pool(max_size=1, timeout=0.01)
+        pool.connect = mock.Mock(side_effect=ConnectionError)
+        with self.assertRaises(ConnectionError):
+            pool.acquire()
+        self.assertEqual(pool.stats()['size'], 0)
@@ -0,0 +1,81 @@
+import math
+import random
+from unittest import skipIf
+from django.test import SimpleTestCase
+from apps.common import geohash
+
+
+class TestGeohash(SimpleTestCase):
+    """
+    Test the geohash encoding and the cells covering a circle
+
+    1. the encoding should match the reference geohashes
+    2. every point in the circle should be in one of the covering cells
+    3. the covering cells should be the finest cells not more than the limit
+    """
+    def test_encode_should_match_the_reference(self):
+        self.assertEqual(geohash.encode(42.6, -5.6, 5), 'ezs42')
+        self.assertEqual(geohash.encode(57.64911, 10.40744, 11),
+                         'u4pruydqqvj')
+
+    def test_prefix_range_should_contain_only_the_prefixed_geohashes(self):
+        self.assertEqual(geohash.prefix_range('u4p'), ('u4p', 'u4q'))
+        self.assertEqual(geohash.prefix_range('b9z'), ('b9z', 'bb'))
+        self.assertEqual(geohash.prefix_range('zz'), ('zz', None))
+        start, end = geohash.prefix_range('wydm')
+        for code in ('wydm', 'wydmzzzz', 'wydm0'):
+            self.assertTrue(start <= code < end)
+        for code in ('wydk', 'wydn', 'wydn0'):
+            self.assertFalse(start <= code < end)
+
+    def test_haversine_should_return_the_distance_in_meters(self):
+        # Seoul City Hall to Gangnam station, about 8.8km
+        distance = geohash.haversine(37.5665, 126.9780, 37.4979, 127.0276)
+        self.assertAlmostEqual(distance, 8800, delta=200)
+        self.assertEqual(geohash.haversine(37.5, 127.0, 37.5, 127.0), 0)
+
+    @skipIf(geohash.numpy is None, 'numpy is not installed')
+    def test_haversine_many_should_match_the_python_fallback(self):
+        random.seed(0)
+        latitudes = [random.uniform(-90, 90) for _ in range(1000)]
+        longitudes = [random.uniform(-180, 180) for _ in range(1000)]
+        vectorized = geohash.haversine_many(37.5665, 126.9780, latitudes,
+                                            longitudes)
+        fallback = geohash.haversine_many(37.5665,
+                                          126.9780,
+                                          latitudes,
+                                          longitudes,
+                                          use_numpy=False)
+        self.assertEqual(len(vectorized), 1000)
+        for distance, expected in zip(vectorized, fallback):
+            self.assertAlmostEqual(distance, expected, delta=1e-6)
+        self.assertEqual(geohash.haversine_many(0, 0, [], []), [])
+
+    def test_covering_cells_should_contain_every_point_in_the_circle(self):
+        random.seed(0)
+        for latitude, longitude, radius in (
+            (37.5665, 126.9780, 500),
+            (37.5665, 126.9780, 3000),
+            (-33.8688, 151.2093, 10000),
+            (64.1466, -21.9426, 1000),
+            (0.0001, 179.9999, 2000),  # on the antimeridian
+        ):
+            cells = geohash.covering_cells(latitude, longitude, radius)
+            for _ in range(200):
+                bearing = random.uniform(0, 2 * math.pi)
+                distance = random.uniform(0, radius)
+                point_latitude = latitude + distance * math.cos(
+                    bearing) / geohash.METERS_PER_DEGREE
+                point_longitude = longitude + distance * math.sin(bearing) / (
+                    geohash.METERS_PER_DEGREE *
+                    math.cos(math.radians(point_latitude)))
+                point_longitude = (point_longitude + 180) % 360 - 180
+                code = geohash.encode(point_latitude, point_longitude)
+                self.assertTrue(any(code.startswith(cell) for cell in cells))
+
+    def test_covering_cells_should_use_the_finest_precision(self):
+        for radius, precision in ((100, 7), (1000, 6), (3000, 5)):
+            cells = geohash.covering_cells(37.5, 127.0, radius)
+            self.assertLessEqual(len(cells), 16)
+            self.assertEqual({len(cell) for cell in cells}, {precision})
+        self.assertEqual(geohash.covering_cells(37.5, 127.0, 10**7), [''])
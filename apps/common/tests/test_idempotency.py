@@ -0,0 +1,155 @@
+import threading
+from datetime import timedelta
+from unittest import skipUnless
+from django.db import connection
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient, APITestCase
+from apps.common.idempotency import purge_expired_keys
+from apps.common.models import IdempotencyKey
+from apps.common.test import create_sample_credit_card, create_sample_restaurant, create_sample_user_and_get_token
+from apps.order.models import Order, OrderStatus, Selection
+from apps.user.models import User, UserRole
+
+
+def create_checkout(test, client):
+    """
+    creates a user with a credit card and a restaurant, returns the body of a checkout
+    """
+    test.user, token = create_sample_user_and_get_token(client, '01012341234')
+    client.credentials(HTTP_AUTHORIZATION='Bearer ' + token)
+    card = create_sample_credit_card(test.user)
+    owner = User.objects.create_user(phone_number='01043214321',
+                                     name='김사장',
+                                     password='thePas123Q',
+                                     role=UserRole.STORE_OWNER)
+    restaurant = create_sample_restaurant(owner)
+    return {
+        'credit_card': card.pk,
+        'selections': [{
+            'menu': restaurant.menuinformation_set.order_by('id').first().pk,
+            'amount': 1,
+        }],
+    }
+
+
+class TestIdempotencyKey(APITestCase):
+    """
+    Test the Idempotency-Key header with the order endpoints
+
+    1. the retries with the same key should get the same response without running the view again
+    2. the key used for another request should be rejected with 422
+    3. the failed requests should not be stored
+    4. the expired keys should be reusable and purged
+    """
+    def setUp(self):
+        self.body = create_checkout(self, self.client)
+
+    def checkout(self, key, body=None):
+        return self.client.post('/api/orders',
+                                body or self.body,
+                                format='json',
+                                HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retried_checkout_should_create_one_order(self):
+        first = self.checkout('key-1')
+        with CaptureQueriesContext(connection) as context:
+            second = self.checkout('key-1')
+        for query in context.captured_queries:  # the view never ran
+            self.assertNotIn('order_', query['sql'])
+            self.assertNotIn('restaurant_', query['sql'])
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(Order.objects.count(), 1)
+        self.assertEqual(Selection.objects.count(), 1)
+
+    def test_different_keys_should_create_orders(self):
+        self.checkout('key-1')
+        self.checkout('key-2')
+        self.client.post('/api/orders', self.body, format='json')
+        self.assertEqual(Order.objects.count(), 3)
+
+    def test_key_of_another_request_should_fail(self):
+        self.checkout('key-1')
+        body = dict(self.body, request='빨리 와주세요')
+        response = self.checkout('key-1', body)
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_failed_request_should_not_be_stored(self):
+        body = dict(self.body, credit_card=self.body['credit_card'] + 100)
+        self.assertEqual(self.checkout('key-1', body).status_code, 400)
+        self.assertFalse(IdempotencyKey.objects.exists())
+        self.assertEqual(self.checkout('key-1', body).status_code, 400)
+
+    def test_too_long_key_should_fail(self):
+        response = self.checkout('k' * 256)
+        self.assertEqual(response.status_code, 400)
+
+    def test_expired_key_should_run_the_view_again(self):
+        self.checkout('key-1')
+        IdempotencyKey.objects.update(expires=timezone.now() -
+                                      timedelta(seconds=1))
+        response = self.checkout('key-1')
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn('Idempotent-Replayed', response)
+        self.assertEqual(Order.objects.count(), 2)
+
+    def test_purge_should_delete_only_the_expired_keys(self):
+        self.checkout('key-1')
+        self.checkout('key-2')
+        IdempotencyKey.objects.filter(key='key-1').update(
+            expires=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(purge_expired_keys(sleep=0), 1)
+        self.assertEqual(
+            list(IdempotencyKey.objects.values_list('key', flat=True)),
+            ['key-2'])
+
+    def test_retried_payment_should_success(self):
+        order_id = self.checkout('key-1').data['id']
+        endpoint = f'/api/orders/{order_id}/pay'
+        first = self.client.post(endpoint, HTTP_IDEMPOTENCY_KEY='key-2')
+        second = self.client.post(endpoint, HTTP_IDEMPOTENCY_KEY='key-2')
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 200)
+        self.assertTrue(second.data['is_paid'])
+        self.assertEqual(second.data['status'], OrderStatus.PAID)
+
+        # without the key, paying again is an error
+        response = self.client.post(endpoint)
+        self.assertEqual(response.status_code, 400)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'the rows are locked only on postgresql')
+class TestConcurrentIdempotencyKey(TransactionTestCase):
+    """
+    the concurrent requests with the same key should wait for the first one and replay its response
+    """
+    def test_concurrent_checkouts_should_create_one_order(self):
+        client = APIClient()
+        body = create_checkout(self, client)
+        responses = []
+
+        def checkout():
+            try:
+                responses.append(
+                    client.post('/api/orders',
+                                body,
+                                format='json',
+                                HTTP_IDEMPOTENCY_KEY='key-1'))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=checkout) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([response.status_code for response in responses],
+                         [201] * 4)
+        self.assertEqual(len({response.data['id']
+                              for response in responses}), 1)
+        self.assertEqual(Order.objects.count(), 1)
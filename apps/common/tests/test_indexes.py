@@ -0,0 +1,63 @@
+from django.db import connection
+from django.db.models import QuerySet
+from django.test import TestCase
+from apps.credit_card.models import CreditCard
+from apps.order.models import Order, Selection
+from apps.restaurant.models import MenuInformation
+
+
+class AliveIndexQueryPlanTest(TestCase):
+    """
+    Test the query plans of the hot queries on the soft deletable models
+
+    each query of the default manager, which filters the soft deleted rows out,
+    should be served by the partial index over the alive rows,
+    and the queries over the deleted rows too, like the ones of the deletion collector, by the foreign key index.
+    """
+    def setUp(self):
+        if connection.vendor == 'postgresql':
+            # the tables are too small for the planner to prefer an index
+            with connection.cursor() as cursor:
+                cursor.execute('SET enable_seqscan = off')
+
+    def tearDown(self):
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('RESET enable_seqscan')
+
+    def assertUsesIndex(self, queryset: QuerySet, index_name: str):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan)
+
+    def test_credit_cards_by_owner_should_use_the_index(self):
+        self.assertUsesIndex(
+            CreditCard.objects.filter(owner_id=1).order_by('-created', '-id'),
+            'creditcard_owner_alive_idx')
+
+    def test_menus_by_restaurant_should_use_the_index(self):
+        self.assertUsesIndex(
+            MenuInformation.objects.filter(restaurant_id=1).order_by(
+                '-created', '-id'), 'menu_restaurant_alive_idx')
+
+    def test_selections_by_orderer_should_use_the_index(self):
+        self.assertUsesIndex(
+            Selection.objects.filter(orderer_id=1).order_by(
+                '-created', '-id'), 'selection_orderer_alive_idx')
+
+    def test_orders_by_created_should_use_the_index(self):
+        self.assertUsesIndex(
+            Order.objects.order_by('-created', '-id')[:20],
+            'order_created_alive_idx')
+
+    def test_queries_including_deleted_rows_should_not_use_the_index(self):
+        plan = CreditCard.all_objects.filter(owner_id=1).explain()
+        self.assertNotIn('creditcard_owner_alive_idx', plan)
+
+    def test_deletion_collector_queries_should_use_the_foreign_key_index(self):
+        for queryset in (CreditCard.all_objects.filter(owner_id=1),
+                         Selection.all_objects.filter(orderer_id=1),
+                         Order.all_objects.filter(orderer_id=1),
+                         Order.all_objects.filter(restaurant_id=1),
+                         MenuInformation.all_objects.filter(restaurant_id=1)):
+            # the name of the index django makes for a foreign key, like creditcard_owner_id_ab9701f4
+            self.assertRegex(queryset.explain(), r'_id_[0-9a-f]{8}\b')
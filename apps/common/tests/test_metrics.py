@@ -0,0 +1,95 @@
+import tempfile
+from unittest import mock
+from prometheus_client import REGISTRY
+from rest_framework.test import APITestCase
+from apps.common.metrics import get_registry
+from apps.common.test import create_sample_restaurant
+from apps.user.models import User, UserRole
+
+
+def get_value(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class MetricsTest(APITestCase):
+    """
+    Test the metrics of the requests
+
+    the metrics should work like:
+    1. the requests should be counted by the view, the method and the status
+    2. the latency should be observed into the histogram of the view
+    3. the queries and the serializers of the requests should be timed by the view
+    4. the requests in progress should be back to zero after the requests
+    5. the metrics should be served in the text format of prometheus
+    """
+    def setUp(self):
+        owner = User.objects.create_user(phone_number='01012341234',
+                                         name='홍길동',
+                                         password='thePas123Q',
+                                         role=UserRole.STORE_OWNER)
+        create_sample_restaurant(owner)
+
+    def test_request_should_be_recorded(self):
+        view = 'RestaurantView.list'
+        before = {
+            'requests':
+            get_value('http_requests_total',
+                      view=view,
+                      method='GET',
+                      status='200'),
+            'latency':
+            get_value('http_request_duration_seconds_count',
+                      view=view,
+                      method='GET'),
+            'queries':
+            get_value('http_request_db_queries_total', view=view),
+            'serializer':
+            get_value('http_request_serializer_seconds_total', view=view),
+        }
+        response = self.client.get('/api/restaurants')
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(
+            get_value('http_requests_total',
+                      view=view,
+                      method='GET',
+                      status='200'), before['requests'] + 1)
+        self.assertEqual(
+            get_value('http_request_duration_seconds_count',
+                      view=view,
+                      method='GET'), before['latency'] + 1)
+        self.assertEqual(get_value('http_request_db_queries_total', view=view),
+                         before['queries'] + 1)
+        self.assertGreater(
+            get_value('http_request_serializer_seconds_total', view=view),
+            before['serializer'])
+        self.assertEqual(get_value('http_requests_in_progress', method='GET'),
+                         0)
+
+    def test_not_found_should_be_unresolved(self):
+        before = get_value('http_requests_total',
+                           view='unresolved',
+                           method='GET',
+                           status='404')
+        self.client.get('/api/nothing')
+        self.assertEqual(
+            get_value('http_requests_total',
+                      view='unresolved',
+                      method='GET',
+                      status='404'), before + 1)
+
+    def test_metrics_should_success(self):
+        self.client.get('/api/restaurants')
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        self.assertIn(
+            b'http_requests_total{method="GET",status="200",view="RestaurantView.list"}',
+            response.content)
+
+    def test_multiprocess_registry_should_read_directory(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with mock.patch.dict('os.environ',
+                                 {'PROMETHEUS_MULTIPROC_DIR': directory}):
+                registry = get_registry()
+        self.assertIsNot(registry, REGISTRY)
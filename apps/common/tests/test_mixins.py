@@ -0,0 +1,125 @@
+from datetime import timedelta
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.test import APITestCase
+from apps.common.test import create_sample_credit_card, create_sample_user_and_get_token
+from apps.credit_card.models import CreditCard
+from apps.user.models import User
+
+
+class TestConditionalGetMixin(APITestCase):
+    """
+    Test the conditional GET with the user profile and the credit card views
+
+    the views should work like:
+    1. the responses should have the ETag and Last-Modified headers, the lists the ETag only
+    2. the request with the same validators should get 304 without the body
+    3. changing, adding or deleting the rows should change the validators,
+       and so should the rows of the other pages changing the links of a page
+    4. the 304 response of a cached user profile should not query the database
+    """
+    def setUp(self):
+        self.user, token = create_sample_user_and_get_token(
+            self.client, '01012341234')
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + token)
+        self.card = create_sample_credit_card(self.user)
+
+    def test_response_should_have_validators(self):
+        response = self.client.get('/api/users')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['ETag'].startswith('W/"'))
+        self.assertIn('Last-Modified', response)
+        self.assertIn('Authorization', response['Vary'])
+
+    def test_profile_with_same_etag_should_return_304(self):
+        etag = self.client.get('/api/users')['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/users', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+
+    def test_changed_profile_should_return_200(self):
+        etag = self.client.get('/api/users')['ETag']
+        User.objects.get(pk=self.user.pk).save()
+        response = self.client.get('/api/users', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_card_list_with_same_etag_should_return_304(self):
+        etag = self.client.get('/api/credit-cards')['ETag']
+        response = self.client.get('/api/credit-cards',
+                                   HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_not_modified_card_list_should_only_query_the_page(self):
+        etag = self.client.get('/api/credit-cards')['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/credit-cards',
+                                       HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_card_list_should_change_etag_on_addition_and_deletion(self):
+        etag = self.client.get('/api/credit-cards')['ETag']
+        card = create_sample_credit_card(self.user, '홍길동의 두번째 카드')
+        response = self.client.get('/api/credit-cards',
+                                   HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        etag = response['ETag']
+        # the deletion may not change max(modified) of the remaining rows
+        CreditCard.all_objects.filter(pk=card.pk).update(
+            deleted=timezone.now(),
+            modified=timezone.now() - timedelta(days=1))
+        response = self.client.get('/api/credit-cards',
+                                   HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_card_list_after_deletion_should_not_be_modified_since(self):
+        card = create_sample_credit_card(self.user, '홍길동의 두번째 카드')
+        response = self.client.get('/api/credit-cards')
+        self.assertNotIn('Last-Modified', response)
+        card.delete()
+        response = self.client.get(
+            '/api/credit-cards',
+            HTTP_IF_MODIFIED_SINCE=http_date(timezone.now().timestamp() + 60))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_card_list_page_should_change_etag_with_its_links(self):
+        create_sample_credit_card(self.user, '홍길동의 두번째 카드')
+        response = self.client.get('/api/credit-cards', {'page_size': 2})
+        self.assertIsNone(response.data['next'])
+        etag = response['ETag']
+        # on the next page, the rows of the page are the same
+        older = create_sample_credit_card(self.user, '홍길동의 예전 카드')
+        CreditCard.objects.filter(pk=older.pk).update(
+            created=self.card.created - timedelta(days=1))
+        response = self.client.get('/api/credit-cards', {'page_size': 2},
+                                   HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNotNone(response.data['next'])
+
+    def test_card_list_pages_should_have_different_etags(self):
+        create_sample_credit_card(self.user, '홍길동의 두번째 카드')
+        first_page = self.client.get('/api/credit-cards', {'page_size': 1})
+        second_page = self.client.get(first_page.data['next'])
+        self.assertNotEqual(first_page['ETag'], second_page['ETag'])
+
+    def test_card_detail_with_if_modified_since_should_return_304(self):
+        endpoint = f'/api/credit-cards/{self.card.pk}'
+        response = self.client.get(endpoint,
+                                   HTTP_IF_MODIFIED_SINCE=http_date(
+                                       self.card.modified.timestamp() + 1))
+        self.assertEqual(response.status_code, 304)
+
+        self.card.alias = '새 카드'
+        self.card.modified = self.card.modified + timedelta(seconds=2)
+        CreditCard.objects.filter(pk=self.card.pk).update(
+            alias=self.card.alias, modified=self.card.modified)
+        response = self.client.get(endpoint,
+                                   HTTP_IF_MODIFIED_SINCE=http_date(
+                                       self.card.modified.timestamp() - 1))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['alias'], '새 카드')
@@ -0,0 +1,81 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from apps.common.test import create_sample_credit_card, create_sample_user_and_get_token
+from apps.credit_card.models import CreditCard
+
+
+class TestKeysetPagination(APITestCase):
+    ENDPOINT = '/api/credit-cards'
+    """
+    Test the keyset pagination with the list view of the credit cards
+
+    the pagination should work like:
+    1. the newest cards should come first
+    2. following the next and previous links should visit every card exactly once,
+       even when the cards share the same created timestamp
+    3. the queries should never use OFFSET or COUNT
+    4. an invalid cursor should return 404
+    """
+    def setUp(self):
+        user, token = create_sample_user_and_get_token(self.client,
+                                                       '01012341234')
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + token)
+        for i in range(7):
+            create_sample_credit_card(user, f'홍길동의 카드{i}')
+        # the cards 2, 3 and 4 are created at the same time
+        CreditCard.objects.filter(alias__in=(
+            '홍길동의 카드2',
+            '홍길동의 카드3',
+            '홍길동의 카드4',
+        )).update(created=timezone.now())
+        self.expected = list(
+            CreditCard.objects.order_by('-created',
+                                        '-id').values_list('alias',
+                                                           flat=True))
+
+    def get_aliases(self, response) -> list:
+        return [card['alias'] for card in response.data['results']]
+
+    def test_first_page_should_contain_the_newest_cards(self):
+        response = self.client.get(self.ENDPOINT, {'page_size': 3})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get_aliases(response), self.expected[:3])
+        self.assertIsNotNone(response.data['next'])
+        self.assertIsNone(response.data['previous'])
+
+    def test_following_next_links_should_visit_every_card_once(self):
+        aliases = []
+        url = self.ENDPOINT + '?page_size=2'
+        while url:
+            response = self.client.get(url)
+            aliases += self.get_aliases(response)
+            url = response.data['next']
+        self.assertEqual(aliases, self.expected)
+
+    def test_following_previous_links_should_visit_every_card_once(self):
+        url = self.ENDPOINT + '?page_size=2'
+        while True:  # go to the last page
+            response = self.client.get(url)
+            if response.data['next'] is None:
+                break
+            url = response.data['next']
+        pages = [self.get_aliases(response)]
+        while response.data['previous']:
+            response = self.client.get(response.data['previous'])
+            pages.insert(0, self.get_aliases(response))
+        self.assertEqual(sum(pages, []), self.expected)
+        self.assertEqual(len(pages[0]), 2)
+
+    def test_queries_should_not_use_offset_nor_count(self):
+        response = self.client.get(self.ENDPOINT, {'page_size': 2})
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(response.data['next'])
+        for query in context.captured_queries:
+            self.assertNotIn('OFFSET', query['sql'].upper())
+            self.assertNotIn('COUNT(', query['sql'].upper())
+
+    def test_invalid_cursor_should_return_404(self):
+        response = self.client.get(self.ENDPOINT, {'cursor': 'invalid'})
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,128 @@
+import pstats
+import tempfile
+from unittest import mock
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from apps.common.profiling import RateLimiter, get_profile_path
+from apps.common.test import create_sample_user_and_get_token
+
+
+class ServerTimingTest(APITestCase):
+    ENDPOINT = '/api/credit-cards'
+    """
+    Test the Server-Timing header of the responses
+
+    the header should work like:
+    1. the parts of the request should be timed in milliseconds, with the number of the queries
+    2. the header should be left out when it is disabled
+    """
+    def setUp(self):
+        self.user, token = create_sample_user_and_get_token(
+            self.client, '01012341234')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_server_timing_should_success(self):
+        response = self.client.get(self.ENDPOINT)
+        self.assertEqual(response.status_code, 200)
+        parts = {
+            entry.split(';')[0]: entry
+            for entry in response['Server-Timing'].split(', ')
+        }
+        for part in ('auth', 'permission', 'db', 'serialize', 'render',
+                     'total'):
+            self.assertIn(part, parts)
+        self.assertIn('desc="1 queries"', parts['db'])
+
+    def test_token_obtain_should_be_timed_by_validate(self):
+        response = self.client.post('/api/token', {
+            'phone_number': '01012341234',
+            'password': 'thePas123Q',
+        })
+        self.assertIn('validate;dur=', response['Server-Timing'])
+
+    @override_settings(SERVER_TIMING_ENABLED=False)
+    def test_disabled_server_timing_should_be_left_out(self):
+        response = self.client.get(self.ENDPOINT)
+        self.assertFalse(response.has_header('Server-Timing'))
+
+
+class ProfilingTest(APITestCase):
+    ENDPOINT = '/api/credit-cards'
+    """
+    Test the profiles of the requests on demand of the staff
+
+    the profiling should work like:
+    1. a request of the staff with the header should be profiled by the sampler or cProfile
+    2. the profiles should be listed and downloaded by the staff only
+    3. the requests of the others should run as usual
+    4. the profiles over the rate limit should be skipped
+    5. only the latest profiles should be kept
+    """
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        settings = override_settings(PROFILE_DIR=self.directory.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        self.staff, self.staff_token = create_sample_user_and_get_token(
+            self.client, '01012341234')
+        self.staff.is_staff = True
+        self.staff.save()
+        self.user, self.user_token = create_sample_user_and_get_token(
+            self.client, '01043214321')
+
+    def request(self, token: str, profiler: str):
+        return self.client.get(self.ENDPOINT,
+                               HTTP_AUTHORIZATION=f'Bearer {token}',
+                               HTTP_X_PROFILE=profiler)
+
+    def test_sample_profile_should_success(self):
+        response = self.request(self.staff_token, 'sample')
+        self.assertEqual(response.status_code, 200)
+        name = response['X-Profile']
+        self.assertTrue(name.endswith('.txt'))
+
+        self.client.force_authenticate(self.staff)
+        response = self.client.get('/api/internal/profiles')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([profile['name'] for profile in response.data],
+                         [name])
+        response = self.client.get(f'/api/internal/profiles/{name}')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('attachment', response['Content-Disposition'])
+
+    def test_cprofile_should_success(self):
+        response = self.request(self.staff_token, 'cprofile')
+        name = response['X-Profile']
+        self.assertTrue(name.endswith('.prof'))
+        stats = pstats.Stats(get_profile_path(name))
+        self.assertTrue(stats.total_calls)
+
+    def test_request_of_others_should_not_be_profiled(self):
+        response = self.request(self.user_token, 'cprofile')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('X-Profile'))
+
+        self.client.force_authenticate(self.user)
+        response = self.client.get('/api/internal/profiles')
+        self.assertEqual(response.status_code, 403)
+
+    def test_profile_over_rate_limit_should_be_skipped(self):
+        with mock.patch.object(RateLimiter, 'acquire', return_value=False):
+            response = self.request(self.staff_token, 'cprofile')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Profile'], 'rate-limited')
+
+        rate_limiter = RateLimiter(2, 60)
+        self.assertTrue(rate_limiter.acquire())
+        self.assertTrue(rate_limiter.acquire())
+        self.assertFalse(rate_limiter.acquire())
+
+    @override_settings(PROFILE_MAX_FILES=2)
+    def test_old_profiles_should_be_removed(self):
+        for _ in range(3):
+            self.request(self.staff_token, 'sample')
+        self.client.force_authenticate(self.staff)
+        response = self.client.get('/api/internal/profiles')
+        self.assertEqual(len(response.data), 2)
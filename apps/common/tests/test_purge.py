@@ -0,0 +1,89 @@
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from apps.common.purge import purge_soft_deleted
+from apps.common.test import create_sample_credit_card
+from apps.credit_card.models import CreditCard
+from apps.order.models import Order, Selection
+from apps.user.models import User, UserRole
+
+
+class PurgeSoftDeletedTest(TestCase):
+    """
+    Test the purge of the soft deleted rows
+
+    the purge should work like:
+    1. only the rows soft deleted before the retention days should be hard deleted
+    2. the alive rows should never be touched
+    3. the SET_NULL relations to the purged rows should be set to null
+    4. the selections still held by an order should be kept
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(phone_number='01012341234',
+                                             name='홍길동',
+                                             password='thePas123Q',
+                                             role=UserRole.CLIENT)
+
+    def soft_delete(self, instance, days_ago: int):
+        instance.delete()
+        type(instance).all_objects.filter(pk=instance.pk).update(
+            deleted=timezone.now() - timedelta(days=days_ago))
+
+    def test_only_old_soft_deleted_rows_should_be_purged(self):
+        alive = create_sample_credit_card(self.user, 'alive')
+        recently_deleted = create_sample_credit_card(self.user,
+                                                     'recently deleted')
+        old_deleted = [
+            create_sample_credit_card(self.user, f'old {i}') for i in range(5)
+        ]
+        self.soft_delete(recently_deleted, days_ago=1)
+        for card in old_deleted:
+            self.soft_delete(card, days_ago=40)
+
+        results = purge_soft_deleted(days=30,
+                                     batch_size=2,
+                                     sleep=0,
+                                     model_labels=['credit_card.CreditCard'])
+
+        self.assertEqual(results[0].deleted, 5)
+        self.assertEqual(
+            set(CreditCard.all_objects.values_list('pk', flat=True)),
+            {alive.pk, recently_deleted.pk})
+
+    def test_purged_card_should_be_unset_from_orders(self):
+        card = create_sample_credit_card(self.user, 'old')
+        order = Order.objects.create(total_cost=1000,
+                                     purchased_credit_card=card)
+        self.soft_delete(card, days_ago=40)
+
+        purge_soft_deleted(days=30, sleep=0)
+
+        order.refresh_from_db()
+        self.assertIsNone(order.purchased_credit_card)
+
+    def test_selections_of_orders_should_be_kept(self):
+        selection = Selection.objects.create(orderer=self.user, request='')
+        order = Order.objects.create(total_cost=1000)
+        order.selections.add(selection)
+        self.soft_delete(selection, days_ago=40)
+
+        purge_soft_deleted(days=30, sleep=0)
+        self.assertTrue(Selection.all_objects.filter(pk=selection.pk).exists())
+
+        self.soft_delete(order, days_ago=40)
+        purge_soft_deleted(days=30, sleep=0)
+        self.assertFalse(Order.all_objects.filter(pk=order.pk).exists())
+        self.assertFalse(
+            Selection.all_objects.filter(pk=selection.pk).exists())
+
+    def test_command_should_report_rows_per_second(self):
+        self.soft_delete(create_sample_credit_card(self.user, 'old'),
+                         days_ago=40)
+        stdout = StringIO()
+        call_command('purge_soft_deleted', '--days=30', '--sleep=0',
+                     stdout=stdout)
+        self.assertIn('credit_card.CreditCard: 1 rows purged',
+                      stdout.getvalue())
+        self.assertIn('rows/s', stdout.getvalue())
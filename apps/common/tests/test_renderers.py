@@ -0,0 +1,100 @@
+import datetime
+import decimal
+import io
+import uuid
+from unittest import mock, skipIf
+import pytz
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy as _
+from rest_framework import parsers, renderers
+from rest_framework.exceptions import ParseError
+from apps.common.parsers import JSONParser
+from apps.common.renderers import JSONRenderer, orjson
+
+KST = pytz.timezone('Asia/Seoul')
+
+
+class JSONRendererTest(SimpleTestCase):
+    """
+    Test the JSON renderer and parser by orjson
+
+    the renderer and the parser should work like:
+    1. the rendered bytes should be the same as the ones of rest_framework
+    2. the indents and the integers over 64 bits should be rendered by the stdlib json
+    3. the parsed data should be the same as the one of rest_framework,
+       with the integers over 64 bits exact and the numbers over the floats infinite
+    4. the invalid JSON, NaN and Infinity should fail with ParseError
+    5. NaN and Infinity should be rendered as null, unlike the error of rest_framework
+    """
+    data = {
+        'name': '팡팡치킨',
+        'menus': [{
+            'id': 1,
+            'name': '후라이드 치킨',
+            'price': decimal.Decimal('18000.50'),
+        }],
+        'created': datetime.datetime(2021, 7, 1, 12, 30, 15, 123456,
+                                     pytz.utc),
+        'delivered': KST.localize(datetime.datetime(2021, 7, 1, 21, 30)),
+        'naive': datetime.datetime(2021, 7, 1, 12, 30),
+        'date': datetime.date(2021, 7, 1),
+        'time': datetime.time(12, 30),
+        'status': _('Client'),
+        'uuid': uuid.UUID('12345678123456781234567812345678'),
+        'counts': {
+            1: 2
+        },
+        'notice': '줄\u2028바꿈\u2029',
+        'empty': None,
+    }
+
+    def test_rendered_bytes_should_be_the_same(self):
+        self.assertEqual(JSONRenderer().render(self.data),
+                         renderers.JSONRenderer().render(self.data))
+        self.assertEqual(JSONRenderer().render(None), b'')
+
+    @skipIf(orjson is None, 'orjson is not installed')
+    def test_orjson_should_render_the_data(self):
+        with mock.patch.object(renderers.JSONRenderer,
+                               'render',
+                               side_effect=AssertionError):
+            self.assertIn(b'\\u2028', JSONRenderer().render(self.data))
+
+    def test_stdlib_json_should_render_what_orjson_cannot(self):
+        for data, accepted_media_type in ((self.data,
+                                           'application/json; indent=4'),
+                                          ({
+                                              'big': 2**70
+                                          }, None)):
+            self.assertEqual(
+                JSONRenderer().render(data, accepted_media_type),
+                renderers.JSONRenderer().render(data, accepted_media_type))
+
+    def test_parsed_data_should_be_the_same(self):
+        body = '{"name": "홍길동", "price": 1.5, "menus": [1, 2]}'.encode()
+        self.assertEqual(JSONParser().parse(io.BytesIO(body)),
+                         parsers.JSONParser().parse(io.BytesIO(body)))
+
+    def test_numbers_out_of_orjson_should_be_parsed_the_same(self):
+        for body in (b'{"big": 36893488147419103232}',
+                     b'[-9223372036854775809, 18446744073709551615]',
+                     b'{"price": 1e400}', b'[-1e400, 0.1234567890123456789]'):
+            parsed = JSONParser().parse(io.BytesIO(body))
+            self.assertEqual(parsed,
+                             parsers.JSONParser().parse(io.BytesIO(body)))
+        self.assertEqual(
+            JSONParser().parse(io.BytesIO(b'{"big": 36893488147419103232}')),
+            {'big': 2**65})
+
+    def test_invalid_json_should_fail(self):
+        for body in (b'{"name": ', b'{"price": NaN}', b'[Infinity]'):
+            with self.assertRaises(ParseError):
+                JSONParser().parse(io.BytesIO(body))
+
+    @skipIf(orjson is None, 'orjson is not installed')
+    def test_nan_and_infinity_should_be_rendered_as_null(self):
+        data = {'nan': float('nan'), 'infinity': [float('inf')]}
+        self.assertEqual(JSONRenderer().render(data),
+                         b'{"nan":null,"infinity":[null]}')
+        with self.assertRaises(ValueError):
+            renderers.JSONRenderer().render(data)
@@ -0,0 +1,101 @@
+from io import StringIO
+from django.core.management import CommandError, call_command
+from django.db.models import Sum
+from rest_framework.test import APITestCase
+from apps.common.seed import PASSWORD
+from apps.credit_card.models import CreditCard
+from apps.order.models import PAID_STATUSES, Order, Selection
+from apps.restaurant.models import Location, MenuInformation, Restaurant
+from apps.sales.models import RestaurantDailySales
+from apps.user.models import User, UserRole
+
+
+class SeedTest(APITestCase):
+    """
+    Test the seed command
+
+    the seed command should work like:
+    1. the given numbers of the rows should be inserted with the valid relations
+    2. the total cost of an order should be the sum of its snapshotted selections
+    3. the same seed should build the same orders
+    4. the seeded users should log in with the shared password
+    5. the rollups of the seeded days should be rebuilt on demand
+    """
+    OPTIONS = {
+        'users': 20,
+        'restaurants': 4,
+        'menus': 3,
+        'orders': 50,
+        'days': 3,
+        'batch_size': 7,
+    }
+
+    def seed(self, **options):
+        call_command('seed', stdout=StringIO(), **{**self.OPTIONS, **options})
+
+    def get_orders(self) -> list:
+        # the keys move after the first seed, so only the values are compared
+        return list(
+            Order.objects.order_by('pk').values_list('total_cost', 'status'))
+
+    def test_seed_should_success(self):
+        self.seed()
+        self.assertEqual(
+            User.objects.filter(role=UserRole.STORE_OWNER).count(), 2)
+        self.assertEqual(User.objects.filter(role=UserRole.CLIENT).count(), 20)
+        self.assertEqual(CreditCard.objects.count(), 20)
+        self.assertEqual(Restaurant.objects.count(), 4)
+        self.assertEqual(Location.objects.exclude(geohash='').count(), 4)
+        self.assertEqual(MenuInformation.objects.count(), 12)
+        self.assertEqual(Order.objects.count(), 50)
+
+        for order in Order.objects.prefetch_related('selections__menu'):
+            self.assertEqual(order.purchased_credit_card.owner_id,
+                             order.orderer_id)
+            selections = order.selections.all()
+            self.assertTrue(1 <= len(selections) <= 3)
+            self.assertEqual(
+                order.total_cost,
+                sum(selection.unit_price * selection.amount
+                    for selection in selections))
+            for selection in selections:
+                self.assertEqual(selection.menu.restaurant_id,
+                                 order.restaurant_id)
+                self.assertEqual(selection.unit_price, selection.menu.price)
+                self.assertEqual(selection.menu_name, selection.menu.name)
+
+        # the sequences should continue after the seeded rows
+        user = User.objects.create_user(phone_number='01099999999',
+                                        name='홍길동',
+                                        password=PASSWORD)
+        self.assertEqual(user.pk, 23)
+
+    def test_same_seed_should_build_same_orders(self):
+        self.seed(seed=3)
+        orders = self.get_orders()
+        Order.all_objects.all().delete()
+        Selection.all_objects.all().delete()
+        self.seed(seed=3)
+        self.assertEqual(self.get_orders(), orders)
+
+    def test_seeded_user_should_login(self):
+        self.seed(orders=0)
+        user = User.objects.filter(role=UserRole.CLIENT).first()
+        response = self.client.post('/api/token',
+                                    data={
+                                        'phone_number': user.phone_number,
+                                        'password': PASSWORD,
+                                    })
+        self.assertEqual(response.status_code, 200)
+
+    def test_seed_with_rollups_should_success(self):
+        self.seed(rollups=True)
+        self.assertEqual(
+            RestaurantDailySales.objects.aggregate(
+                revenue=Sum('revenue'))['revenue'],
+            Order.objects.filter(status__in=PAID_STATUSES).aggregate(
+                revenue=Sum('total_cost'))['revenue'])
+
+    def test_orders_without_menus_should_fail(self):
+        with self.assertRaises(CommandError):
+            self.seed(menus=0)
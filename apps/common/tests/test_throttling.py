@@ -0,0 +1,108 @@
+import multiprocessing
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APITestCase
+from apps.common import buckets
+from apps.common.buckets import SharedBuckets, take_token
+from apps.user.models import User, UserRole
+
+
+@override_settings(RATE_LIMIT_ENABLED=True,
+                   RATE_LIMITS={
+                       'login_ip': '4/min',
+                       'login_phone_number': '2/min',
+                       'register_ip': '1/min',
+                       'refresh_ip': '1/min',
+                   })
+class RateLimitTest(APITestCase):
+    ENDPOINT = '/api/token'
+    """
+    Test the rate limits of the login, the registration and the token refresh
+
+    the rate limits should work like:
+    1. the logins over the limit of the phone number should fail with 429 and Retry-After
+    2. the limited requests should not query the database nor hash the password
+    3. the logins over the limit of the address should fail for any phone number
+    4. the registrations and the token refreshes should be limited by the address
+    5. nothing should be limited when the rate limits are off
+    """
+    def setUp(self):
+        buckets.clear()
+        self.addCleanup(buckets.clear)
+        User.objects.create_user(phone_number='01012341234',
+                                 name='홍길동',
+                                 password='thePas123Q',
+                                 role=UserRole.CLIENT)
+
+    def login(self, phone_number='01012341234', address='10.0.0.1'):
+        data = {'phone_number': phone_number, 'password': 'thePas123Q'}
+        return self.client.post(self.ENDPOINT,
+                                data,
+                                HTTP_X_FORWARDED_FOR=address)
+
+    def test_login_over_phone_number_limit_should_fail(self):
+        self.assertEqual(self.login().status_code, 200)
+        self.assertEqual(self.login(address='10.0.0.2').status_code, 200)
+        with self.assertNumQueries(0):
+            response = self.login(address='10.0.0.3')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '30')
+
+    def test_login_over_address_limit_should_fail(self):
+        for i in range(4):
+            self.login(phone_number=f'0101234000{i}')
+        response = self.login(phone_number='01012340009')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(self.login(address='10.0.0.2').status_code, 200)
+
+    def test_register_and_refresh_should_be_limited(self):
+        data = {'phone_number': '01043214321', 'password': 'thePas123Q'}
+        self.client.post('/api/users/register', data)
+        response = self.client.post('/api/users/register', data)
+        self.assertEqual(response.status_code, 429)
+
+        refresh = self.login().data['refresh']
+        self.client.post('/api/token/refresh', {'refresh': refresh})
+        response = self.client.post('/api/token/refresh',
+                                    {'refresh': refresh})
+        self.assertEqual(response.status_code, 429)
+
+    @override_settings(RATE_LIMIT_ENABLED=False)
+    def test_disabled_rate_limit_should_allow_all(self):
+        for _ in range(5):
+            self.assertEqual(self.login().status_code, 200)
+
+
+def take_from_shared(table: SharedBuckets):
+    for _ in range(2):
+        table.take('login_ip:10.0.0.1', 1 / 60, 2, 100)
+
+
+class TokenBucketTest(SimpleTestCase):
+    """
+    Test the token buckets
+
+    the buckets should work like:
+    1. a token should be taken while the bucket holds one, and refilled by the rate up to the capacity
+    2. the shared buckets should be shared by the forked processes
+    3. the buckets of a full table should be dropped from the least recently updated
+    """
+    def test_take_token_should_success(self):
+        self.assertEqual(take_token(1, 0, 0, 0.5, 2), (0, 0))
+        self.assertEqual(take_token(0, 0, 1, 0.5, 2), (0.5, 1))
+        self.assertEqual(take_token(0, 0, 100, 0.5, 2), (1, 0))
+
+    def test_shared_buckets_should_be_shared_by_processes(self):
+        table = SharedBuckets(64)
+        process = multiprocessing.get_context('fork').Process(
+            target=take_from_shared, args=(table, ))
+        process.start()
+        process.join()
+        self.assertEqual(table.take('login_ip:10.0.0.1', 1 / 60, 2, 100),
+                         60)
+        self.assertEqual(table.take('login_ip:10.0.0.2', 1 / 60, 2, 100), 0)
+
+    def test_least_recently_updated_bucket_should_be_dropped(self):
+        table = SharedBuckets(1)
+        table.take('a', 1 / 60, 1, 100)
+        table.take('b', 1 / 60, 1, 101)
+        self.assertEqual(table.take('a', 1 / 60, 1, 102), 0)
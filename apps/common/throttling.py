@@ -0,0 +1,74 @@
+"""
+the rate limits of the expensive endpoints like the login, by the token buckets of apps.common.buckets
+
+the throttles take the rate of `<throttle_scope of the view>_<kind of the throttle>` in RATE_LIMITS,
+like '5/min', a burst of 5 requests refilled by one every 12 seconds.
+they are checked by rest_framework before the handler, so a limited request is answered with 429 and Retry-After
+before its password is hashed or the database is queried. unless RATE_LIMIT_ENABLED, nothing is limited.
+"""
+import functools
+import typing
+from django.conf import settings
+from rest_framework.throttling import BaseThrottle
+from apps.common import buckets
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+
+
+@functools.lru_cache(maxsize=None)
+def parse_rate(rate: str) -> typing.Tuple[float, float]:
+    """
+    returns the tokens a second and the capacity of a rate like '5/min'
+    """
+    requests, period = rate.split('/')
+    return int(requests) / PERIODS[period[0]], int(requests)
+
+
+class TokenBucketThrottle(BaseThrottle):
+    kind: str
+
+    def __init__(self):
+        self.wait_seconds = None
+
+    def get_key(self, request, view) -> typing.Optional[str]:
+        """
+        the key of the bucket, or None not to limit the request
+        """
+        raise NotImplementedError()
+
+    def allow_request(self, request, view) -> bool:
+        if not settings.RATE_LIMIT_ENABLED:
+            return True
+        scope = f'{view.throttle_scope}_{self.kind}'
+        rate = settings.RATE_LIMITS.get(scope)
+        key = self.get_key(request, view)
+        if rate is None or key is None:
+            return True
+        self.wait_seconds = buckets.take(f'{scope}:{key}', *parse_rate(rate))
+        return not self.wait_seconds
+
+    def wait(self) -> typing.Optional[float]:
+        return self.wait_seconds
+
+
+class IPThrottle(TokenBucketThrottle):
+    """
+    limits by the address of the client, from X-Forwarded-For of nginx (see NUM_PROXIES)
+    """
+    kind = 'ip'
+
+    def get_key(self, request, view):
+        return self.get_ident(request)
+
+
+class PhoneNumberThrottle(TokenBucketThrottle):
+    """
+    limits by the phone number in the body, against the guesses of the passwords of a user from many addresses
+    """
+    kind = 'phone_number'
+
+    def get_key(self, request, view):
+        phone_number = request.data.get('phone_number')
+        if not isinstance(phone_number, str):
+            return None
+        return phone_number[:16]
@@ -0,0 +1,134 @@
+"""
+the timings of the parts of each request, in the Server-Timing header and the metrics of apps.common.metrics
+
+TimingMiddleware times the parts of the requests, in milliseconds in the header:
+1. auth, permission and validate, the authentication, the permission checks and the serializer validation of the views
+2. db, the queries counted by an execute wrapper of the connections
+3. serialize, the `data` of the top level serializers
+4. render, the rendering of the responses like the JSON encoding
+5. total, the whole request under the middleware
+the parts may overlap, like the queries run by a permission check.
+the methods of rest_framework are wrapped by instrument(), once when the app is ready.
+"""
+import contextvars
+import functools
+import time
+import typing
+from django.conf import settings
+from django.db import connections
+from django.http.request import HttpRequest
+
+PARTS = ('auth', 'permission', 'validate', 'db', 'serialize', 'render')
+
+
+class RequestTimings:
+    """
+    the seconds spent in the parts of a request, also the execute wrapper timing its queries
+    """
+    __slots__ = PARTS + ('queries', 'total', 'active')
+
+    def __init__(self):
+        for part in PARTS:
+            setattr(self, part, 0.0)
+        self.queries = 0
+        self.total = 0.0
+        self.active = set()  # the parts being timed, the nested calls are timed by the outer ones
+
+    def __call__(self, execute, sql, params, many, context):
+        started_at = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db += time.perf_counter() - started_at
+
+    def get_header(self) -> str:
+        entries = []
+        for part in PARTS:
+            seconds = getattr(self, part)
+            if not seconds:
+                continue
+            entry = f'{part};dur={seconds * 1000:.3f}'
+            if part == 'db':
+                entry += f';desc="{self.queries} queries"'
+            entries.append(entry)
+        entries.append(f'total;dur={self.total * 1000:.3f}')
+        return ', '.join(entries)
+
+
+current_timings: contextvars.ContextVar[
+    typing.Optional[RequestTimings]] = contextvars.ContextVar(
+        'current_timings', default=None)
+
+
+def timed(part: str, function: typing.Callable) -> typing.Callable:
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        timings = current_timings.get()
+        if timings is None or part in timings.active:
+            return function(*args, **kwargs)
+        timings.active.add(part)
+        started_at = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            timings.active.discard(part)
+            setattr(timings, part,
+                    getattr(timings, part) + time.perf_counter() - started_at)
+
+    return wrapper
+
+
+def instrument():
+    from rest_framework.serializers import BaseSerializer
+    from rest_framework.views import APIView
+
+    APIView.perform_authentication = timed('auth',
+                                           APIView.perform_authentication)
+    APIView.check_permissions = timed('permission', APIView.check_permissions)
+    APIView.check_object_permissions = timed('permission',
+                                             APIView.check_object_permissions)
+    BaseSerializer.is_valid = timed('validate', BaseSerializer.is_valid)
+    BaseSerializer.data = property(timed('serialize',
+                                         BaseSerializer.data.fget))
+
+
+class TimingMiddleware:
+    """
+    times the parts of the requests into `request.timings`,
+    and adds the Server-Timing header unless SERVER_TIMING_ENABLED is off.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest):
+        timings = RequestTimings()
+        request.timings = timings
+        token = current_timings.set(timings)
+        # like connection.execute_wrapper(), without the cost of its context manager on every request
+        execute_wrappers = [
+            connection.execute_wrappers for connection in connections.all()
+        ]
+        for wrappers in execute_wrappers:
+            wrappers.append(timings)
+        started_at = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            for wrappers in execute_wrappers:
+                wrappers.remove(timings)
+            current_timings.reset(token)
+        timings.total = time.perf_counter() - started_at
+        if settings.SERVER_TIMING_ENABLED:
+            response['Server-Timing'] = timings.get_header()
+        return response
+
+    def process_template_response(self, request: HttpRequest, response):
+        # called right before the rendering, which ends by the post render callbacks
+        started_at = time.perf_counter()
+
+        def rendered(response):
+            request.timings.render += time.perf_counter() - started_at
+
+        response.add_post_render_callback(rendered)
+        return response
@@ -0,0 +1,70 @@
+import os
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from rest_framework import permissions, status, viewsets
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from apps.common.db.pool import get_pools_stats
+from apps.common.metrics import get_registry
+from apps.common.profiling import PROFILE_NAME, get_profile_path, get_profiles
+from apps.common.sse import create_ticket
+
+
+class DatabasePoolStatsView(APIView):
+    """
+    returns the stats of the database connection pools of the worker process which served the request
+    """
+    permission_classes = (permissions.IsAdminUser, )
+
+    def get(self, request):
+        return Response({'pid': os.getpid(), 'pools': get_pools_stats()})
+
+
+class ProfileView(viewsets.ViewSet):
+    """
+    lists and downloads the profiles of apps.common.profiling saved by the worker process which served the request,
+    or by any worker when PROFILE_DIR is shared
+    """
+    permission_classes = (permissions.IsAdminUser, )
+    lookup_field = 'name'
+    lookup_value_regex = PROFILE_NAME.pattern
+
+    def list(self, request):
+        return Response([{
+            'name': entry.name,
+            'size': entry.stat().st_size,
+            'created': entry.stat().st_mtime,
+        } for entry in get_profiles()])
+
+    def retrieve(self, request, name=None):
+        try:
+            file = open(get_profile_path(name), 'rb')
+        except FileNotFoundError:
+            raise Http404()
+        return FileResponse(file, as_attachment=True, filename=name)
+
+
+class EventStreamTicketView(APIView):
+    """
+    issues a ticket of apps.common.sse for the access token of the request,
+    the EventSource of the browsers opens /api/events?ticket= with it
+    """
+    permission_classes = (permissions.IsAuthenticated, )
+    query_budget = 0
+
+    def post(self, request):
+        return Response(
+            {
+                'ticket': create_ticket(str(request.auth)),
+                'expires_in': settings.EVENT_STREAM_TICKET_TTL,
+            },
+            status=status.HTTP_201_CREATED)
+
+
+def metrics(request):
+    """
+    the metrics of apps.common.metrics for prometheus, not served to the public by nginx
+    """
+    return HttpResponse(generate_latest(get_registry()),
+                        content_type=CONTENT_TYPE_LATEST)
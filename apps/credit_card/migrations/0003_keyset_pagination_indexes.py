@@ -0,0 +1,17 @@
+# Generated by Django 3.2.5 on 2026-10-18 18:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('credit_card', '0002_auto_20210708_0559'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='creditcard',
+            index=models.Index(fields=['owner', 'created', 'id'], name='creditcard_owner_keyset_idx'),
+        ),
+    ]
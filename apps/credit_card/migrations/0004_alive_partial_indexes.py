@@ -0,0 +1,29 @@
+# Generated by Django 3.2.5 on 2026-10-18 18:08
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('credit_card', '0003_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='creditcard',
+            index=models.Index(condition=models.Q(('deleted__isnull', True)), fields=['owner', 'created', 'id'], name='creditcard_owner_alive_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='creditcard',
+            name='creditcard_owner_keyset_idx',
+        ),
+        migrations.AlterField(
+            model_name='creditcard',
+            name='owner',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+    ]
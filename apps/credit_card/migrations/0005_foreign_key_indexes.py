@@ -0,0 +1,21 @@
+# Generated by Django 3.2.5 on 2026-10-18 19:38
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('credit_card', '0004_alive_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='creditcard',
+            name='owner',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+    ]
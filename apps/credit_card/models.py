@@ -2,14 +2,16 @@ from django.db import models
 from django.core.validators import MinLengthValidator
 from apps.user.models import User
 from pangpangeats.settings import AUTH_USER_MODEL
-from apps.common.models import BaseModel
+from apps.common.models import BaseModel, alive_index
 from apps.common.validators import numeric_validator
 
 
 class CreditCard(BaseModel):
-    owner: User = models.ForeignKey(AUTH_USER_MODEL,
-                                    on_delete=models.CASCADE,
-                                    null=False)
+    owner: User = models.ForeignKey(
+        AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        null=False,
+    )
     owner_first_name = models.CharField(max_length=5, null=False, blank=False)
     owner_last_name = models.CharField(max_length=5, null=False, blank=False)
     alias = models.CharField(max_length=100, null=True, blank=True)
@@ -32,6 +34,12 @@ class CreditCard(BaseModel):
     expiry_year = models.PositiveSmallIntegerField(null=False)
     expiry_month = models.PositiveSmallIntegerField(null=False)
 
+    class Meta:
+        indexes = (
+            # the cards of an owner, in the order of apps.common.pagination
+            alive_index('owner', 'created', 'id',
+                        name='creditcard_owner_alive_idx'), )
+
     def __str__(self):  # pragma: no cover
         CARD_NUMBER = self.card_number[:4] + "-****" * 3
         return f"{self.owner_last_name}{self.owner_first_name} {CARD_NUMBER}"
\ No newline at end of file
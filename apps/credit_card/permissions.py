@@ -4,4 +4,5 @@ from apps.user.models import User
 class IsOwner(permissions.IsAuthenticated):
     def has_object_permission(self, request, _, obj):
         user: User = request.user
-        return obj.owner == user
\ No newline at end of file
+        # the id avoids fetching the owner of each card
+        return obj.owner_id == user.pk
\ No newline at end of file
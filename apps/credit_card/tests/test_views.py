@@ -1,7 +1,8 @@
 from rest_framework.test import APITestCase
-from apps.common.test import create_sample_user_and_get_token
+from apps.common.test import assert_query_budget, create_sample_credit_card, create_sample_user_and_get_token
 from apps.user.models import User
 from apps.credit_card.models import CreditCard
+from apps.credit_card.views import CreditCardView
 
 
 class TestCreditCardAssignmentView(APITestCase):
@@ -222,14 +223,14 @@ class TestCreditCardView(APITestCase):
                                 self.user2_token)
         response = self.client.get(self.ENDPOINT)
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(len(response.data), 3)
+        self.assertEqual(len(response.data['results']), 3)
 
     def test_list_view_should_success_2(self):
         self.client.credentials(HTTP_AUTHORIZATION='Bearer ' +
                                 self.user1_token)
         response = self.client.get(self.ENDPOINT)
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data['results']), 2)
 
     def test_detail_view_should_return_401(self):
         credit_card_pk = CreditCard.objects.filter(owner=self.user1)[0]
@@ -360,4 +361,38 @@ class TestCreditCardView(APITestCase):
         self.client.credentials(HTTP_AUTHORIZATION='Bearer ' +
                                 self.user1_token)
         response = self.client.delete(self.ENDPOINT + f'/{credit_card_pk}')
-        self.assertEqual(response.status_code, 204)
\ No newline at end of file
+        self.assertEqual(response.status_code, 204)
+
+
+class TestCreditCardQueryBudget(APITestCase):
+    ENDPOINT = '/api/credit-cards'
+    """
+    Test the queries of the credit card API
+
+    the queries should:
+    1. be within the budgets of CreditCardView
+    2. not grow with the cards of the owner
+    """
+    def setUp(self):
+        self.user, access_token = create_sample_user_and_get_token(
+            self.client, '01012341234')
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + access_token)
+
+    def populate(self, size: int):
+        for _ in range(size - self.user.creditcard_set.count()):
+            create_sample_credit_card(self.user)
+
+    def test_list_should_be_within_budget(self):
+        assert_query_budget(self, CreditCardView, 'list', self.populate,
+                            lambda: self.client.get(self.ENDPOINT))
+
+    def test_detail_should_be_within_budget(self):
+        self.populate(1)
+        card = self.user.creditcard_set.first()
+        assert_query_budget(
+            self, CreditCardView, 'retrieve', self.populate,
+            lambda: self.client.get(f'{self.ENDPOINT}/{card.pk}'))
+        assert_query_budget(
+            self, CreditCardView, 'partial_update', self.populate,
+            lambda: self.client.patch(f'{self.ENDPOINT}/{card.pk}',
+                                      {'alias': '새 카드'}))
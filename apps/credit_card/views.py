@@ -1,13 +1,22 @@
 from rest_framework import viewsets
+from apps.common.mixins import ConditionalGetMixin
 from apps.credit_card.models import CreditCard
 from apps.credit_card.serializers import CreditCardSerializer, CreditCardUpdateSerializer
 from apps.credit_card.permissions import IsOwner
 
 
-class CreditCardView(viewsets.ModelViewSet):
+class CreditCardView(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = CreditCard.objects.all()
     serializer_class = CreditCardSerializer
     permission_classes = (IsOwner, )
+    query_budgets = {
+        'list': 1,
+        'retrieve': 1,
+        'create': 1,
+        'update': 2,
+        'partial_update': 2,
+        'destroy': 2,
+    }
 
     def get_serializer_class(self):
         if self.action == 'update' or self.action == 'partial_update':
@@ -15,9 +24,11 @@ class CreditCardView(viewsets.ModelViewSet):
         return CreditCardSerializer
     
     def get_queryset(self):
+        # the owner is rendered by the serializers
+        queryset = CreditCard.objects.select_related('owner')
         if self.action == 'list' or self.action == 'retrieve':
-            return CreditCard.objects.filter(owner=self.request.user)
-        return CreditCard.objects.all()
+            return queryset.filter(owner=self.request.user)
+        return queryset
 
     def perform_create(self, serializer: CreditCardSerializer):
         serializer.save(owner=self.request.user)
\ No newline at end of file
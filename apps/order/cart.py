@@ -0,0 +1,83 @@
+"""
+the cart of the user, kept in the cache until the checkout
+
+a cart is a single cache entry of {menu id: (amount, request)}, at most CART_MAX_ITEMS menus,
+so adding, changing and removing a menu is a get and a set of the entry without any query.
+the menus are not checked until the checkout, where the cart becomes the selections of the order in bulk.
+the entry expires CART_TTL seconds after the last change.
+the changes of the same cart are not atomic, the last of the concurrent changes wins.
+"""
+import typing
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+from apps.order.checkout import Item, place_order
+from apps.order.models import Order
+from apps.user.models import User
+
+Cart = typing.Dict[int, typing.Tuple[int, str]]
+
+
+def get_cache():
+    return caches[settings.CART_CACHE_ALIAS]
+
+
+def get_key(user_id: int) -> str:
+    return f'cart:{user_id}'
+
+
+def get_cart(user_id: int) -> Cart:
+    return get_cache().get(get_key(user_id)) or {}
+
+
+def save_cart(user_id: int, cart: Cart):
+    if cart:
+        get_cache().set(get_key(user_id), cart, settings.CART_TTL)
+    else:
+        clear_cart(user_id)
+
+
+def clear_cart(user_id: int):
+    get_cache().delete(get_key(user_id))
+
+
+def get_items(cart: Cart) -> typing.List[Item]:
+    return [
+        Item(menu, amount, request)
+        for menu, (amount, request) in cart.items()
+    ]
+
+
+def set_item(user_id: int, item: Item) -> Cart:
+    """
+    puts the menu into the cart, replacing its amount and request if it is already in the cart.
+    """
+    cart = get_cart(user_id)
+    if item.menu not in cart and len(cart) >= settings.CART_MAX_ITEMS:
+        raise ValidationError({
+            'menu':
+            f'the cart can not have more than {settings.CART_MAX_ITEMS} menus'
+        })
+    cart[item.menu] = (item.amount, item.request)
+    save_cart(user_id, cart)
+    return cart
+
+
+def remove_item(user_id: int, menu: int) -> Cart:
+    cart = get_cart(user_id)
+    if cart.pop(menu, None) is not None:
+        save_cart(user_id, cart)
+    return cart
+
+
+def checkout(orderer: User, credit_card_id: int, request: str = None) -> Order:
+    """
+    places the order of the cart, which is emptied when the order is committed.
+    """
+    cart = get_cart(orderer.pk)
+    if not cart:
+        raise ValidationError({'cart': 'the cart is empty'})
+    order = place_order(orderer, credit_card_id, get_items(cart), request)
+    transaction.on_commit(lambda: clear_cart(orderer.pk))
+    return order
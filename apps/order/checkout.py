@@ -0,0 +1,132 @@
+"""
+placing an order from the selections of a basket
+
+the number of queries doesn't depend on the number of the selections:
+1. the credit card
+2. the menus locked for the transaction, and loaded with their restaurants
+3. the order, the selections, the through rows and the first transition, inserted in bulk
+"""
+import typing
+from django.db import connection, transaction
+from rest_framework.exceptions import ValidationError
+from apps.credit_card.models import CreditCard
+from apps.order.events import ORDER_CREATED, publish_order
+from apps.order.models import Order, OrderStatus, OrderTransition, Selection
+from apps.restaurant.models import MenuInformation
+from apps.user.models import User
+
+
+class Item(typing.NamedTuple):
+    menu: int  # id of the menu
+    amount: int
+    request: str = ''
+
+
+def lock_menus(menu_ids: typing.List[int]):
+    """
+    locks the menus FOR SHARE until the end of the transaction, so their prices and availability can't change
+    while ordering. the shared locks don't conflict with each other, so the orders of the same menus run at once.
+    django locks only FOR UPDATE or NO KEY UPDATE, which conflict with themselves, so the lock is taken by hand.
+    """
+    if connection.vendor != 'postgresql':  # sqlite locks the whole database while writing
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT 1 FROM {connection.ops.quote_name(MenuInformation._meta.db_table)} '
+            'WHERE id = ANY(%s) ORDER BY id FOR SHARE', [menu_ids])
+
+
+def get_menus(menu_ids: typing.Iterable[int]) -> typing.Dict[int, MenuInformation]:
+    """
+    returns the menus by their ids, locked for the transaction, in two queries
+    """
+    menu_ids = sorted(menu_ids)
+    lock_menus(menu_ids)
+    menus = MenuInformation.objects.select_related('restaurant').filter(
+        pk__in=menu_ids)
+    return {menu.pk: menu for menu in menus}
+
+
+def get_total_cost(menus: typing.Dict[int, MenuInformation],
+                   items: typing.Sequence[Item]) -> int:
+    return sum(menus[item.menu].price * item.amount for item in items)
+
+
+def validate_menus(menus: typing.Dict[int, MenuInformation],
+                   items: typing.Sequence[Item]):
+    missing = sorted({item.menu for item in items} - menus.keys())
+    if missing:
+        raise ValidationError({'selections': f'menus {missing} do not exist'})
+    unavailable = sorted(menu.pk for menu in menus.values()
+                         if not menu.is_available)
+    if unavailable:
+        raise ValidationError(
+            {'selections': f'menus {unavailable} are not available'})
+    restaurants = {menu.restaurant for menu in menus.values()}
+    if len(restaurants) > 1:
+        raise ValidationError(
+            {'selections': 'menus should be of a single restaurant'})
+    restaurant = restaurants.pop()
+    if restaurant.deleted is not None:
+        raise ValidationError({'selections': 'the restaurant is closed'})
+    if get_total_cost(menus, items) < restaurant.minimum_order_cost:
+        raise ValidationError({
+            'selections':
+            f'the minimum order cost is {restaurant.minimum_order_cost}'
+        })
+
+
+def create_selections(selections: typing.List[Selection]):
+    if connection.features.can_return_rows_from_bulk_insert:
+        Selection.objects.bulk_create(selections)
+    else:  # the pks are needed for the through rows
+        for selection in selections:
+            selection.save()
+
+
+def place_order(orderer: User,
+                credit_card_id: int,
+                items: typing.Sequence[Item],
+                request: str = None) -> Order:
+    """
+    places the order of the items paid by the credit card of the orderer, in a single short transaction.
+    the total cost is computed from the prices of the menus, the prices from the client are never trusted.
+    the created selections keep the prices and the names of the menus,
+    and are set to the `selection_list` attribute of the order.
+    """
+    with transaction.atomic():
+        credit_card = CreditCard.objects.filter(pk=credit_card_id,
+                                                owner=orderer).first()
+        if credit_card is None:
+            raise ValidationError(
+                {'credit_card': 'the credit card does not exist'})
+        menus = get_menus({item.menu for item in items})
+        validate_menus(menus, items)
+        order = Order.objects.create(
+            orderer=orderer,
+            restaurant=next(iter(menus.values())).restaurant,
+            total_cost=get_total_cost(menus, items),
+            purchased_credit_card=credit_card,
+            request=request,
+        )
+        selections = [
+            Selection(orderer=orderer,
+                      menu=menus[item.menu],
+                      amount=item.amount,
+                      request=item.request,
+                      unit_price=menus[item.menu].price,
+                      menu_name=menus[item.menu].name,
+                      restaurant_name=menus[item.menu].restaurant.name)
+            for item in items
+        ]
+        create_selections(selections)
+        Order.selections.through.objects.bulk_create(
+            Order.selections.through(order_id=order.pk,
+                                     selection_id=selection.pk)
+            for selection in selections)
+        OrderTransition.objects.create(order=order,
+                                       to_status=OrderStatus.PENDING,
+                                       actor=orderer)
+        publish_order(order, ORDER_CREATED)
+    order.selection_list = selections
+    return order
@@ -0,0 +1,58 @@
+"""
+the order events pushed to the clients, streamed by pangpangeats.asgi at /api/events
+
+1. the orderer gets the status changes of their orders
+2. the store owner gets the new orders and the status changes of the orders of their restaurants
+"""
+import json
+import typing
+from django.core.serializers.json import DjangoJSONEncoder
+from apps.common.pubsub import Event, publish
+from apps.common.sse import EventStream
+from apps.order.models import Order
+from apps.restaurant.models import Restaurant
+from apps.user.models import User, UserRole
+
+ORDER_CREATED = 'order.created'
+ORDER_STATUS = 'order.status'
+
+
+def user_channel(user_id: int) -> str:
+    return f'user:{user_id}'
+
+
+def restaurant_channel(restaurant_id: int) -> str:
+    return f'restaurant:{restaurant_id}'
+
+
+def get_channels(user: User) -> typing.List[str]:
+    channels = [user_channel(user.pk)]
+    if user.role == UserRole.STORE_OWNER:
+        channels += [
+            restaurant_channel(pk) for pk in Restaurant.objects.filter(
+                owner_id=user.pk).values_list('pk', flat=True)
+        ]
+    return channels
+
+
+def publish_order(order: Order, name: str):
+    """
+    publishes the event of the order when the current transaction is committed.
+    """
+    channels = []
+    if order.orderer_id is not None:
+        channels.append(user_channel(order.orderer_id))
+    if order.restaurant_id is not None:
+        channels.append(restaurant_channel(order.restaurant_id))
+    data = json.dumps(
+        {
+            'id': order.pk,
+            'status': order.status,
+            'restaurant': order.restaurant_id,
+            'modified': order.modified,
+        },
+        cls=DjangoJSONEncoder)
+    publish(channels, Event(name, data))
+
+
+stream = EventStream(get_channels)
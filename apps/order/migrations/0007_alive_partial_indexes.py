@@ -0,0 +1,33 @@
+# Generated by Django 3.2.5 on 2026-10-18 18:08
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('order', '0006_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(condition=models.Q(('deleted__isnull', True)), fields=['created', 'id'], name='order_created_alive_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='selection',
+            index=models.Index(condition=models.Q(('deleted__isnull', True)), fields=['orderer', 'created', 'id'], name='selection_orderer_alive_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='order',
+            name='order_keyset_idx',
+        ),
+        migrations.AlterField(
+            model_name='selection',
+            name='orderer',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 3.2.5 on 2026-10-18 18:28
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_orderer_and_restaurant(apps, schema_editor):
+    Order = apps.get_model('order', 'Order')
+    Selection = apps.get_model('order', 'Selection')
+    selections = Selection.objects.filter(
+        order=models.OuterRef('pk')).order_by('id')
+    Order.objects.filter(orderer__isnull=True).update(
+        orderer=models.Subquery(selections.values('orderer')[:1]),
+        restaurant=models.Subquery(
+            selections.values('menu__restaurant')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0006_location_geohash'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('order', '0007_alive_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='orderer',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='restaurant',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, to='restaurant.restaurant'),
+        ),
+        migrations.RunPython(fill_orderer_and_restaurant,
+                             migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(condition=models.Q(('deleted__isnull', True)), fields=['orderer', 'created', 'id'], name='order_orderer_alive_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(condition=models.Q(('deleted__isnull', True)), fields=['restaurant', 'created', 'id'], name='order_restaurant_alive_idx'),
+        ),
+    ]
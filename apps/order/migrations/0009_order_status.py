@@ -0,0 +1,79 @@
+# Generated by Django 3.2.5 on 2026-10-18 18:32
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+# the values of apps.order.models.OrderStatus
+PENDING, PAID, DELIVERED, CANCELED = 1, 2, 5, 6
+
+
+def fill_status(apps, schema_editor):
+    Order = apps.get_model('order', 'Order')
+    Order.objects.filter(is_paid=True).update(status=PAID)
+    Order.objects.filter(is_delivered=True).update(status=DELIVERED)
+    Order.objects.filter(is_canceled=True).update(status=CANCELED)
+
+
+def fill_flags(apps, schema_editor):
+    Order = apps.get_model('order', 'Order')
+    Order.objects.filter(status__gte=PAID).exclude(status=CANCELED).update(
+        is_paid=True)
+    Order.objects.filter(status=DELIVERED).update(is_delivered=True)
+    Order.objects.filter(status=CANCELED).update(is_canceled=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('order', '0008_order_orderer_restaurant'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderTransition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.PositiveSmallIntegerField(choices=[(1, 'Pending'), (2, 'Paid'), (3, 'Preparing'), (4, 'Delivering'), (5, 'Delivered'), (6, 'Canceled')], null=True)),
+                ('to_status', models.PositiveSmallIntegerField(choices=[(1, 'Pending'), (2, 'Paid'), (3, 'Preparing'), (4, 'Delivering'), (5, 'Delivered'), (6, 'Canceled')])),
+                ('created', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='status',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Pending'), (2, 'Paid'), (3, 'Preparing'), (4, 'Delivering'), (5, 'Delivered'), (6, 'Canceled')], default=1),
+        ),
+        migrations.RunPython(fill_status, fill_flags),
+        migrations.RemoveField(
+            model_name='order',
+            name='is_canceled',
+        ),
+        migrations.RemoveField(
+            model_name='order',
+            name='is_delivered',
+        ),
+        migrations.RemoveField(
+            model_name='order',
+            name='is_paid',
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(condition=models.Q(('status__lt', 5), ('deleted__isnull', True)), fields=['restaurant', 'status', 'created'], name='order_restaurant_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(condition=models.Q(('status__lt', 5), ('deleted__isnull', True)), fields=['status', 'created'], name='order_active_idx'),
+        ),
+        migrations.AddField(
+            model_name='ordertransition',
+            name='actor',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='ordertransition',
+            name='order',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='transitions', to='order.order'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+from django.db import migrations, models, transaction
+
+BATCH_SIZE = 1000
+
+
+def fill_snapshot(apps, schema_editor):
+    # in batches of the primary keys, each committed by itself,
+    # so the selections are never locked all at once
+    Selection = apps.get_model('order', 'Selection')
+    last_pk = 0
+    while True:
+        with transaction.atomic():
+            selections = list(
+                Selection.objects.filter(
+                    pk__gt=last_pk, menu__isnull=False,
+                    unit_price__isnull=True).select_related(
+                        'menu__restaurant').order_by('pk')[:BATCH_SIZE])
+            if not selections:
+                return
+            for selection in selections:
+                selection.unit_price = selection.menu.price
+                selection.menu_name = selection.menu.name
+                selection.restaurant_name = selection.menu.restaurant.name
+            Selection.objects.bulk_update(
+                selections, ('unit_price', 'menu_name', 'restaurant_name'))
+        last_pk = selections[-1].pk
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('order', '0009_order_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='selection',
+            name='unit_price',
+            field=models.PositiveIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='selection',
+            name='menu_name',
+            field=models.CharField(default='', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='selection',
+            name='restaurant_name',
+            field=models.CharField(default='', max_length=40),
+        ),
+        migrations.RunPython(fill_snapshot, migrations.RunPython.noop),
+    ]
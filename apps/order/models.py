@@ -1,15 +1,17 @@
 import typing
 from django.db import models
+from django.utils.translation import ugettext_lazy as _
 from pangpangeats.settings import AUTH_USER_MODEL
 from apps.user.models import User
 from apps.credit_card.models import CreditCard
-from apps.restaurant.models import MenuInformation
-from apps.common.models import BaseModel
+from apps.restaurant.models import MenuInformation, Restaurant
+from apps.common.models import ALIVE_CONDITION, BaseModel, alive_index
 
 
 class Selection(BaseModel):
     orderer: User = models.ForeignKey(
-        AUTH_USER_MODEL, on_delete=models.PROTECT
+        AUTH_USER_MODEL,
+        on_delete=models.PROTECT,
     )  # nullable becuase of on_delete option, but should required=True at the serializer
     # the user shouldn't be deleted instead of deativation
     menu: MenuInformation = models.ForeignKey(
@@ -23,24 +25,114 @@ class Selection(BaseModel):
     amount = models.PositiveSmallIntegerField(default=1)
     request = models.CharField(max_length=100, null=False)
 
+    # the menu at the checkout, so the history never joins the menus and survives their changes and deletion
+    # null for the selections whose menu was deleted before the snapshot was taken
+    unit_price = models.PositiveIntegerField(null=True)
+    menu_name = models.CharField(max_length=20, default='')
+    restaurant_name = models.CharField(max_length=40, default='')
+
+    class Meta:
+        indexes = (
+            # the selections of an orderer, in the order of apps.common.pagination
+            alive_index('orderer', 'created', 'id',
+                        name='selection_orderer_alive_idx'), )
+
     def __str__(self):  # pragma: no cover
-        return f"{self.orderer.name} {self.menu.name}"
+        return f"{self.orderer.name} {self.menu_name}"
+
+
+class OrderStatus(models.IntegerChoices):
+    # the terminal statuses come last, so the active orders are status < DELIVERED
+    PENDING = 1, _('Pending')  # placed, waiting for the payment
+    PAID = 2, _('Paid')
+    PREPARING = 3, _('Preparing')
+    DELIVERING = 4, _('Delivering')
+    DELIVERED = 5, _('Delivered')
+    CANCELED = 6, _('Canceled')
+
+
+# the orders which are neither delivered nor canceled
+ACTIVE_CONDITION = models.Q(status__lt=OrderStatus.DELIVERED)
+# the orders which are paid and not canceled
+PAID_STATUSES = (OrderStatus.PAID, OrderStatus.PREPARING,
+                 OrderStatus.DELIVERING, OrderStatus.DELIVERED)
 
 
 class Order(BaseModel):
-    # reference one of selections to get the user (in one order, the users (which is the field orderer) from the selections are the same)
+    # the same with the orderer of the selections, kept here to find the orders of a user without joining the selections
+    orderer: User = models.ForeignKey(
+        AUTH_USER_MODEL,
+        null=True,
+        on_delete=models.PROTECT,
+    )  # nullable for the orders placed before, but should required=True at the serializer
+    # the restaurant of every menu of the selections
+    restaurant: Restaurant = models.ForeignKey(
+        Restaurant,
+        null=True,
+        on_delete=models.SET_NULL,
+    )
     # the min length of selections should be 1
     selections: typing.List[Selection] = models.ManyToManyField(Selection)
     total_cost = models.PositiveIntegerField(null=False)
 
-    is_paid = models.BooleanField(default=False)
+    # changed only by apps.order.transitions
+    status = models.PositiveSmallIntegerField(choices=OrderStatus.choices,
+                                              default=OrderStatus.PENDING)
     purchased_credit_card: CreditCard = models.ForeignKey(
         CreditCard, null=True, on_delete=models.SET_NULL
     )  # nullable becuase of on_delete option, but should required=True at the serializer
-    is_canceled = models.BooleanField(default=False)
-    is_delivered = models.BooleanField(default=False)
 
     request = models.CharField(max_length=50, null=True, blank=True)
 
+    class Meta:
+        indexes = (
+            # in the order of apps.common.pagination
+            alive_index('created', 'id', name='order_created_alive_idx'),
+            alive_index('orderer', 'created', 'id',
+                        name='order_orderer_alive_idx'),
+            alive_index('restaurant', 'created', 'id',
+                        name='order_restaurant_alive_idx'),
+            # only the active orders, for the dashboards of the restaurants and the riders
+            models.Index(fields=('restaurant', 'status', 'created'),
+                         name='order_restaurant_active_idx',
+                         condition=ACTIVE_CONDITION & ALIVE_CONDITION),
+            models.Index(fields=('status', 'created'),
+                         name='order_active_idx',
+                         condition=ACTIVE_CONDITION & ALIVE_CONDITION),
+        )
+
+    # the flags before the status, kept for the clients
+    @property
+    def is_paid(self) -> bool:
+        return self.status in PAID_STATUSES
+
+    @property
+    def is_canceled(self) -> bool:
+        return self.status == OrderStatus.CANCELED
+
+    @property
+    def is_delivered(self) -> bool:
+        return self.status == OrderStatus.DELIVERED
+
+    def __str__(self):  # pragma: no cover
+        return f"{self.orderer.name} {self.total_cost}"
+
+
+class OrderTransition(models.Model):
+    """
+    the append-only log of the status changes of the orders
+    """
+    order: Order = models.ForeignKey(Order,
+                                     on_delete=models.CASCADE,
+                                     related_name='transitions')
+    from_status = models.PositiveSmallIntegerField(
+        choices=OrderStatus.choices, null=True)  # null when the order is placed
+    to_status = models.PositiveSmallIntegerField(choices=OrderStatus.choices)
+    actor: User = models.ForeignKey(AUTH_USER_MODEL,
+                                    null=True,
+                                    on_delete=models.SET_NULL,
+                                    related_name='+')
+    created = models.DateTimeField(auto_now_add=True)
+
     def __str__(self):  # pragma: no cover
-        return f"{self.orderer.name} {self.total_cost}"
\ No newline at end of file
+        return f"{self.order_id} {self.from_status} -> {self.to_status}"
\ No newline at end of file
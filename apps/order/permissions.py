@@ -0,0 +1,12 @@
+from rest_framework import permissions
+from apps.user.models import User, UserRole
+
+
+class IsStoreOwner(permissions.IsAuthenticated):
+    def has_permission(self, request, view):
+        user: User = request.user
+        return super().has_permission(request, view) and user.role == UserRole.STORE_OWNER
+
+    def has_object_permission(self, request, _, obj):
+        user: User = request.user
+        return obj.restaurant is not None and obj.restaurant.owner_id == user.pk
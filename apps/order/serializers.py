@@ -0,0 +1,83 @@
+from django.conf import settings
+from rest_framework import serializers
+from apps.order import cart
+from apps.order.checkout import Item, place_order
+from apps.order.models import Order, OrderStatus, Selection
+
+
+class SelectionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Selection
+        fields = ('id', 'menu', 'menu_name', 'restaurant_name', 'unit_price',
+                  'amount', 'request')
+
+
+class OrderSerializer(serializers.ModelSerializer):
+    # prefetched to the attribute by the views, or set by apps.order.checkout.place_order
+    selections = SelectionSerializer(source='selection_list',
+                                     many=True,
+                                     read_only=True)
+
+    class Meta:
+        model = Order
+        fields = ('id', 'restaurant', 'selections', 'total_cost', 'status',
+                  'is_paid', 'purchased_credit_card', 'is_canceled',
+                  'is_delivered', 'request', 'created')
+
+
+class ItemSerializer(serializers.Serializer):
+    # plain ids instead of the related fields, which query the menus one by one
+    menu = serializers.IntegerField(min_value=1)
+    amount = serializers.IntegerField(min_value=1, max_value=99)
+    request = serializers.CharField(max_length=100,
+                                    allow_blank=True,
+                                    default='')
+
+
+class CheckoutSerializer(serializers.Serializer):
+    credit_card = serializers.IntegerField(min_value=1)
+    request = serializers.CharField(max_length=50,
+                                    allow_blank=True,
+                                    required=False)
+    selections = serializers.ListField(child=ItemSerializer(),
+                                       min_length=1,
+                                       max_length=settings.ORDER_MAX_SELECTIONS)
+
+    def create(self, validated_data) -> Order:
+        return place_order(
+            orderer=self.context['request'].user,
+            credit_card_id=validated_data['credit_card'],
+            items=[Item(**item) for item in validated_data['selections']],
+            request=validated_data.get('request'),
+        )
+
+    def to_representation(self, instance: Order):
+        return OrderSerializer(instance, context=self.context).data
+
+
+class CartSerializer(serializers.Serializer):
+    items = ItemSerializer(many=True, read_only=True)
+
+    def to_representation(self, instance: cart.Cart):
+        return super().to_representation({'items': cart.get_items(instance)})
+
+
+class CartCheckoutSerializer(serializers.Serializer):
+    credit_card = serializers.IntegerField(min_value=1)
+    request = serializers.CharField(max_length=50,
+                                    allow_blank=True,
+                                    required=False)
+
+    def create(self, validated_data) -> Order:
+        return cart.checkout(
+            orderer=self.context['request'].user,
+            credit_card_id=validated_data['credit_card'],
+            request=validated_data.get('request'),
+        )
+
+    def to_representation(self, instance: Order):
+        return OrderSerializer(instance, context=self.context).data
+
+
+class TransitionSerializer(serializers.Serializer):
+    status = serializers.ChoiceField(choices=OrderStatus.choices)
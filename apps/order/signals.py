@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# sent by apps.order.transitions.transition in the transaction of the change,
+# with the order, from_status and to_status arguments
+order_status_changed = Signal()
@@ -0,0 +1,94 @@
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from apps.common.test import create_sample_credit_card, create_sample_restaurant, create_sample_user_and_get_token
+from apps.order.models import Order
+from apps.restaurant.models import MenuInformation
+from apps.user.models import User, UserRole
+
+
+class TestCartView(APITestCase):
+    ENDPOINT = '/api/cart'
+    """
+    Test the cart kept in the cache
+
+    1. adding, changing and removing the menus should not query the database
+    2. the cart should not have more than CART_MAX_ITEMS menus
+    3. the checkout should place the order of the cart and empty the cart
+    4. the checkout of an empty cart should fail
+    """
+    def setUp(self):
+        cache.clear()
+        self.user, token = create_sample_user_and_get_token(
+            self.client, '01012341234')
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + token)
+        owner = User.objects.create_user(phone_number='01043214321',
+                                         name='김사장',
+                                         password='thePas123Q',
+                                         role=UserRole.STORE_OWNER)
+        restaurant = create_sample_restaurant(owner)
+        self.chicken, self.coke = MenuInformation.objects.filter(
+            restaurant=restaurant).order_by('id')
+        self.card = create_sample_credit_card(self.user)
+
+    def put(self, menu: MenuInformation, amount: int, request: str = ''):
+        return self.client.put(f'{self.ENDPOINT}/{menu.pk}', {
+            'amount': amount,
+            'request': request
+        })
+
+    def test_changing_the_cart_should_not_query(self):
+        with self.assertNumQueries(0):
+            self.put(self.chicken, 1)
+            self.put(self.coke, 2, '얼음 많이')
+            response = self.put(self.chicken, 3)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['items'], [
+            {
+                'menu': self.chicken.pk,
+                'amount': 3,
+                'request': ''
+            },
+            {
+                'menu': self.coke.pk,
+                'amount': 2,
+                'request': '얼음 많이'
+            },
+        ])
+        with self.assertNumQueries(0):
+            response = self.client.delete(f'{self.ENDPOINT}/{self.coke.pk}')
+        self.assertEqual(len(response.data['items']), 1)
+        self.assertEqual(
+            self.client.get(self.ENDPOINT).data['items'][0]['amount'], 3)
+
+    def test_invalid_amount_should_fail(self):
+        self.assertEqual(self.put(self.chicken, 0).status_code, 400)
+        self.assertEqual(self.client.get(self.ENDPOINT).data['items'], [])
+
+    @override_settings(CART_MAX_ITEMS=1)
+    def test_too_many_menus_should_fail(self):
+        self.put(self.chicken, 1)
+        self.assertEqual(self.put(self.coke, 1).status_code, 400)
+        self.assertEqual(self.put(self.chicken, 2).status_code, 200)
+
+    def test_checkout_should_place_the_order(self):
+        self.put(self.chicken, 1)
+        self.put(self.coke, 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'{self.ENDPOINT}/checkout', {
+                'credit_card': self.card.pk,
+            })
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['total_cost'], 22000)
+        order = Order.objects.get(pk=response.data['id'])
+        self.assertEqual(
+            sorted(order.selections.values_list('menu_id', 'amount')),
+            [(self.chicken.pk, 1), (self.coke.pk, 2)])
+        self.assertEqual(self.client.get(self.ENDPOINT).data['items'], [])
+
+    def test_checkout_of_empty_cart_should_fail(self):
+        response = self.client.post(f'{self.ENDPOINT}/checkout', {
+            'credit_card': self.card.pk,
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Order.objects.exists())
@@ -0,0 +1,243 @@
+from importlib import import_module
+from unittest import skipUnless
+from django.apps import apps
+from django.db import connection
+from django.test import skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from apps.common.test import create_sample_credit_card, create_sample_restaurant, create_sample_user_and_get_token
+from apps.order.models import Order, Selection
+from apps.restaurant.models import MenuInformation
+from apps.user.models import User, UserRole
+
+
+class TestCheckoutView(APITestCase):
+    ENDPOINT = '/api/orders'
+    """
+    Test the API to place an order
+
+    the order should only be placed when:
+    1. the user is authenticated and the credit card is of the user
+    2. every menu exists, is available and is of a single restaurant
+    3. the total cost is not less than the minimum order cost of the restaurant
+    and the total cost should be computed from the prices of the menus.
+    the number of the queries should not depend on the number of the selections.
+    the selections should keep the prices and the names of the menus at the checkout.
+    """
+    def setUp(self):
+        self.user, token = create_sample_user_and_get_token(
+            self.client, '01012341234')
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + token)
+        self.card = create_sample_credit_card(self.user)
+        owner = User.objects.create_user(phone_number='01043214321',
+                                         name='김사장',
+                                         password='thePas123Q',
+                                         role=UserRole.STORE_OWNER)
+        # minimum order cost: 15000
+        self.restaurant = create_sample_restaurant(
+            owner, menu_prices=(18000, 2000) + (1000, ) * 20)
+        self.chicken, self.coke, *self.sides = MenuInformation.objects.filter(
+            restaurant=self.restaurant).order_by('id')
+
+    def checkout(self, selections, credit_card=None):
+        return self.client.post(
+            self.ENDPOINT,
+            {
+                'credit_card': credit_card or self.card.pk,
+                'request': '문 앞에 놓아주세요',
+                'selections': selections,
+            },
+            format='json',
+        )
+
+    def test_checkout_should_success(self):
+        response = self.checkout([
+            {
+                'menu': self.chicken.pk,
+                'amount': 1,
+                'request': '양념 많이',
+            },
+            {
+                'menu': self.coke.pk,
+                'amount': 2,
+            },
+        ])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['total_cost'], 18000 + 2000 * 2)
+        self.assertEqual(response.data['restaurant'], self.restaurant.pk)
+        self.assertEqual(response.data['purchased_credit_card'], self.card.pk)
+        self.assertEqual(
+            [(selection['menu'], selection['amount'])
+             for selection in response.data['selections']],
+            [(self.chicken.pk, 1), (self.coke.pk, 2)])
+
+        order = Order.objects.get(pk=response.data['id'])
+        self.assertEqual(order.orderer, self.user)
+        self.assertEqual(
+            sorted(order.selections.values_list('menu_id', flat=True)),
+            sorted((self.chicken.pk, self.coke.pk)))
+
+    def test_history_should_keep_the_menus_at_the_checkout(self):
+        response = self.checkout([{'menu': self.chicken.pk, 'amount': 1}])
+        self.chicken.name = '반반치킨'
+        self.chicken.price = 20000
+        self.chicken.save()
+        self.restaurant.name = '팡팡치킨 본점'
+        self.restaurant.save()
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(f'{self.ENDPOINT}/{response.data["id"]}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data['selections'][0], {
+                'id': response.data['selections'][0]['id'],
+                'menu': self.chicken.pk,
+                'menu_name': '메뉴0',
+                'restaurant_name': '팡팡치킨',
+                'unit_price': 18000,
+                'amount': 1,
+                'request': '',
+            })
+        for query in context.captured_queries:
+            self.assertNotIn('menuinformation', query['sql'])
+
+    def test_checkout_under_minimum_order_cost_should_fail(self):
+        response = self.checkout([{'menu': self.coke.pk, 'amount': 3}])
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Order.objects.exists())
+        self.assertFalse(Selection.objects.exists())
+
+    def test_checkout_with_unavailable_menu_should_fail(self):
+        self.coke.is_available = False
+        self.coke.save()
+        response = self.checkout([
+            {'menu': self.chicken.pk, 'amount': 1},
+            {'menu': self.coke.pk, 'amount': 1},
+        ])
+        self.assertEqual(response.status_code, 400)
+
+    def test_checkout_with_deleted_menu_should_fail(self):
+        self.coke.delete()
+        response = self.checkout([
+            {'menu': self.chicken.pk, 'amount': 1},
+            {'menu': self.coke.pk, 'amount': 1},
+        ])
+        self.assertEqual(response.status_code, 400)
+
+    def test_checkout_with_menus_of_restaurants_should_fail(self):
+        other = create_sample_restaurant(self.restaurant.owner, name='팡팡피자')
+        response = self.checkout([
+            {'menu': self.chicken.pk, 'amount': 1},
+            {'menu': other.menuinformation_set.first().pk, 'amount': 1},
+        ])
+        self.assertEqual(response.status_code, 400)
+
+    def test_checkout_with_card_of_others_should_fail(self):
+        card = create_sample_credit_card(self.restaurant.owner)
+        response = self.checkout([{'menu': self.chicken.pk, 'amount': 1}],
+                                 credit_card=card.pk)
+        self.assertEqual(response.status_code, 400)
+
+    def test_checkout_without_selections_should_fail(self):
+        response = self.checkout([])
+        self.assertEqual(response.status_code, 400)
+
+    @skipUnlessDBFeature('can_return_rows_from_bulk_insert')
+    def test_queries_should_not_depend_on_the_number_of_selections(self):
+        counts = []
+        for sides in (self.sides[:1], self.sides):
+            with CaptureQueriesContext(connection) as context:
+                response = self.checkout([{
+                    'menu': self.chicken.pk,
+                    'amount': 1
+                }] + [{
+                    'menu': side.pk,
+                    'amount': 1
+                } for side in sides])
+            self.assertEqual(response.status_code, 201)
+            counts.append(len(context.captured_queries))
+        self.assertEqual(counts[0], counts[1])
+
+    @skipUnless(connection.vendor == 'postgresql', 'FOR SHARE of postgresql')
+    def test_menus_should_be_locked_for_share(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.checkout([{'menu': self.chicken.pk, 'amount': 1}])
+        self.assertEqual(response.status_code, 201)
+        queries = [
+            query['sql'] for query in context.captured_queries
+            if 'menuinformation' in query['sql']
+        ]
+        self.assertTrue(any('FOR SHARE' in query for query in queries))
+        # the locks conflicting with themselves would serialize the orders of the same menus
+        self.assertFalse(any('UPDATE' in query for query in queries))
+
+
+class TestOrderView(APITestCase):
+    ENDPOINT = '/api/orders'
+    """
+    Test the API to read the orders
+
+    1. only the orders of the user should be returned
+    2. the selections should be prefetched
+    """
+    def setUp(self):
+        self.user, token = create_sample_user_and_get_token(
+            self.client, '01012341234')
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + token)
+        other = User.objects.create_user(phone_number='01043214321',
+                                         name='김철수',
+                                         password='thePas123Q')
+        for orderer in (self.user, self.user, other):
+            order = Order.objects.create(orderer=orderer, total_cost=1000)
+            order.selections.add(
+                Selection.objects.create(orderer=orderer, request=''),
+                Selection.objects.create(orderer=orderer, request=''))
+
+    def test_list_should_return_the_orders_of_the_user(self):
+        with self.assertNumQueries(2):  # the orders and the selections
+            response = self.client.get(self.ENDPOINT)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertEqual(len(response.data['results'][0]['selections']), 2)
+
+    def test_retrieve_order_of_others_should_fail(self):
+        order = Order.objects.exclude(orderer=self.user).first()
+        response = self.client.get(f'{self.ENDPOINT}/{order.pk}')
+        self.assertEqual(response.status_code, 404)
+
+
+class TestSelectionSnapshotMigration(APITestCase):
+    """
+    Test the backfill of the snapshots of the selections placed before
+
+    1. the snapshots should be taken from the current menus, batch by batch
+    2. the selections of the deleted menus should be left empty
+    """
+    def test_backfill_should_success(self):
+        owner = User.objects.create_user(phone_number='01043214321',
+                                         name='김사장',
+                                         password='thePas123Q',
+                                         role=UserRole.STORE_OWNER)
+        restaurant = create_sample_restaurant(owner)
+        menus = list(restaurant.menuinformation_set.order_by('id'))
+        selections = [
+            Selection.objects.create(orderer=owner, menu=menu, request='')
+            for menu in menus * 3
+        ]
+        Selection.objects.create(orderer=owner, menu=None, request='')
+
+        migration = import_module(
+            'apps.order.migrations.0010_selection_snapshot')
+        migration.BATCH_SIZE, batch_size = 4, migration.BATCH_SIZE
+        try:
+            migration.fill_snapshot(apps, None)
+        finally:
+            migration.BATCH_SIZE = batch_size
+
+        for selection in selections:
+            selection.refresh_from_db()
+            self.assertEqual(selection.unit_price, selection.menu.price)
+            self.assertEqual(selection.menu_name, selection.menu.name)
+            self.assertEqual(selection.restaurant_name, '팡팡치킨')
+        self.assertIsNone(
+            Selection.objects.get(menu__isnull=True).unit_price)
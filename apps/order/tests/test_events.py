@@ -0,0 +1,163 @@
+import asyncio
+import json
+from asgiref.sync import sync_to_async
+from asgiref.testing import ApplicationCommunicator
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from apps.common.pubsub import Event, LocalBroker
+from apps.common.test import create_sample_restaurant, create_sample_user_and_get_token
+from apps.order.events import ORDER_STATUS, restaurant_channel, user_channel
+from apps.order.models import Order, OrderStatus
+from apps.order.transitions import transition
+from apps.user.models import User, UserRole
+from pangpangeats.asgi import application
+
+
+def get_scope(token: str = None, query_string: str = '') -> dict:
+    headers = []
+    if token is not None:
+        headers.append((b'authorization', f'Bearer {token}'.encode()))
+    return {
+        'type': 'http',
+        'method': 'GET',
+        'path': '/api/events',
+        'query_string': query_string.encode(),
+        'headers': headers,
+    }
+
+
+class TestOrderEvents(APITestCase):
+    """
+    Test the server-sent events of the orders served by the ASGI application
+
+    1. the stream should reject the anonymous requests
+    2. the orderer should get the status changes of their orders
+    3. the store owner should get the orders of their restaurants
+    4. the idle streams should get the heartbeats
+    5. the stream should be unsubscribed when the client disconnects
+    6. the ticket of the access token should open a stream once, the access token in the query string should not
+    """
+    def setUp(self):
+        self.user, self.token = create_sample_user_and_get_token(
+            self.client, '01012341234')
+        self.owner = User.objects.create_user(phone_number='01043214321',
+                                              name='김사장',
+                                              password='thePas123Q',
+                                              role=UserRole.STORE_OWNER)
+        self.owner_token = self.client.post('/api/token', {
+            'phone_number': '01043214321',
+            'password': 'thePas123Q',
+        }).data['access']
+        self.restaurant = create_sample_restaurant(self.owner)
+        self.order = Order.objects.create(orderer=self.user,
+                                          restaurant=self.restaurant,
+                                          total_cost=18000)
+
+    def change_status(self, to_status: int):
+        with self.captureOnCommitCallbacks(execute=True):
+            transition(self.order, to_status, actor=self.user)
+
+    async def open_stream(self,
+                          token: str = None,
+                          query_string: str = '') -> ApplicationCommunicator:
+        communicator = ApplicationCommunicator(application,
+                                               get_scope(token, query_string))
+        await communicator.send_input({'type': 'http.request'})
+        start = await communicator.receive_output(timeout=5)
+        self.assertEqual(start['status'], 200)
+        self.assertIn((b'content-type', b'text/event-stream'),
+                      start['headers'])
+        retry = await communicator.receive_output(timeout=5)
+        self.assertTrue(retry['body'].startswith(b'retry: '))
+        return communicator
+
+    async def get_status(self, scope: dict) -> int:
+        communicator = ApplicationCommunicator(application, scope)
+        await communicator.send_input({'type': 'http.request'})
+        return (await communicator.receive_output(timeout=5))['status']
+
+    async def test_anonymous_should_be_rejected(self):
+        self.assertEqual(await self.get_status(get_scope()), 401)
+
+    def get_ticket(self) -> str:
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        response = self.client.post('/api/events/ticket')
+        self.assertEqual(response.status_code, 201)
+        return response.data['ticket']
+
+    async def test_ticket_should_open_a_stream_once(self):
+        ticket = await sync_to_async(self.get_ticket)()
+        communicator = await self.open_stream(query_string=f'ticket={ticket}')
+        await communicator.send_input({'type': 'http.disconnect'})
+        await communicator.wait(timeout=5)
+        self.assertEqual(
+            await self.get_status(get_scope(query_string=f'ticket={ticket}')),
+            401)
+        self.assertEqual(
+            await self.get_status(
+                get_scope(query_string=f'token={self.token}')), 401)
+
+    def test_anonymous_ticket_should_fail(self):
+        response = self.client.post('/api/events/ticket')
+        self.assertEqual(response.status_code, 401)
+
+    async def test_orderer_and_owner_should_get_the_status(self):
+        orderer_stream = await self.open_stream(self.token)
+        owner_stream = await self.open_stream(self.owner_token)
+        await sync_to_async(self.change_status)(OrderStatus.PAID)
+
+        for communicator in (orderer_stream, owner_stream):
+            body = (await communicator.receive_output(timeout=5))['body']
+            name, data = body.decode().strip().split('\n')
+            self.assertEqual(name, f'event: {ORDER_STATUS}')
+            event = json.loads(data[len('data: '):])
+            self.assertEqual(event['id'], self.order.pk)
+            self.assertEqual(event['status'], OrderStatus.PAID)
+            await communicator.send_input({'type': 'http.disconnect'})
+            await communicator.wait(timeout=5)
+
+    @override_settings(EVENT_STREAM_HEARTBEAT=0.01)
+    async def test_idle_stream_should_get_the_heartbeats(self):
+        communicator = await self.open_stream(self.token)
+        body = (await communicator.receive_output(timeout=5))['body']
+        self.assertEqual(body, b': ping\n\n')
+        await communicator.send_input({'type': 'http.disconnect'})
+        await communicator.wait(timeout=5)
+
+    async def test_disconnected_stream_should_be_unsubscribed(self):
+        from apps.common.pubsub import get_broker
+        communicator = await self.open_stream(self.owner_token)
+        broker = get_broker()
+        channel = restaurant_channel(self.restaurant.pk)
+        self.assertIn(channel, broker.subscriptions)
+        await communicator.send_input({'type': 'http.disconnect'})
+        await communicator.wait(timeout=5)
+        self.assertNotIn(channel, broker.subscriptions)
+        self.assertNotIn(user_channel(self.owner.pk), broker.subscriptions)
+
+
+class TestLocalBroker(APITestCase):
+    """
+    Test the in-process broker
+
+    1. the events should be delivered to the subscriptions of the channel only
+    2. the subscription falling behind should be closed
+    """
+    async def test_events_should_be_delivered_to_the_channel(self):
+        broker = LocalBroker()
+        first = broker.subscribe(['a'], max_size=10)
+        second = broker.subscribe(['b'], max_size=10)
+        broker.publish('a', Event('ping', '1'))
+        self.assertEqual(await asyncio.wait_for(first.get(), 1),
+                         Event('ping', '1'))
+        await asyncio.sleep(0)
+        self.assertTrue(second.queue.empty())
+
+    async def test_slow_subscription_should_be_closed(self):
+        broker = LocalBroker()
+        subscription = broker.subscribe(['a'], max_size=2)
+        for i in range(3):
+            broker.publish('a', Event('ping', str(i)))
+        self.assertIsNone(await asyncio.wait_for(subscription.get(), 1))
+        self.assertTrue(subscription.closed)
+        self.assertEqual(broker.subscriptions, {})
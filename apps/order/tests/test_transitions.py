@@ -0,0 +1,156 @@
+from django.db import connection
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APITestCase
+from apps.common.test import create_sample_restaurant, create_sample_user_and_get_token
+from apps.order.models import ACTIVE_CONDITION, Order, OrderStatus, OrderTransition
+from apps.order.transitions import TransitionConflict, transition
+from apps.user.models import User, UserRole
+
+
+class TestOrderTransition(APITestCase):
+    """
+    Test the state machine of the orders
+
+    1. only the allowed transitions should change the status
+    2. the transition from a stale status should fail with a conflict
+    3. every transition should be logged
+    4. the orderer can pay and cancel the order before it is prepared
+    """
+    def setUp(self):
+        self.user, token = create_sample_user_and_get_token(
+            self.client, '01012341234')
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + token)
+        self.order = Order.objects.create(orderer=self.user, total_cost=1000)
+
+    def test_allowed_transitions_should_success(self):
+        for status in (OrderStatus.PAID, OrderStatus.PREPARING,
+                       OrderStatus.DELIVERING, OrderStatus.DELIVERED):
+            transition(self.order, status, actor=self.user)
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, OrderStatus.DELIVERED)
+        self.assertTrue(self.order.is_paid)
+        self.assertTrue(self.order.is_delivered)
+        self.assertEqual(
+            list(
+                OrderTransition.objects.filter(order=self.order).order_by(
+                    'id').values_list('from_status', 'to_status')),
+            [(1, 2), (2, 3), (3, 4), (4, 5)])
+
+    def test_disallowed_transition_should_fail(self):
+        with self.assertRaises(ValidationError):
+            transition(self.order, OrderStatus.DELIVERED)
+        transition(self.order, OrderStatus.CANCELED)
+        with self.assertRaises(ValidationError):
+            transition(self.order, OrderStatus.PAID)
+        self.assertEqual(OrderTransition.objects.count(), 1)
+
+    def test_transition_from_stale_status_should_conflict(self):
+        stale = Order.objects.get(pk=self.order.pk)
+        transition(self.order, OrderStatus.PAID)
+        with self.assertRaises(TransitionConflict):
+            transition(stale, OrderStatus.CANCELED)
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, OrderStatus.PAID)
+        self.assertEqual(OrderTransition.objects.count(), 1)
+
+    def test_pay_and_cancel_should_success(self):
+        endpoint = f'/api/orders/{self.order.pk}'
+        response = self.client.post(f'{endpoint}/pay')
+        self.assertEqual(response.data['status'], OrderStatus.PAID)
+        response = self.client.post(f'{endpoint}/cancel')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['is_canceled'])
+
+    def test_cancel_after_preparing_should_fail(self):
+        transition(self.order, OrderStatus.PAID)
+        transition(self.order, OrderStatus.PREPARING)
+        response = self.client.post(f'/api/orders/{self.order.pk}/cancel')
+        self.assertEqual(response.status_code, 400)
+
+
+class TestStoreOrderView(APITestCase):
+    ENDPOINT = '/api/store-orders'
+    """
+    Test the dashboard of the orders to the restaurants of a store owner
+
+    1. only the active orders of the restaurants of the owner should be listed
+    2. the owner can change the status of the orders
+    3. the other users should not see the orders
+    4. the active orders should be found by the partial index
+    """
+    def setUp(self):
+        self.owner = User.objects.create_user(phone_number='01043214321',
+                                              name='김사장',
+                                              password='thePas123Q',
+                                              role=UserRole.STORE_OWNER)
+        response = self.client.post('/api/token', {
+            'phone_number': '01043214321',
+            'password': 'thePas123Q',
+        })
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' +
+                                response.data['access'])
+        self.restaurant = create_sample_restaurant(self.owner)
+        other_restaurant = create_sample_restaurant(self.owner, name='팡팡피자')
+        other_restaurant.owner = User.objects.create_user(
+            phone_number='01011112222',
+            name='이사장',
+            password='thePas123Q',
+            role=UserRole.STORE_OWNER)
+        other_restaurant.save()
+        self.orders = {
+            status: Order.objects.create(restaurant=self.restaurant,
+                                         total_cost=1000,
+                                         status=status)
+            for status in OrderStatus
+        }
+        Order.objects.create(restaurant=other_restaurant,
+                             total_cost=1000,
+                             status=OrderStatus.PAID)
+
+    def test_list_should_return_the_active_orders(self):
+        response = self.client.get(self.ENDPOINT)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            sorted(order['status'] for order in response.data['results']),
+            [1, 2, 3, 4])
+        response = self.client.get(self.ENDPOINT, {'status': 2})
+        self.assertEqual(
+            [order['id'] for order in response.data['results']],
+            [self.orders[OrderStatus.PAID].pk])
+
+    def test_owner_should_change_the_status(self):
+        order = self.orders[OrderStatus.PAID]
+        response = self.client.post(f'{self.ENDPOINT}/{order.pk}/status',
+                                    {'status': OrderStatus.PREPARING})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], OrderStatus.PREPARING)
+        transition_log = OrderTransition.objects.get(order=order)
+        self.assertEqual(transition_log.actor, self.owner)
+
+    def test_owner_should_not_pay_the_order(self):
+        order = self.orders[OrderStatus.PENDING]
+        response = self.client.post(f'{self.ENDPOINT}/{order.pk}/status',
+                                    {'status': OrderStatus.PAID})
+        self.assertEqual(response.status_code, 400)
+
+    def test_client_should_not_see_the_dashboard(self):
+        _, token = create_sample_user_and_get_token(self.client,
+                                                    '01012341234')
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + token)
+        response = self.client.get(self.ENDPOINT)
+        self.assertEqual(response.status_code, 403)
+
+    def test_active_orders_should_use_the_partial_index(self):
+        queryset = Order.objects.filter(
+            ACTIVE_CONDITION, restaurant=self.restaurant,
+            status=OrderStatus.PAID).order_by('-created', '-id')
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET enable_seqscan = off')
+        try:
+            plan = queryset.explain()
+        finally:
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('RESET enable_seqscan')
+        self.assertIn('order_restaurant_active_idx', plan)
@@ -0,0 +1,47 @@
+from rest_framework.test import APITestCase
+from apps.common.test import assert_query_budget, create_sample_order, create_sample_restaurant, create_sample_user_and_get_token
+from apps.order.models import Order
+from apps.order.views import OrderView
+from apps.restaurant.models import MenuInformation
+from apps.user.models import User, UserRole
+
+
+class TestOrderQueryBudget(APITestCase):
+    ENDPOINT = '/api/orders'
+    """
+    Test the queries of the order API
+
+    the queries should:
+    1. be within the budgets of OrderView
+    2. not grow with the orders of the orderer, nor with the selections of an order
+    """
+    def setUp(self):
+        self.user, token = create_sample_user_and_get_token(
+            self.client, '01012341234')
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + token)
+        owner = User.objects.create_user(phone_number='01043214321',
+                                         name='김사장',
+                                         password='thePas123Q',
+                                         role=UserRole.STORE_OWNER)
+        restaurant = create_sample_restaurant(owner,
+                                              menu_prices=(1000, ) * 10)
+        self.menus = list(
+            MenuInformation.objects.filter(
+                restaurant=restaurant).order_by('id'))
+
+    def populate_orders(self, size: int):
+        for _ in range(size - Order.objects.filter(orderer=self.user).count()):
+            create_sample_order(self.user, self.menus[:2], (1, 2))
+
+    def populate_selections(self, size: int):
+        self.order = create_sample_order(self.user, self.menus[:size],
+                                         (1, ) * size)
+
+    def test_list_should_be_within_budget(self):
+        assert_query_budget(self, OrderView, 'list', self.populate_orders,
+                            lambda: self.client.get(self.ENDPOINT))
+
+    def test_retrieve_should_be_within_budget(self):
+        assert_query_budget(
+            self, OrderView, 'retrieve', self.populate_selections,
+            lambda: self.client.get(f'{self.ENDPOINT}/{self.order.pk}'))
@@ -0,0 +1,70 @@
+"""
+the state machine of the orders
+
+    PENDING -> PAID -> PREPARING -> DELIVERING -> DELIVERED
+       |        |          |
+       +--------+----------+------> CANCELED
+
+a transition is a conditional UPDATE on the status read by the caller (WHERE status = expected),
+so of the concurrent transitions from the same status only one succeeds, without locking the row beforehand.
+every transition is appended to OrderTransition in the same transaction, and pushed to the clients on commit.
+"""
+import typing
+from django.db import transaction
+from django.utils import timezone
+from django.utils.translation import ugettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from apps.order.events import ORDER_STATUS, publish_order
+from apps.order.models import Order, OrderStatus, OrderTransition
+from apps.order.signals import order_status_changed
+from apps.user.models import User
+
+TRANSITIONS: typing.Dict[int, typing.Tuple[int, ...]] = {
+    OrderStatus.PENDING: (OrderStatus.PAID, OrderStatus.CANCELED),
+    OrderStatus.PAID: (OrderStatus.PREPARING, OrderStatus.CANCELED),
+    OrderStatus.PREPARING: (OrderStatus.DELIVERING, OrderStatus.CANCELED),
+    OrderStatus.DELIVERING: (OrderStatus.DELIVERED, ),
+}
+
+
+class TransitionConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = _('The order was changed by another request.')
+    default_code = 'transition_conflict'
+
+
+def can_transition(from_status: int, to_status: int) -> bool:
+    return to_status in TRANSITIONS.get(from_status, ())
+
+
+def transition(order: Order, to_status: int, actor: User = None):
+    """
+    changes the status of the order from `order.status` to `to_status`.
+    raises ValidationError when the transition is not allowed,
+    and TransitionConflict when the order was changed since it was read.
+    """
+    from_status = order.status
+    if not can_transition(from_status, to_status):
+        raise ValidationError({
+            'status':
+            f'the order can not be {OrderStatus(to_status).label.lower()} '
+            f'when it is {OrderStatus(from_status).label.lower()}'
+        })
+    now = timezone.now()
+    with transaction.atomic():
+        changed = Order.objects.filter(pk=order.pk, status=from_status).update(
+            status=to_status, modified=now)
+        if not changed:
+            raise TransitionConflict()
+        OrderTransition.objects.create(order=order,
+                                       from_status=from_status,
+                                       to_status=to_status,
+                                       actor=actor)
+        order.status = to_status
+        order.modified = now
+        order_status_changed.send(sender=Order,
+                                  order=order,
+                                  from_status=from_status,
+                                  to_status=to_status)
+        publish_order(order, ORDER_STATUS)
@@ -1,3 +1,166 @@
-from django.shortcuts import render
+from django.db.models import Prefetch
+from django.http.request import HttpRequest
+from rest_framework import mixins, permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from apps.common.idempotency import idempotent
+from apps.order import cart
+from apps.order.checkout import Item
+from apps.order.models import ACTIVE_CONDITION, Order, OrderStatus, Selection
+from apps.order.permissions import IsStoreOwner
+from apps.order.serializers import CartCheckoutSerializer, CartSerializer, CheckoutSerializer, ItemSerializer, OrderSerializer, TransitionSerializer
+from apps.order.transitions import transition
 
-# Create your views here.
+
+def with_selections(queryset):
+    return queryset.prefetch_related(
+        Prefetch('selections',
+                 queryset=Selection.objects.order_by('id'),
+                 to_attr='selection_list'))
+
+
+class OrderView(mixins.CreateModelMixin, mixins.ListModelMixin,
+                mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    queryset = Order.objects.all()
+    serializer_class = OrderSerializer
+    permission_classes = (permissions.IsAuthenticated, )
+    lookup_value_regex = r'\d+'
+    # the mutating actions include the queries of the Idempotency-Key
+    query_budgets = {
+        'list': 2,
+        'retrieve': 2,
+        'create': 16,
+        'pay': 16,
+        'cancel': 8,
+    }
+
+    def get_serializer_class(self):
+        if self.action == 'create':
+            return CheckoutSerializer
+        return OrderSerializer
+
+    def get_queryset(self):
+        return with_selections(
+            Order.objects.filter(orderer=self.request.user))
+
+    @idempotent
+    def create(self, request: HttpRequest, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
+    @action(methods=['post'], detail=True)
+    @idempotent
+    def pay(self, request: HttpRequest, *args, **kwargs):
+        order: Order = self.get_object()
+        transition(order, OrderStatus.PAID, actor=request.user)
+        serializer = self.get_serializer(order)
+        return Response(serializer.data)
+
+    @action(methods=['post'], detail=True)
+    def cancel(self, request: HttpRequest, *args, **kwargs):
+        order: Order = self.get_object()
+        if order.status not in (OrderStatus.PENDING, OrderStatus.PAID):
+            # the restaurant has started to prepare it
+            raise ValidationError(
+                {'status': 'the order can not be canceled anymore'})
+        transition(order, OrderStatus.CANCELED, actor=request.user)
+        serializer = self.get_serializer(order)
+        return Response(serializer.data)
+
+
+class CartView(viewsets.GenericViewSet):
+    """
+    the cart of the user, kept in the cache without any query until the checkout
+    """
+    serializer_class = CartSerializer
+    permission_classes = (permissions.IsAuthenticated, )
+    lookup_field = 'menu'
+    lookup_value_regex = r'\d+'
+    query_budgets = {
+        'list': 0,
+        'update': 0,
+        'destroy': 0,
+        'checkout': 16,
+    }
+
+    def get_serializer_class(self):
+        if self.action == 'update':
+            return ItemSerializer
+        if self.action == 'checkout':
+            return CartCheckoutSerializer
+        return CartSerializer
+
+    def list(self, request: HttpRequest, *args, **kwargs):
+        return Response(
+            self.get_serializer(cart.get_cart(request.user.pk)).data)
+
+    def update(self, request: HttpRequest, menu: str, *args, **kwargs):
+        data = request.data.copy()
+        data['menu'] = menu
+        serializer = self.get_serializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        items = cart.set_item(request.user.pk,
+                              Item(**serializer.validated_data))
+        return Response(CartSerializer(items).data)
+
+    def destroy(self, request: HttpRequest, menu: str, *args, **kwargs):
+        items = cart.remove_item(request.user.pk, int(menu))
+        return Response(CartSerializer(items).data)
+
+    @action(methods=['post'], detail=False)
+    @idempotent
+    def checkout(self, request: HttpRequest, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class StoreOrderView(mixins.ListModelMixin, mixins.RetrieveModelMixin,
+                     viewsets.GenericViewSet):
+    """
+    the dashboard of the orders to the restaurants of the store owner
+    """
+    queryset = Order.objects.all()
+    serializer_class = OrderSerializer
+    permission_classes = (IsStoreOwner, )
+    lookup_value_regex = r'\d+'
+    query_budgets = {
+        'list': 2,
+        'retrieve': 2,
+        'status': 8,
+    }
+    # the statuses which the restaurant can change the orders to
+    STORE_STATUSES = (OrderStatus.PREPARING, OrderStatus.DELIVERING,
+                      OrderStatus.DELIVERED, OrderStatus.CANCELED)
+
+    def get_serializer_class(self):
+        if self.action == 'status':
+            return TransitionSerializer
+        return OrderSerializer
+
+    def get_queryset(self):
+        queryset = Order.objects.filter(
+            restaurant__owner=self.request.user).select_related('restaurant')
+        if self.action == 'list':
+            # served by order_restaurant_active_idx
+            queryset = queryset.filter(ACTIVE_CONDITION)
+            status = self.request.query_params.get('status')
+            if status is not None:
+                serializer = TransitionSerializer(data={'status': status})
+                serializer.is_valid(raise_exception=True)
+                queryset = queryset.filter(
+                    status=serializer.validated_data['status'])
+        return with_selections(queryset)
+
+    @action(methods=['post'], detail=True)
+    def status(self, request: HttpRequest, *args, **kwargs):
+        order: Order = self.get_object()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        to_status = serializer.validated_data['status']
+        if to_status not in self.STORE_STATUSES:
+            raise ValidationError(
+                {'status': 'the restaurant can not change the order to it'})
+        transition(order, to_status, actor=request.user)
+        return Response(OrderSerializer(order).data)
@@ -0,0 +1,64 @@
+"""
+cache of the rendered restaurant documents
+
+a document is cached under the current version of its restaurant,
+the version is bumped by the signals in apps.restaurant.signals whenever the restaurant or its menus change,
+so the stale documents are never read again and just expire.
+the documents have the absolute URLs of the pictures like the lists, so they are cached by the base URL too.
+"""
+import hashlib
+import time
+import typing
+from django.conf import settings
+from django.core.cache import caches
+
+
+def get_cache():
+    return caches[settings.RESTAURANT_CACHE_ALIAS]
+
+
+def get_version_key(restaurant_id: int) -> str:
+    return f'restaurant:{restaurant_id}:version'
+
+
+def new_version() -> int:
+    # used when the version is missing (never set or evicted),
+    # so it is time based to never collide with the versions of the documents still cached
+    return time.time_ns() // 1000
+
+
+def get_version(restaurant_id: int) -> int:
+    cache = get_cache()
+    key = get_version_key(restaurant_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, new_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(restaurant_id: int):
+    cache = get_cache()
+    key = get_version_key(restaurant_id)
+    try:
+        cache.incr(key)
+    except ValueError:  # missing
+        cache.set(key, new_version(), timeout=None)
+
+
+def get_document_key(restaurant_id: int, version: int, base_url: str) -> str:
+    # hashed since the host of the base url comes from the request
+    base = hashlib.md5(base_url.encode()).hexdigest()
+    return f'restaurant:{restaurant_id}:document:{version}:{base}'
+
+
+def get_document(restaurant_id: int, version: int,
+                 base_url: str) -> typing.Optional[bytes]:
+    return get_cache().get(get_document_key(restaurant_id, version,
+                                            base_url))
+
+
+def set_document(restaurant_id: int, version: int, base_url: str,
+                 document: bytes):
+    get_cache().set(get_document_key(restaurant_id, version, base_url),
+                    document, settings.RESTAURANT_CACHE_TIMEOUT)
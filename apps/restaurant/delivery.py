@@ -0,0 +1,85 @@
+"""
+the delivery distance, fee and ETA of the listed restaurants, computed for the whole page at once
+
+the distance is the straight line from the restaurant, the road distance is estimated by DELIVERY_ROAD_FACTOR.
+the fee is the minimum delivery cost of the restaurant plus DELIVERY_FEE_PER_KM for the distance over DELIVERY_FEE_BASE_DISTANCE,
+rounded up to DELIVERY_FEE_UNIT.
+numpy is optional, the python fallback computes the same values.
+"""
+import math
+import typing
+from django.conf import settings
+from apps.common.geohash import haversine_many, numpy
+from apps.restaurant.models import Restaurant
+
+
+class Estimate(typing.NamedTuple):
+    distance: float  # meters
+    delivery_fee: int
+    eta: int  # minutes
+
+
+def estimate_many(
+    distances: typing.Sequence[float],
+    minimum_delivery_costs: typing.Sequence[int],
+    use_numpy: bool = numpy is not None,
+) -> typing.List[Estimate]:
+    base_distance = settings.DELIVERY_FEE_BASE_DISTANCE
+    fee_per_meter = settings.DELIVERY_FEE_PER_KM / 1000
+    fee_unit = settings.DELIVERY_FEE_UNIT
+    road_factor = settings.DELIVERY_ROAD_FACTOR
+    meters_per_minute = settings.DELIVERY_SPEED * 1000 / 60
+    preparation = settings.DELIVERY_PREPARATION_MINUTES
+
+    if not use_numpy:
+        return [
+            Estimate(
+                distance,
+                minimum_delivery_cost +
+                math.ceil(max(distance - base_distance, 0) * fee_per_meter /
+                          fee_unit) * fee_unit,
+                math.ceil(preparation +
+                          distance * road_factor / meters_per_minute),
+            ) for distance, minimum_delivery_cost in zip(
+                distances, minimum_delivery_costs)
+        ]
+    distances = numpy.asarray(distances, dtype=numpy.float64)
+    fees = numpy.asarray(minimum_delivery_costs, dtype=numpy.int64) + (
+        numpy.ceil(
+            numpy.maximum(distances - base_distance, 0) * fee_per_meter /
+            fee_unit).astype(numpy.int64) * fee_unit)
+    etas = numpy.ceil(preparation + distances * road_factor /
+                      meters_per_minute).astype(numpy.int64)
+    return [
+        Estimate(*values)
+        for values in zip(distances.tolist(), fees.tolist(), etas.tolist())
+    ]
+
+
+def attach_estimates(restaurants: typing.Sequence[Restaurant],
+                     latitude: float,
+                     longitude: float,
+                     use_numpy: bool = numpy is not None):
+    """
+    sets the `delivery` attribute of the restaurants with the locations loaded,
+    the distances already computed by apps.restaurant.nearby are reused.
+    """
+    if not restaurants:
+        return
+    if all(hasattr(restaurant, 'distance') for restaurant in restaurants):
+        distances = [restaurant.distance for restaurant in restaurants]
+    else:
+        distances = haversine_many(
+            latitude,
+            longitude,
+            [restaurant.location.latitude for restaurant in restaurants],
+            [restaurant.location.longitude for restaurant in restaurants],
+            use_numpy=use_numpy,
+        )
+    estimates = estimate_many(
+        distances,
+        [restaurant.minimum_delivery_cost for restaurant in restaurants],
+        use_numpy=use_numpy,
+    )
+    for restaurant, estimate in zip(restaurants, estimates):
+        restaurant.delivery = estimate
@@ -0,0 +1,21 @@
+# Generated by Django 3.2.5 on 2026-10-18 18:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0003_auto_20210708_0559'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='menuinformation',
+            index=models.Index(fields=['restaurant', 'created', 'id'], name='menu_restaurant_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='restaurant',
+            index=models.Index(fields=['created', 'id'], name='restaurant_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 3.2.5 on 2026-10-18 18:08
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0004_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='menuinformation',
+            index=models.Index(condition=models.Q(('deleted__isnull', True)), fields=['restaurant', 'created', 'id'], name='menu_restaurant_alive_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='restaurant',
+            index=models.Index(condition=models.Q(('deleted__isnull', True)), fields=['created', 'id'], name='restaurant_alive_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='menuinformation',
+            name='menu_restaurant_keyset_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='restaurant',
+            name='restaurant_keyset_idx',
+        ),
+        migrations.AlterField(
+            model_name='menuinformation',
+            name='restaurant',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='restaurant.restaurant'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 3.2.5 on 2026-10-18 18:40
+
+from django.db import migrations, models
+from apps.common.geohash import encode
+
+
+def fill_geohash(apps, schema_editor):
+    Location = apps.get_model('restaurant', 'Location')
+    locations = []
+    for location in Location.objects.only('latitude',
+                                          'longitude').iterator():
+        location.geohash = encode(location.latitude, location.longitude, 9)
+        locations.append(location)
+        if len(locations) == 1000:
+            Location.objects.bulk_update(locations, ('geohash', ))
+            locations = []
+    Location.objects.bulk_update(locations, ('geohash', ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0005_alive_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='location',
+            name='geohash',
+            field=models.CharField(default='', editable=False, max_length=12),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_geohash, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='location',
+            index=models.Index(fields=['geohash'], name='location_geohash_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 3.2.5 on 2026-10-18 19:38
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0006_location_geohash'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='menuinformation',
+            name='restaurant',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='restaurant.restaurant'),
+        ),
+    ]
@@ -1,13 +1,31 @@
 from django.db import models
 from django.core.validators import MinLengthValidator
 from pangpangeats.settings import AUTH_USER_MODEL
-from apps.common.models import BaseModel
+from apps.common.geohash import MAX_PRECISION, encode as encode_geohash
+from apps.common.models import BaseModel, alive_index
 
 
 class Location(BaseModel):
+    GEOHASH_PRECISION = 9  # cells of about 5m x 5m
+
     address = models.CharField(max_length=40, null=False)
     latitude = models.FloatField(null=False)
     longitude = models.FloatField(null=False)
+    # maintained by save() for the range scans of apps.restaurant.nearby,
+    # so the rows changed by update() or bulk_create() should set it explicitly
+    geohash = models.CharField(max_length=MAX_PRECISION, editable=False)
+
+    def save(self, *args, **kwargs):
+        self.geohash = encode_geohash(self.latitude, self.longitude,
+                                      self.GEOHASH_PRECISION)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'geohash'}
+        super().save(*args, **kwargs)
+
+    class Meta:
+        indexes = (models.Index(fields=('geohash', ),
+                                name='location_geohash_idx'), )
 
     def __str__(self):  # pragma: no cover
         return self.address
@@ -54,6 +72,11 @@ class Restaurant(BaseModel):
     business_information: BusinessInformation = models.OneToOneField(
         BusinessInformation, null=False, on_delete=models.PROTECT)
 
+    class Meta:
+        indexes = (
+            # in the order of apps.common.pagination
+            alive_index('created', 'id', name='restaurant_alive_idx'), )
+
     def __str__(self):  # pragma: no cover
         return f"{self.name} {self.location}"
 
@@ -71,5 +94,11 @@ class MenuInformation(BaseModel):
     price = models.PositiveIntegerField(null=False)
     is_available = models.BooleanField(default=True)
 
+    class Meta:
+        indexes = (
+            # the menus of a restaurant, in the order of apps.common.pagination
+            alive_index('restaurant', 'created', 'id',
+                        name='menu_restaurant_alive_idx'), )
+
     def __str__(self):  # pragma: no cover
         return f"{self.restaurant.name} {self.name}"
\ No newline at end of file
@@ -0,0 +1,78 @@
+"""
+the restaurants near a point, without PostGIS
+
+1. the candidates are pruned by the index range scans of the geohash cells covering the circle,
+   then by the bounding box of the circle
+2. the exact haversine distances of the candidates are computed in a single vectorized call,
+   and the ones out of the circle are dropped
+3. only the restaurants of the requested page are loaded
+"""
+import functools
+import operator
+import typing
+from django.db.models import Q, QuerySet
+from apps.common.geohash import bounding_box, covering_cells, haversine_many, prefix_range
+from apps.restaurant.models import Restaurant
+
+
+class Nearby(typing.NamedTuple):
+    distance: float  # meters
+    id: int
+
+
+def get_cell_condition(cell: str) -> Q:
+    start, end = prefix_range(cell)
+    condition = Q(location__geohash__gte=start)
+    if end is not None:
+        condition &= Q(location__geohash__lt=end)
+    return condition
+
+
+def get_candidates(queryset: QuerySet, latitude: float, longitude: float,
+                   radius: float) -> QuerySet:
+    cells = covering_cells(latitude, longitude, radius)
+    queryset = queryset.filter(
+        functools.reduce(operator.or_, map(get_cell_condition, cells)))
+    south, north, west, east = bounding_box(latitude, longitude, radius)
+    queryset = queryset.filter(location__latitude__range=(south, north))
+    if -180 <= west and east <= 180:  # the box doesn't cross the antimeridian
+        queryset = queryset.filter(location__longitude__range=(west, east))
+    return queryset
+
+
+def find_nearby(latitude: float,
+                longitude: float,
+                radius: float,
+                queryset: QuerySet = None) -> typing.List[Nearby]:
+    """
+    returns the ids of the restaurants within `radius` meters with their distances, the nearest first.
+    """
+    if queryset is None:
+        queryset = Restaurant.objects.all()
+    candidates = list(
+        get_candidates(queryset, latitude, longitude,
+                       radius).values_list('id', 'location__latitude',
+                                           'location__longitude'))
+    if not candidates:
+        return []
+    ids, latitudes, longitudes = zip(*candidates)
+    distances = haversine_many(latitude, longitude, latitudes, longitudes)
+    return sorted(
+        Nearby(distance, restaurant_id)
+        for distance, restaurant_id in zip(distances, ids)
+        if distance <= radius)
+
+
+def load_restaurants(queryset: QuerySet,
+                     nearby: typing.Sequence[Nearby]) -> typing.List[Restaurant]:
+    """
+    returns the restaurants in the order of `nearby`, with the `distance` attribute set.
+    """
+    restaurants = queryset.in_bulk([restaurant.id for restaurant in nearby])
+    loaded = []
+    for distance, restaurant_id in nearby:
+        restaurant = restaurants.get(restaurant_id)
+        if restaurant is not None:  # deleted in between
+            restaurant.distance = distance
+            loaded.append(restaurant)
+    return loaded
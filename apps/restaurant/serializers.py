@@ -0,0 +1,81 @@
+from django.conf import settings
+from rest_framework import serializers
+from apps.restaurant.models import BusinessInformation, Location, MenuInformation, Restaurant
+
+
+class LocationSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Location
+        fields = ('address', 'latitude', 'longitude')
+
+
+class BusinessInformationSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = BusinessInformation
+        fields = ('owner_name', 'business_name',
+                  'business_registration_number')
+
+
+class MenuInformationSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = MenuInformation
+        fields = ('id', 'name', 'description', 'picture', 'price',
+                  'is_available')
+
+
+class RestaurantSerializer(serializers.ModelSerializer):
+    location = LocationSerializer(read_only=True)
+
+    class Meta:
+        model = Restaurant
+        fields = ('id', 'name', 'picture', 'minimum_order_cost',
+                  'minimum_delivery_cost', 'location')
+
+
+class DeliveryEstimateSerializer(serializers.Serializer):
+    distance = serializers.FloatField()  # in meters
+    delivery_fee = serializers.IntegerField()
+    eta = serializers.IntegerField()  # in minutes
+
+
+class RestaurantDeliverySerializer(RestaurantSerializer):
+    # set by apps.restaurant.delivery.attach_estimates
+    delivery = DeliveryEstimateSerializer(read_only=True)
+
+    class Meta(RestaurantSerializer.Meta):
+        fields = RestaurantSerializer.Meta.fields + ('delivery', )
+
+
+class NearbyRestaurantSerializer(RestaurantDeliverySerializer):
+    distance = serializers.FloatField(read_only=True)  # in meters
+
+    class Meta(RestaurantDeliverySerializer.Meta):
+        fields = RestaurantDeliverySerializer.Meta.fields + ('distance', )
+
+
+class CoordinatesSerializer(serializers.Serializer):
+    latitude = serializers.FloatField(min_value=-90, max_value=90)
+    longitude = serializers.FloatField(min_value=-180, max_value=180)
+
+
+class NearbyQuerySerializer(CoordinatesSerializer):
+    radius = serializers.FloatField(
+        min_value=1,
+        max_value=settings.NEARBY_RESTAURANT_MAX_RADIUS,
+        default=settings.NEARBY_RESTAURANT_DEFAULT_RADIUS)
+
+
+class RestaurantDetailSerializer(serializers.ModelSerializer):
+    location = LocationSerializer(read_only=True)
+    business_information = BusinessInformationSerializer(read_only=True)
+    menus = MenuInformationSerializer(source='menuinformation_set',
+                                      many=True,
+                                      read_only=True)
+
+    class Meta:
+        model = Restaurant
+        fields = ('id', 'name', 'picture', 'minimum_order_cost',
+                  'minimum_delivery_cost', 'telephone_number', 'description',
+                  'notice', 'origin_information', 'nuturition_facts',
+                  'allergens_facts', 'location', 'business_information',
+                  'menus')
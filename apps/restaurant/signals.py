@@ -0,0 +1,38 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from apps.restaurant.cache import bump_version
+from apps.restaurant.models import BusinessInformation, Location, MenuInformation, Restaurant
+
+# the soft deletion and undeletion save the instance, so post_save covers them too
+
+
+def bump_version_on_commit(restaurant_id: int):
+    # bumped inside the transaction, a reader could cache the rows before the commit under the new version
+    transaction.on_commit(lambda: bump_version(restaurant_id))
+
+
+@receiver(post_save, sender=Restaurant)
+@receiver(post_delete, sender=Restaurant)
+def invalidate_restaurant(sender, instance: Restaurant, **kwargs):
+    bump_version_on_commit(instance.pk)
+
+
+@receiver(post_save, sender=MenuInformation)
+@receiver(post_delete, sender=MenuInformation)
+def invalidate_restaurant_of_menu(sender, instance: MenuInformation,
+                                  **kwargs):
+    bump_version_on_commit(instance.restaurant_id)
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+@receiver(post_save, sender=BusinessInformation)
+@receiver(post_delete, sender=BusinessInformation)
+def invalidate_restaurant_of_information(sender, instance, **kwargs):
+    field = 'location' if sender is Location else 'business_information'
+    restaurant_ids = Restaurant.all_objects.filter(**{
+        field: instance.pk
+    }).values_list('pk', flat=True)
+    for restaurant_id in restaurant_ids:
+        bump_version_on_commit(restaurant_id)
@@ -0,0 +1,98 @@
+import random
+from unittest import skipIf
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APITestCase
+from apps.common.geohash import numpy
+from apps.common.test import create_sample_restaurant
+from apps.restaurant.delivery import Estimate, estimate_many
+from apps.user.models import User, UserRole
+
+
+@override_settings(DELIVERY_FEE_BASE_DISTANCE=1500,
+                   DELIVERY_FEE_PER_KM=500,
+                   DELIVERY_FEE_UNIT=100,
+                   DELIVERY_ROAD_FACTOR=1.3,
+                   DELIVERY_SPEED=20,
+                   DELIVERY_PREPARATION_MINUTES=15)
+class TestDeliveryEstimate(SimpleTestCase):
+    """
+    Test the delivery fee and ETA estimates
+
+    1. the fee should be the minimum delivery cost within the base distance
+    2. the fee should grow by the distance over the base distance, rounded up
+    3. the vectorized estimates should be the same with the python fallback
+    """
+    def test_estimates_should_follow_the_distance(self):
+        self.assertEqual(
+            estimate_many([0, 1500, 2500, 3010], [3000, 3000, 3000, 2000],
+                          use_numpy=False),
+            [
+                Estimate(0, 3000, 15),
+                Estimate(1500, 3000, 21),  # 1950m by the road at 333m/min
+                Estimate(2500, 3500, 25),
+                Estimate(3010, 2800, 27),
+            ])
+
+    @skipIf(numpy is None, 'numpy is not installed')
+    def test_vectorized_estimates_should_match_the_python_fallback(self):
+        random.seed(0)
+        distances = [random.uniform(0, 20000) for _ in range(1000)]
+        costs = [random.choice((0, 1000, 3000)) for _ in range(1000)]
+        self.assertEqual(estimate_many(distances, costs, use_numpy=True),
+                         estimate_many(distances, costs, use_numpy=False))
+
+
+class TestRestaurantDeliveryView(APITestCase):
+    """
+    Test the delivery estimates attached to the listed restaurants
+
+    1. the list should have the estimates only when the coordinates of the client are given
+    2. the nearby restaurants should have the estimates
+    3. partial coordinates should return 400
+    """
+    def setUp(self):
+        owner = User.objects.create_user(phone_number='01012341234',
+                                         name='홍길동',
+                                         password='thePas123Q',
+                                         role=UserRole.STORE_OWNER)
+        create_sample_restaurant(owner,
+                                 name='시청',
+                                 latitude=37.5665,
+                                 longitude=126.9780)
+        create_sample_restaurant(owner,
+                                 name='강남',
+                                 latitude=37.4979,
+                                 longitude=127.0276)
+
+    def test_list_with_coordinates_should_have_estimates(self):
+        response = self.client.get('/api/restaurants', {
+            'latitude': 37.5665,
+            'longitude': 126.9780,
+        })
+        self.assertEqual(response.status_code, 200)
+        deliveries = {
+            restaurant['name']: restaurant['delivery']
+            for restaurant in response.data['results']
+        }
+        self.assertEqual(deliveries['시청']['distance'], 0)
+        self.assertEqual(deliveries['시청']['delivery_fee'], 3000)
+        self.assertGreater(deliveries['강남']['delivery_fee'], 3000)
+        self.assertGreater(deliveries['강남']['eta'], deliveries['시청']['eta'])
+
+    def test_list_without_coordinates_should_not_have_estimates(self):
+        response = self.client.get('/api/restaurants')
+        self.assertNotIn('delivery', response.data['results'][0])
+
+    def test_nearby_restaurants_should_have_estimates(self):
+        response = self.client.get('/api/restaurants/nearby', {
+            'latitude': 37.5665,
+            'longitude': 126.9780,
+            'radius': 10000,
+        })
+        for restaurant in response.data['results']:
+            self.assertEqual(restaurant['delivery']['distance'],
+                             restaurant['distance'])
+
+    def test_partial_coordinates_should_fail(self):
+        response = self.client.get('/api/restaurants', {'latitude': 37.5665})
+        self.assertEqual(response.status_code, 400)
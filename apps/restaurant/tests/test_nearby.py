@@ -0,0 +1,115 @@
+from django.db import connection
+from rest_framework.test import APITestCase
+from apps.common.geohash import encode
+from apps.common.test import create_sample_restaurant
+from apps.restaurant.models import Restaurant
+from apps.restaurant.nearby import get_candidates
+from apps.user.models import User, UserRole
+
+
+class TestNearbyRestaurantView(APITestCase):
+    ENDPOINT = '/api/restaurants/nearby'
+    """
+    Test the API to find the restaurants near a point
+
+    the API should work like:
+    1. only the restaurants within the radius should be returned, the nearest first
+    2. the results should be paginated
+    3. an invalid point or radius should return 400
+    """
+    def setUp(self):
+        owner = User.objects.create_user(phone_number='01012341234',
+                                         name='홍길동',
+                                         password='thePas123Q',
+                                         role=UserRole.STORE_OWNER)
+        # around Seoul City Hall (37.5665, 126.9780)
+        self.restaurants = {
+            name: create_sample_restaurant(owner,
+                                           name=name,
+                                           latitude=latitude,
+                                           longitude=longitude)
+            for name, latitude, longitude in (
+                ('시청', 37.5665, 126.9780),  # 0m
+                ('광화문', 37.5759, 126.9768),  # about 1km
+                ('서울역', 37.5547, 126.9707),  # about 1.5km
+                ('강남', 37.4979, 127.0276),  # about 8.8km
+            )
+        }
+
+    def get_names(self, response) -> list:
+        return [restaurant['name'] for restaurant in response.data['results']]
+
+    def test_nearby_restaurants_should_be_sorted_by_distance(self):
+        response = self.client.get(self.ENDPOINT, {
+            'latitude': 37.5665,
+            'longitude': 126.9780,
+            'radius': 2000,
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get_names(response), ['시청', '광화문', '서울역'])
+        distances = [
+            restaurant['distance'] for restaurant in response.data['results']
+        ]
+        self.assertEqual(distances, sorted(distances))
+        self.assertLess(distances[0], 1)
+
+    def test_larger_radius_should_include_farther_restaurants(self):
+        response = self.client.get(self.ENDPOINT, {
+            'latitude': 37.5665,
+            'longitude': 126.9780,
+            'radius': 10000,
+        })
+        self.assertEqual(self.get_names(response)[-1], '강남')
+
+    def test_nearby_restaurants_should_be_paginated(self):
+        response = self.client.get(self.ENDPOINT, {
+            'latitude': 37.5665,
+            'longitude': 126.9780,
+            'radius': 2000,
+            'limit': 2,
+        })
+        self.assertEqual(self.get_names(response), ['시청', '광화문'])
+        response = self.client.get(response.data['next'])
+        self.assertEqual(self.get_names(response), ['서울역'])
+
+    def test_deleted_restaurant_should_not_be_returned(self):
+        self.restaurants['시청'].delete()
+        response = self.client.get(self.ENDPOINT, {
+            'latitude': 37.5665,
+            'longitude': 126.9780,
+            'radius': 2000,
+        })
+        self.assertEqual(self.get_names(response), ['광화문', '서울역'])
+
+    def test_invalid_query_should_fail(self):
+        for query in (
+            {},
+            {'latitude': 91, 'longitude': 126.9780},
+            {'latitude': 37.5665, 'longitude': 126.9780, 'radius': 10**6},
+        ):
+            response = self.client.get(self.ENDPOINT, query)
+            self.assertEqual(response.status_code, 400)
+
+    def test_geohash_should_follow_the_location(self):
+        location = self.restaurants['강남'].location
+        self.assertEqual(location.geohash, encode(37.4979, 127.0276))
+        location.latitude, location.longitude = 37.5665, 126.9780
+        location.save(update_fields=('latitude', 'longitude'))
+        location.refresh_from_db()
+        self.assertEqual(location.geohash, encode(37.5665, 126.9780))
+
+    def test_candidates_should_be_found_by_the_geohash_index(self):
+        queryset = get_candidates(Restaurant.objects.all(), 37.5665, 126.9780,
+                                  2000)
+        if connection.vendor == 'postgresql':
+            # the table is too small for the planner to prefer an index
+            with connection.cursor() as cursor:
+                cursor.execute('SET enable_seqscan = off')
+        try:
+            plan = queryset.explain()
+        finally:
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('RESET enable_seqscan')
+        self.assertIn('location_geohash_idx', plan)
+        self.assertEqual(queryset.count(), 3)
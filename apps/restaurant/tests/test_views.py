@@ -0,0 +1,182 @@
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.test import APITestCase
+from apps.common.test import assert_query_budget, create_sample_restaurant
+from apps.restaurant.cache import get_version
+from apps.restaurant.models import MenuInformation, Restaurant
+from apps.restaurant.views import RestaurantView
+from apps.user.models import User, UserRole
+
+
+class TestRestaurantView(APITestCase):
+    ENDPOINT = '/api/restaurants'
+    restaurant: Restaurant
+    """
+    Test the API to read the restaurants
+
+    the API should work like:
+    1. the list view should return the restaurants without the menus
+    2. the detail view should return the restaurant with its alive menus, with the pictures like the list view
+    3. the detail view should be served from the cache without any query
+    4. changing the restaurant, its menus, location or business information should invalidate the cache
+       after the commit, so the rows before the commit are never cached under the new version
+    5. the detail view should return 404 for a missing or deleted restaurant
+    """
+    def setUp(self):
+        cache.clear()
+        owner = User.objects.create_user(phone_number='01012341234',
+                                         name='홍길동',
+                                         password='thePas123Q',
+                                         role=UserRole.STORE_OWNER)
+        self.restaurant = create_sample_restaurant(owner)
+        self.detail_endpoint = f'{self.ENDPOINT}/{self.restaurant.pk}'
+
+    def test_list_view_should_success(self):
+        response = self.client.get(self.ENDPOINT)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['name'], '팡팡치킨')
+        self.assertNotIn('menus', response.data['results'][0])
+
+    def test_detail_view_should_success(self):
+        response = self.client.get(self.detail_endpoint)
+        self.assertEqual(response.status_code, 200)
+        document = response.json()
+        self.assertEqual(document['name'], '팡팡치킨')
+        self.assertEqual(document['location']['address'],
+                         '서울특별시 중구 세종대로 110')
+        self.assertEqual([menu['price'] for menu in document['menus']],
+                         [18000, 2000])
+
+    def test_detail_and_list_should_have_the_same_pictures(self):
+        listed = self.client.get(self.ENDPOINT).data['results'][0]
+        for _ in range(2):  # on the miss and the hit of the cache
+            document = self.client.get(self.detail_endpoint).json()
+            self.assertEqual(document['picture'], listed['picture'])
+            self.assertTrue(document['picture'].startswith('http://testserver/'))
+            self.assertTrue(document['menus'][0]['picture'].startswith(
+                'http://testserver/'))
+        other_host = self.client.get(self.detail_endpoint,
+                                     HTTP_HOST='example.com').json()
+        self.assertTrue(other_host['picture'].startswith('http://example.com/'))
+
+    def test_cached_detail_view_should_not_query(self):
+        self.client.get(self.detail_endpoint)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.detail_endpoint)
+        self.assertEqual(response.status_code, 200)
+
+    def test_changing_menu_should_invalidate_the_cache(self):
+        self.client.get(self.detail_endpoint)
+        menu = MenuInformation.objects.filter(
+            restaurant=self.restaurant).first()
+        with self.captureOnCommitCallbacks(execute=True):
+            menu.price = 19000
+            menu.save()
+        response = self.client.get(self.detail_endpoint)
+        self.assertEqual(response.json()['menus'][0]['price'], 19000)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            menu.delete()
+        response = self.client.get(self.detail_endpoint)
+        self.assertEqual(len(response.json()['menus']), 1)
+
+    def test_changing_location_should_invalidate_the_cache(self):
+        self.client.get(self.detail_endpoint)
+        location = self.restaurant.location
+        with self.captureOnCommitCallbacks(execute=True):
+            location.address = '서울특별시 강남구 테헤란로 1'
+            location.save()
+        response = self.client.get(self.detail_endpoint)
+        self.assertEqual(response.json()['location']['address'],
+                         '서울특별시 강남구 테헤란로 1')
+
+    def test_changing_business_information_should_invalidate_the_cache(self):
+        self.client.get(self.detail_endpoint)
+        business_information = self.restaurant.business_information
+        with self.captureOnCommitCallbacks(execute=True):
+            business_information.business_name = '팡팡치킨 본점'
+            business_information.save()
+        response = self.client.get(self.detail_endpoint)
+        self.assertEqual(
+            response.json()['business_information']['business_name'],
+            '팡팡치킨 본점')
+
+    def test_version_should_be_bumped_after_the_commit(self):
+        menu = MenuInformation.objects.filter(
+            restaurant=self.restaurant).first()
+        version = get_version(self.restaurant.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                menu.price = 19000
+                menu.save()
+                # a reader before the commit caches under the version which is about to be dropped
+                self.client.get(self.detail_endpoint)
+                self.assertEqual(get_version(self.restaurant.pk), version)
+        self.assertNotEqual(get_version(self.restaurant.pk), version)
+        response = self.client.get(self.detail_endpoint)
+        self.assertEqual(response.json()['menus'][0]['price'], 19000)
+
+    def test_deleted_restaurant_should_return_404(self):
+        self.client.get(self.detail_endpoint)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.restaurant.delete()
+        response = self.client.get(self.detail_endpoint)
+        self.assertEqual(response.status_code, 404)
+
+    def test_missing_restaurant_should_return_404(self):
+        response = self.client.get(f'{self.ENDPOINT}/1000000')
+        self.assertEqual(response.status_code, 404)
+
+
+class TestRestaurantQueryBudget(APITestCase):
+    ENDPOINT = '/api/restaurants'
+    """
+    Test the queries of the restaurant API
+
+    the queries should:
+    1. be within the budgets of RestaurantView
+    2. not grow with the restaurants listed or found nearby, nor with the menus of a restaurant
+    """
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(phone_number='01012341234',
+                                              name='홍길동',
+                                              password='thePas123Q',
+                                              role=UserRole.STORE_OWNER)
+
+    def populate_restaurants(self, size: int):
+        # around Seoul City Hall (37.5665, 126.9780)
+        for i in range(Restaurant.objects.count(), size):
+            create_sample_restaurant(self.owner,
+                                     name=f'팡팡치킨{i}',
+                                     latitude=37.5665 + i * 0.001)
+
+    def populate_menus(self, size: int):
+        self.restaurant = create_sample_restaurant(self.owner,
+                                                   menu_prices=(1000, ) *
+                                                   size)
+
+    def test_list_should_be_within_budget(self):
+        assert_query_budget(self, RestaurantView, 'list',
+                            self.populate_restaurants,
+                            lambda: self.client.get(self.ENDPOINT))
+        assert_query_budget(
+            self, RestaurantView, 'list', self.populate_restaurants,
+            lambda: self.client.get(self.ENDPOINT, {
+                'latitude': 37.5665,
+                'longitude': 126.9780,
+            }))
+
+    def test_retrieve_should_be_within_budget(self):
+        assert_query_budget(
+            self, RestaurantView, 'retrieve', self.populate_menus,
+            lambda: self.client.get(f'{self.ENDPOINT}/{self.restaurant.pk}'))
+
+    def test_nearby_should_be_within_budget(self):
+        assert_query_budget(
+            self, RestaurantView, 'nearby', self.populate_restaurants,
+            lambda: self.client.get(f'{self.ENDPOINT}/nearby', {
+                'latitude': 37.5665,
+                'longitude': 126.9780,
+            }))
@@ -1,3 +1,103 @@
-from django.shortcuts import render
+import typing
+from django.db.models import Prefetch
+from django.http import HttpResponse
+from django.http.request import HttpRequest
+from rest_framework import permissions, viewsets
+from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
+from apps.common.pagination import ListPagination
+from apps.common.renderers import JSONRenderer
+from apps.restaurant import cache
+from apps.restaurant.delivery import attach_estimates
+from apps.restaurant.models import MenuInformation, Restaurant
+from apps.restaurant.nearby import find_nearby, load_restaurants
+from apps.restaurant.serializers import CoordinatesSerializer, NearbyQuerySerializer, NearbyRestaurantSerializer, RestaurantDeliverySerializer, RestaurantDetailSerializer, RestaurantSerializer
 
-# Create your views here.
+
+class RestaurantView(viewsets.ReadOnlyModelViewSet):
+    queryset = Restaurant.objects.all()
+    serializer_class = RestaurantSerializer
+    permission_classes = (permissions.AllowAny, )
+    lookup_value_regex = r'\d+'
+    query_budgets = {
+        'list': 1,
+        'retrieve': 2,  # on a miss of the cache
+        'nearby': 2,
+    }
+
+    def get_queryset(self):
+        if self.action == 'retrieve':
+            return Restaurant.objects.select_related(
+                'location', 'business_information').prefetch_related(
+                    Prefetch('menuinformation_set',
+                             queryset=MenuInformation.objects.order_by('id')))
+        return Restaurant.objects.select_related('location')
+
+    def get_serializer_class(self):
+        if self.action == 'retrieve':
+            return RestaurantDetailSerializer
+        if self.action == 'nearby':
+            return NearbyRestaurantSerializer
+        return RestaurantSerializer
+
+    def get_coordinates(self) -> typing.Optional[dict]:
+        """
+        returns the coordinates of the client given by the query parameters, to estimate the deliveries
+        """
+        params = self.request.query_params
+        if 'latitude' not in params and 'longitude' not in params:
+            return None
+        query = CoordinatesSerializer(data=params)
+        query.is_valid(raise_exception=True)
+        return query.validated_data
+
+    def list(self, request: HttpRequest, *args, **kwargs):
+        """
+        returns the restaurants, the newest first.
+        the delivery estimates are attached when the latitude and longitude of the client are given.
+        """
+        coordinates = self.get_coordinates()
+        page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        if coordinates is None:
+            serializer = self.get_serializer(page, many=True)
+        else:
+            attach_estimates(page, **coordinates)
+            serializer = RestaurantDeliverySerializer(
+                page, many=True, context=self.get_serializer_context())
+        return self.get_paginated_response(serializer.data)
+
+    def retrieve(self, request: HttpRequest, *args, **kwargs):
+        """
+        returns the restaurant with its menus, served from the cache of the rendered documents.
+        a cache hit doesn't touch the database at all.
+        the pictures are absolute URLs of the host of the request like in the lists.
+        """
+        restaurant_id = int(self.kwargs[self.lookup_field])
+        version = cache.get_version(restaurant_id)
+        base_url = request.build_absolute_uri('/')
+        document = cache.get_document(restaurant_id, version, base_url)
+        if document is None:
+            restaurant = get_object_or_404(self.get_queryset(),
+                                           pk=restaurant_id)
+            document = JSONRenderer().render(
+                RestaurantDetailSerializer(
+                    restaurant, context=self.get_serializer_context()).data)
+            cache.set_document(restaurant_id, version, base_url, document)
+        return HttpResponse(document, content_type='application/json')
+
+    @action(methods=['get'], detail=False)
+    def nearby(self, request: HttpRequest, *args, **kwargs):
+        """
+        returns the restaurants within the radius (meters) of the latitude and longitude, the nearest first
+        """
+        query = NearbyQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        nearby = find_nearby(queryset=self.get_queryset(),
+                             **query.validated_data)
+        paginator = ListPagination()
+        page = paginator.paginate_queryset(nearby, request, view=self)
+        restaurants = load_restaurants(self.get_queryset(), page)
+        attach_estimates(restaurants, query.validated_data['latitude'],
+                         query.validated_data['longitude'])
+        serializer = self.get_serializer(restaurants, many=True)
+        return paginator.get_paginated_response(serializer.data)
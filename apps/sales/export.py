@@ -0,0 +1,144 @@
+"""
+streaming export of the paid orders for the settlements
+
+the orders are read by QuerySet.iterator(), a server-side cursor on postgres,
+and their selections are prefetched chunk by chunk, so the memory doesn't grow with the number of the orders.
+the rows are encoded as CSV (a row per selection) or NDJSON (a line per order with its selections),
+joined into blocks of about BLOCK_SIZE bytes and optionally gzip compressed on the fly.
+"""
+import csv
+import datetime
+import io
+import itertools
+import typing
+import zlib
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Prefetch, QuerySet, prefetch_related_objects
+from apps.order.models import PAID_STATUSES, Order, Selection
+from apps.sales.rollups import get_day_range
+
+FORMATS = ('csv', 'ndjson')
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+# the columns of the export and the attributes of their values, the same in both formats
+ORDER_COLUMNS = {
+    'order': 'id',
+    'created': 'created',
+    'status': 'status',
+    'orderer': 'orderer_id',
+    'restaurant': 'restaurant_id',
+    'total_cost': 'total_cost',
+    'card_alias': 'card_alias',
+}
+SELECTION_COLUMNS = {
+    'selection': 'id',
+    'menu': 'menu_id',
+    'menu_name': 'menu_name',
+    'restaurant_name': 'restaurant_name',
+    'unit_price': 'unit_price',
+    'amount': 'amount',
+}
+BLOCK_SIZE = 64 * 1024
+GZIP_WBITS = 16 + zlib.MAX_WBITS  # the gzip container instead of the zlib one
+
+
+def get_orders(since: datetime.date, until: datetime.date) -> QuerySet:
+    """
+    the paid orders placed from since to until, the days in SALES_TIME_ZONE like the rollups.
+    """
+    start, end = get_day_range(since, until)
+    return Order.objects.filter(
+        status__in=PAID_STATUSES, created__gte=start,
+        created__lt=end).annotate(
+            card_alias=F('purchased_credit_card__alias')).order_by(
+                'created', 'id')  # served by order_created_alive_idx
+
+
+def iter_orders(orders: QuerySet,
+                chunk_size: int = None) -> typing.Iterator[Order]:
+    """
+    yields the orders with their selections in the `selection_list` attribute,
+    prefetched for each chunk since iterator() ignores prefetch_related().
+    """
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    rows = orders.iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            return
+        prefetch_related_objects(
+            chunk,
+            Prefetch('selections',
+                     queryset=Selection.objects.order_by('id'),
+                     to_attr='selection_list'))
+        yield from chunk
+
+
+def iter_csv(orders: typing.Iterable[Order]) -> typing.Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([*ORDER_COLUMNS, *SELECTION_COLUMNS])
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    for order in orders:
+        values = [getattr(order, field) for field in ORDER_COLUMNS.values()]
+        if not order.selection_list:
+            writer.writerow(values)
+        for selection in order.selection_list:
+            writer.writerow(values + [
+                getattr(selection, field)
+                for field in SELECTION_COLUMNS.values()
+            ])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def iter_ndjson(orders: typing.Iterable[Order]) -> typing.Iterator[str]:
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for order in orders:
+        document = {
+            column: getattr(order, field)
+            for column, field in ORDER_COLUMNS.items()
+        }
+        document['selections'] = [{
+            column: getattr(selection, field)
+            for column, field in SELECTION_COLUMNS.items()
+        } for selection in order.selection_list]
+        yield encoder.encode(document) + '\n'
+
+
+def iter_blocks(lines: typing.Iterable[str],
+                compress: bool = False) -> typing.Iterator[bytes]:
+    """
+    joins the lines into the blocks, so the response isn't written line by line.
+    """
+    compressor = zlib.compressobj(wbits=GZIP_WBITS) if compress else None
+    parts, size = [], 0
+    for line in itertools.chain(lines, (None, )):
+        if line is not None:
+            part = line.encode()
+            parts.append(part)
+            size += len(part)
+            if size < BLOCK_SIZE:
+                continue
+        block = b''.join(parts)
+        parts, size = [], 0
+        if compressor is not None:
+            block = compressor.compress(block)
+            if line is None:
+                block += compressor.flush()
+        if block:
+            yield block
+
+
+def export(orders: QuerySet,
+           output: str,
+           compress: bool = False,
+           chunk_size: int = None) -> typing.Iterator[bytes]:
+    encode = iter_csv if output == 'csv' else iter_ndjson
+    return iter_blocks(encode(iter_orders(orders, chunk_size)), compress)
@@ -0,0 +1,24 @@
+import datetime
+from django.core.management.base import BaseCommand, CommandError
+from apps.sales.rollups import check
+
+
+class Command(BaseCommand):
+    help = 'Compares a sample of the daily sales rollups against their recomputation from the orders.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sample', type=int, default=100)
+        parser.add_argument('--since', type=datetime.date.fromisoformat)
+        parser.add_argument('--seed', type=int)
+
+    def handle(self, *args, **options):
+        mismatches = check(sample_size=options['sample'],
+                           since=options['since'],
+                           seed=options['seed'])
+        for mismatch in mismatches:
+            self.stderr.write(
+                f'restaurant {mismatch.restaurant} on {mismatch.day}: '
+                f'expected {mismatch.expected}, found {mismatch.actual}')
+        if mismatches:
+            raise CommandError(f'{len(mismatches)} sales rollups mismatched')
+        self.stdout.write('the sampled sales rollups are consistent')
@@ -0,0 +1,31 @@
+import datetime
+import sys
+from django.core.management.base import BaseCommand
+from apps.sales.export import FORMATS, export, get_orders
+
+
+class Command(BaseCommand):
+    help = 'Streams the paid orders of a range of the days with their selections, for the settlements.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('since', type=datetime.date.fromisoformat)
+        parser.add_argument('until', type=datetime.date.fromisoformat)
+        parser.add_argument('--output', choices=FORMATS, default='csv')
+        parser.add_argument('--gzip', action='store_true')
+        parser.add_argument('--chunk-size', type=int)
+        parser.add_argument('--file',
+                            help='the path to write, the standard output by default')
+
+    def handle(self, *args, **options):
+        blocks = export(get_orders(options['since'], options['until']),
+                        options['output'],
+                        compress=options['gzip'],
+                        chunk_size=options['chunk_size'])
+        if options['file'] is None:
+            for block in blocks:
+                sys.stdout.buffer.write(block)
+            sys.stdout.buffer.flush()
+            return
+        with open(options['file'], 'wb') as file:
+            for block in blocks:
+                file.write(block)
@@ -0,0 +1,21 @@
+import datetime
+from django.core.management.base import BaseCommand
+from apps.sales.rollups import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the daily sales rollups of a range of the days from the orders.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('since', type=datetime.date.fromisoformat)
+        parser.add_argument('until', type=datetime.date.fromisoformat)
+        parser.add_argument('--chunk-days',
+                            type=int,
+                            default=7,
+                            help='days rebuilt in a transaction')
+
+    def handle(self, *args, **options):
+        written = rebuild(options['since'],
+                          options['until'],
+                          chunk_days=options['chunk_days'])
+        self.stdout.write(f'{written} sales rollups written')
@@ -0,0 +1,50 @@
+# Generated by Django 3.2.5 on 2026-10-18 18:42
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('restaurant', '0006_location_geohash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RestaurantDailySales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('orders', models.IntegerField(default=0)),
+                ('revenue', models.BigIntegerField(default=0)),
+                ('delivered_orders', models.IntegerField(default=0)),
+                ('restaurant', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='restaurant.restaurant')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='MenuDailySales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('quantity', models.IntegerField(default=0)),
+                ('revenue', models.BigIntegerField(default=0)),
+                ('menu', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='restaurant.menuinformation')),
+                ('restaurant', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='restaurant.restaurant')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='restaurantdailysales',
+            constraint=models.UniqueConstraint(fields=('restaurant', 'day'), name='restaurant_daily_sales_unique'),
+        ),
+        migrations.AddIndex(
+            model_name='menudailysales',
+            index=models.Index(fields=['restaurant', 'day'], name='menu_sales_restaurant_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='menudailysales',
+            constraint=models.UniqueConstraint(fields=('menu', 'day'), name='menu_daily_sales_unique'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+from django.db import models
+from apps.restaurant.models import MenuInformation, Restaurant
+
+
+class RestaurantDailySales(models.Model):
+    """
+    the sales of a restaurant on a day, maintained by apps.sales.rollups
+    the orders are counted on the day they were placed, in SALES_TIME_ZONE
+    """
+    restaurant: Restaurant = models.ForeignKey(
+        Restaurant,
+        on_delete=models.CASCADE,
+        db_index=False,  # indexed by restaurant_daily_sales_unique
+    )
+    day = models.DateField()
+    orders = models.IntegerField(default=0)  # paid and not canceled
+    revenue = models.BigIntegerField(default=0)  # the total costs of the orders
+    delivered_orders = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = (models.UniqueConstraint(
+            fields=('restaurant', 'day'),
+            name='restaurant_daily_sales_unique'), )
+
+
+class MenuDailySales(models.Model):
+    """
+    the sales of a menu on a day, of the same orders with RestaurantDailySales
+    """
+    menu: MenuInformation = models.ForeignKey(
+        MenuInformation,
+        on_delete=models.CASCADE,
+        db_index=False,  # indexed by menu_daily_sales_unique
+    )
+    # the restaurant of the order, to read the menus of a restaurant without joining the menus
+    restaurant: Restaurant = models.ForeignKey(
+        Restaurant,
+        on_delete=models.CASCADE,
+        db_index=False,  # indexed by menu_sales_restaurant_idx
+    )
+    day = models.DateField()
+    quantity = models.IntegerField(default=0)
+    revenue = models.BigIntegerField(default=0)  # by the prices at the checkout
+
+    class Meta:
+        constraints = (models.UniqueConstraint(
+            fields=('menu', 'day'), name='menu_daily_sales_unique'), )
+        indexes = (models.Index(fields=('restaurant', 'day'),
+                                name='menu_sales_restaurant_idx'), )
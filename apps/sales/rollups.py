@@ -0,0 +1,279 @@
+"""
+the daily sales of the restaurants and the menus, maintained incrementally
+
+an order is counted while it is paid (PAID, PREPARING, DELIVERING or DELIVERED),
+so the rollups of its day are added to when it is paid, and taken back when it is canceled after the payment.
+the increments run in the transaction of the transition, by an INSERT .. ON CONFLICT DO UPDATE of each table,
+so the concurrent orders of the same day never lose their increments.
+
+rebuild() recomputes a range of the days from the orders, and check() compares a sample of the rollups against it.
+"""
+import datetime
+import typing
+import pytz
+from django.conf import settings
+from django.db import connection, models, transaction
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+from apps.order.models import PAID_STATUSES, Order, OrderStatus, Selection
+from apps.sales.models import MenuDailySales, RestaurantDailySales
+
+
+# the first key of the advisory locks of the days of the rollups, the second one is the ordinal of the day
+DAY_LOCKS = 7301
+
+
+class Totals(typing.NamedTuple):
+    orders: int = 0
+    revenue: int = 0
+    delivered_orders: int = 0
+
+
+class MenuTotals(typing.NamedTuple):
+    restaurant: int
+    quantity: int = 0
+    revenue: int = 0
+
+
+# (restaurant id, day) -> Totals and (menu id, day) -> MenuTotals
+RestaurantRollups = typing.Dict[typing.Tuple[int, datetime.date], Totals]
+MenuRollups = typing.Dict[typing.Tuple[int, datetime.date], MenuTotals]
+
+
+class Mismatch(typing.NamedTuple):
+    restaurant: int
+    day: datetime.date
+    expected: typing.Tuple[RestaurantRollups, MenuRollups]
+    actual: typing.Tuple[RestaurantRollups, MenuRollups]
+
+
+def get_time_zone() -> datetime.tzinfo:
+    return pytz.timezone(settings.SALES_TIME_ZONE)
+
+
+def get_day(moment: datetime.datetime) -> datetime.date:
+    return timezone.localtime(moment, get_time_zone()).date()
+
+
+def get_day_range(
+    since: datetime.date, until: datetime.date
+) -> typing.Tuple[datetime.datetime, datetime.datetime]:
+    """
+    returns the [start, end) moments of the days from since to until
+    """
+    time_zone = get_time_zone()
+    return (time_zone.localize(
+        datetime.datetime.combine(since, datetime.time())),
+            time_zone.localize(
+                datetime.datetime.combine(until + datetime.timedelta(days=1),
+                                          datetime.time())))
+
+
+def increment(model: typing.Type[models.Model], unique: typing.Sequence[str],
+              counters: typing.Sequence[str], rows: typing.Sequence[dict]):
+    """
+    adds the counters of the rows to the rows of the same unique fields, inserting the missing rows,
+    in a single statement.
+    """
+    if not rows:
+        return
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    fields = list(rows[0])
+
+    def get_column(field: str) -> str:
+        return quote(model._meta.get_field(field).column)
+
+    values = ', '.join(['(' + ', '.join(['%s'] * len(fields)) + ')'] *
+                       len(rows))
+    updates = ', '.join(f'{column} = {table}.{column} + EXCLUDED.{column}'
+                        for column in map(get_column, counters))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} ({", ".join(map(get_column, fields))}) '
+            f'VALUES {values} ON CONFLICT ({", ".join(map(get_column, unique))}) '
+            f'DO UPDATE SET {updates}',
+            [row[field] for row in rows for field in fields])
+
+
+def get_selection_totals(selections: models.QuerySet,
+                         *group_by: str) -> models.QuerySet:
+    return selections.filter(menu__isnull=False).values(
+        'menu', *group_by).annotate(
+            quantity=models.Sum('amount'),
+            revenue=models.Sum(
+                Coalesce('unit_price', 0) * models.F('amount')))
+
+
+def record_transition(order: Order, from_status: int, to_status: int):
+    """
+    updates the rollups of the day of the order by its transition, in the transaction of the transition.
+    """
+    sign = (to_status in PAID_STATUSES) - (from_status in PAID_STATUSES)
+    delivered = (to_status == OrderStatus.DELIVERED) - (from_status
+                                                        == OrderStatus.DELIVERED)
+    if order.restaurant_id is None or not (sign or delivered):
+        return
+    day = get_day(order.created)
+    lock_day(day, shared=True)
+    increment(RestaurantDailySales, ('restaurant', 'day'),
+              ('orders', 'revenue', 'delivered_orders'), [{
+        'restaurant': order.restaurant_id,
+        'day': day,
+        'orders': sign,
+        'revenue': sign * order.total_cost,
+        'delivered_orders': delivered,
+    }])
+    if not sign:
+        return
+    menus = get_selection_totals(
+        Selection.all_objects.filter(order=order)).order_by('menu')
+    increment(MenuDailySales, ('menu', 'day'), ('quantity', 'revenue'), [{
+        'menu': menu['menu'],
+        'restaurant': order.restaurant_id,
+        'day': day,
+        'quantity': sign * menu['quantity'],
+        'revenue': sign * menu['revenue'],
+    } for menu in menus])
+
+
+def recompute(
+    since: datetime.date,
+    until: datetime.date,
+    restaurant_ids: typing.Iterable[int] = None
+) -> typing.Tuple[RestaurantRollups, MenuRollups]:
+    """
+    computes the rollups of the days from since to until from the orders, by GROUP BY queries.
+    """
+    start, end = get_day_range(since, until)
+    orders = Order.all_objects.filter(status__in=PAID_STATUSES,
+                                      restaurant__isnull=False,
+                                      created__gte=start,
+                                      created__lt=end)
+    if restaurant_ids is not None:
+        orders = orders.filter(restaurant__in=restaurant_ids)
+
+    restaurants = orders.annotate(
+        day=TruncDate('created', tzinfo=get_time_zone())).values(
+            'restaurant', 'day').annotate(
+                orders=models.Count('pk'),
+                revenue=models.Sum('total_cost'),
+                delivered_orders=models.Count(
+                    'pk', filter=models.Q(status=OrderStatus.DELIVERED)))
+    menus = get_selection_totals(
+        Selection.all_objects.filter(order__in=orders).annotate(
+            restaurant=models.F('order__restaurant'),
+            day=TruncDate('order__created', tzinfo=get_time_zone())),
+        'restaurant', 'day')
+    return ({(row['restaurant'], row['day']):
+             Totals(row['orders'], row['revenue'], row['delivered_orders'])
+             for row in restaurants},
+            {(row['menu'], row['day']):
+             MenuTotals(row['restaurant'], row['quantity'], row['revenue'])
+             for row in menus})
+
+
+def read(
+    since: datetime.date,
+    until: datetime.date,
+    restaurant_ids: typing.Iterable[int] = None
+) -> typing.Tuple[RestaurantRollups, MenuRollups]:
+    """
+    reads the rollups of the days from since to until in the shape of recompute(), without the empty rows.
+    """
+    restaurants = RestaurantDailySales.objects.filter(day__gte=since,
+                                                      day__lte=until)
+    menus = MenuDailySales.objects.filter(day__gte=since, day__lte=until)
+    if restaurant_ids is not None:
+        restaurants = restaurants.filter(restaurant__in=restaurant_ids)
+        menus = menus.filter(restaurant__in=restaurant_ids)
+    return ({(row.restaurant_id, row.day):
+             Totals(row.orders, row.revenue, row.delivered_orders)
+             for row in restaurants if row.orders or row.delivered_orders},
+            {(row.menu_id, row.day):
+             MenuTotals(row.restaurant_id, row.quantity, row.revenue)
+             for row in menus if row.quantity})
+
+
+def lock_day(day: datetime.date, shared: bool):
+    """
+    takes the advisory lock of the rollups of the day until the current transaction ends.
+    the increments share it, and a rebuild of the day holds it alone,
+    so they wait for each other only on the same day. the other databases don't lock.
+    """
+    if connection.vendor != 'postgresql':
+        return
+    function = ('pg_advisory_xact_lock_shared'
+                if shared else 'pg_advisory_xact_lock')
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT {function}(%s, %s)',
+                       [DAY_LOCKS, day.toordinal()])
+
+
+def rebuild(since: datetime.date,
+            until: datetime.date,
+            chunk_days: int = 7) -> int:
+    """
+    replaces the rollups of the days from since to until with the recomputed ones,
+    `chunk_days` days in a transaction. returns the number of the rows written.
+    each chunk is recomputed after lock_day() of its days in its transaction,
+    so the increments of those days either are seen by the recomputation or wait to be added over it,
+    and the increments of the other days go on.
+    """
+    written = 0
+    day = since
+    while day <= until:
+        last_day = min(day + datetime.timedelta(days=chunk_days - 1), until)
+        with transaction.atomic():
+            for offset in range((last_day - day).days + 1):
+                lock_day(day + datetime.timedelta(days=offset), shared=False)
+            restaurants, menus = recompute(day, last_day)
+            RestaurantDailySales.objects.filter(day__gte=day,
+                                                day__lte=last_day).delete()
+            MenuDailySales.objects.filter(day__gte=day,
+                                          day__lte=last_day).delete()
+            written += len(
+                RestaurantDailySales.objects.bulk_create(
+                    RestaurantDailySales(restaurant_id=restaurant,
+                                         day=row_day,
+                                         orders=totals.orders,
+                                         revenue=totals.revenue,
+                                         delivered_orders=totals.
+                                         delivered_orders)
+                    for (restaurant, row_day), totals in restaurants.items()))
+            written += len(
+                MenuDailySales.objects.bulk_create(
+                    MenuDailySales(menu_id=menu,
+                                   restaurant_id=totals.restaurant,
+                                   day=row_day,
+                                   quantity=totals.quantity,
+                                   revenue=totals.revenue)
+                    for (menu, row_day), totals in menus.items()))
+        day = last_day + datetime.timedelta(days=1)
+    return written
+
+
+def check(sample_size: int = 100,
+          since: datetime.date = None,
+          seed: int = None) -> typing.List[Mismatch]:
+    """
+    compares the rollups of randomly sampled (restaurant, day) pairs since the day against their recomputation.
+    returns the mismatched pairs.
+    the pairs are sampled by the database, repeatably by the seed on postgresql only.
+    """
+    rollups = RestaurantDailySales.objects.all()
+    if since is not None:
+        rollups = rollups.filter(day__gte=since)
+    if seed is not None and connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            # setseed() takes a seed between -1 and 1
+            cursor.execute('SELECT setseed(%s)', [seed % 1000 / 1000])
+    sample = rollups.order_by('?').values_list('restaurant',
+                                               'day')[:sample_size]
+    mismatches = []
+    for restaurant, day in sample:
+        expected = recompute(day, day, [restaurant])
+        actual = read(day, day, [restaurant])
+        if expected != actual:
+            mismatches.append(Mismatch(restaurant, day, expected, actual))
+    return mismatches
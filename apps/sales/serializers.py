@@ -0,0 +1,47 @@
+from django.conf import settings
+from rest_framework import serializers
+from apps.sales.export import FORMATS
+from apps.sales.models import RestaurantDailySales
+
+
+class DayRangeSerializer(serializers.Serializer):
+    since = serializers.DateField()
+    until = serializers.DateField()
+    max_days = settings.SALES_MAX_DAYS
+
+    def validate(self, attrs):
+        days = (attrs['until'] - attrs['since']).days + 1
+        if not 0 < days <= self.max_days:
+            raise serializers.ValidationError({
+                'until': f'should be within {self.max_days} days since the since'
+            })
+        return attrs
+
+
+class SalesQuerySerializer(DayRangeSerializer):
+    restaurant = serializers.IntegerField(min_value=1)
+
+
+class ExportQuerySerializer(DayRangeSerializer):
+    # not named format, which is taken by the format suffixes of rest_framework
+    output = serializers.ChoiceField(choices=FORMATS, default='csv')
+    gzip = serializers.BooleanField(default=False)
+    max_days = settings.EXPORT_MAX_DAYS
+
+
+class RestaurantDailySalesSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = RestaurantDailySales
+        fields = ('day', 'orders', 'revenue', 'delivered_orders')
+
+
+class MenuSalesSerializer(serializers.Serializer):
+    # the sales of a menu summed over the days
+    menu = serializers.IntegerField()
+    quantity = serializers.IntegerField()
+    revenue = serializers.IntegerField()
+
+
+class SalesSerializer(serializers.Serializer):
+    days = RestaurantDailySalesSerializer(many=True)
+    menus = MenuSalesSerializer(many=True)
@@ -0,0 +1,10 @@
+from django.dispatch import receiver
+from apps.order.models import Order
+from apps.order.signals import order_status_changed
+from apps.sales.rollups import record_transition
+
+
+@receiver(order_status_changed, sender=Order)
+def update_rollups(sender, order: Order, from_status: int, to_status: int,
+                   **kwargs):
+    record_transition(order, from_status, to_status)
@@ -0,0 +1,128 @@
+import csv
+import datetime
+import gzip
+import io
+import json
+import os
+import tempfile
+from django.core.management import call_command
+from rest_framework.test import APITestCase
+from apps.common.test import create_sample_credit_card, create_sample_order, create_sample_restaurant, create_sample_user_and_get_token
+from apps.order.models import OrderStatus
+from apps.restaurant.models import MenuInformation
+from apps.sales.export import export, get_orders
+from apps.user.models import User, UserRole
+
+MOMENT = datetime.datetime(2026, 3, 2, 3, 0, tzinfo=datetime.timezone.utc)
+
+
+class TestOrderExport(APITestCase):
+    ENDPOINT = '/api/exports/orders'
+    """
+    Test the streaming export of the paid orders
+
+    1. the staff should get the paid orders of the days with their selections as CSV or NDJSON
+    2. the export should be compressed by gzip on request
+    3. the selections should be prefetched chunk by chunk
+    4. the others should not export the orders
+    """
+    def setUp(self):
+        User.objects.create_superuser(phone_number='01099999999',
+                                      name='관리자',
+                                      password='thePas123Q')
+        response = self.client.post('/api/token', {
+            'phone_number': '01099999999',
+            'password': 'thePas123Q',
+        })
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' +
+                                response.data['access'])
+        owner = User.objects.create_user(phone_number='01043214321',
+                                         name='김사장',
+                                         password='thePas123Q',
+                                         role=UserRole.STORE_OWNER)
+        orderer = User.objects.create_user(phone_number='01012341234',
+                                           name='홍길동',
+                                           password='thePas123Q')
+        card = create_sample_credit_card(orderer)
+        restaurant = create_sample_restaurant(owner)
+        chicken, coke = MenuInformation.objects.filter(
+            restaurant=restaurant).order_by('id')
+        self.orders = [
+            create_sample_order(orderer, (chicken, coke), (1, 2),
+                                MOMENT,
+                                purchased_credit_card=card,
+                                status=OrderStatus.PAID),
+            create_sample_order(orderer, (chicken, ), (1, ),
+                                MOMENT + datetime.timedelta(minutes=1),
+                                status=OrderStatus.DELIVERED),
+            create_sample_order(orderer, (chicken, ), (1, ),
+                                MOMENT + datetime.timedelta(minutes=2),
+                                status=OrderStatus.PAID),
+        ]
+        # neither paid nor of the day
+        create_sample_order(orderer, (chicken, ), (1, ), MOMENT)
+        create_sample_order(orderer, (chicken, ), (1, ),
+                            MOMENT + datetime.timedelta(days=1),
+                            status=OrderStatus.PAID)
+
+    def export(self, **params) -> bytes:
+        response = self.client.get(self.ENDPOINT, {
+            'since': '2026-03-02',
+            'until': '2026-03-02',
+            **params
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content)
+
+    def test_csv_export_should_success(self):
+        rows = list(csv.DictReader(io.StringIO(self.export().decode())))
+        self.assertEqual([(int(row['order']), row['menu_name'], row['amount'])
+                          for row in rows],
+                         [(self.orders[0].pk, '메뉴0', '1'),
+                          (self.orders[0].pk, '메뉴1', '2'),
+                          (self.orders[1].pk, '메뉴0', '1'),
+                          (self.orders[2].pk, '메뉴0', '1')])
+        self.assertEqual(rows[0]['card_alias'], '홍길동의 카드')
+        self.assertEqual(rows[0]['total_cost'], '22000')
+
+    def test_ndjson_export_should_success(self):
+        documents = [
+            json.loads(line)
+            for line in self.export(output='ndjson').decode().splitlines()
+        ]
+        self.assertEqual([document['order'] for document in documents],
+                         [order.pk for order in self.orders])
+        self.assertEqual([(selection['menu_name'], selection['unit_price'])
+                          for selection in documents[0]['selections']],
+                         [('메뉴0', 18000), ('메뉴1', 2000)])
+
+    def test_gzip_export_should_success(self):
+        self.assertEqual(gzip.decompress(self.export(gzip='true')),
+                         self.export())
+
+    def test_selections_should_be_prefetched_by_chunks(self):
+        orders = get_orders(datetime.date(2026, 3, 2),
+                            datetime.date(2026, 3, 2))
+        # the orders and the selections of each chunk
+        with self.assertNumQueries(1 + 2):
+            blocks = list(export(orders, 'csv', chunk_size=2))
+        self.assertEqual(b''.join(blocks).count(b'\n'), 1 + 4)
+
+    def test_command_should_write_the_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'orders.csv')
+            call_command('export_orders', '2026-03-02', '2026-03-02',
+                         '--file', path)
+            with open(path, 'rb') as file:
+                self.assertEqual(file.read(), self.export())
+
+    def test_others_should_not_export(self):
+        _, token = create_sample_user_and_get_token(self.client,
+                                                    '01011112222')
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + token)
+        response = self.client.get(self.ENDPOINT, {
+            'since': '2026-03-02',
+            'until': '2026-03-02',
+        })
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,184 @@
+import datetime
+import threading
+from io import StringIO
+from unittest import mock, skipUnless
+from django.core.management import CommandError, call_command
+from django.db import OperationalError, connection, transaction
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from apps.common.test import create_sample_order, create_sample_restaurant
+from apps.order.models import Order, OrderStatus
+from apps.order.transitions import transition
+from apps.restaurant.models import MenuInformation
+from apps.sales.models import MenuDailySales, RestaurantDailySales
+from apps.sales import rollups
+from apps.sales.rollups import check, lock_day, read, rebuild, recompute
+from apps.user.models import User, UserRole
+
+DAY = datetime.date(2026, 3, 2)
+# 23:30 on the day in Asia/Seoul
+LATE_NIGHT = datetime.datetime(2026, 3, 2, 14, 30, tzinfo=datetime.timezone.utc)
+
+
+class TestSalesRollups(TestCase):
+    """
+    Test the daily sales rollups
+
+    1. the paid orders should be added to the rollups of the day they were placed
+    2. the orders canceled after the payment should be taken back
+    3. the delivered orders should be counted
+    4. the rebuilt rollups should equal the incremental ones
+    5. the rollups should be recomputed in the transaction of the rebuild, after locking the increments of its days out
+    6. the checker should find the rollups differing from the orders, sampled by the database
+    """
+    def setUp(self):
+        owner = User.objects.create_user(phone_number='01043214321',
+                                         name='김사장',
+                                         password='thePas123Q',
+                                         role=UserRole.STORE_OWNER)
+        self.orderer = User.objects.create_user(phone_number='01012341234',
+                                                name='홍길동',
+                                                password='thePas123Q')
+        self.restaurant = create_sample_restaurant(owner)
+        self.chicken, self.coke = MenuInformation.objects.filter(
+            restaurant=self.restaurant).order_by('id')
+
+    def place_orders(self):
+        first = create_sample_order(self.orderer, (self.chicken, self.coke),
+                                    (1, 2), LATE_NIGHT)
+        second = create_sample_order(self.orderer, (self.chicken, ), (2, ),
+                                     LATE_NIGHT)
+        third = create_sample_order(self.orderer, (self.coke, ), (1, ),
+                                    LATE_NIGHT)
+        for order in (first, second, third):
+            transition(order, OrderStatus.PAID)
+        for status in (OrderStatus.PREPARING, OrderStatus.DELIVERING,
+                       OrderStatus.DELIVERED):
+            transition(first, status)
+        transition(second, OrderStatus.CANCELED)
+        # never paid
+        create_sample_order(self.orderer, (self.coke, ), (5, ), LATE_NIGHT)
+
+    def test_transitions_should_update_the_rollups(self):
+        self.place_orders()
+        sales = RestaurantDailySales.objects.get()
+        self.assertEqual(
+            (sales.day, sales.orders, sales.revenue, sales.delivered_orders),
+            (DAY, 2, 22000 + 2000, 1))
+        self.assertEqual(
+            sorted(
+                MenuDailySales.objects.values_list('menu', 'quantity',
+                                                   'revenue')),
+            [(self.chicken.pk, 1, 18000), (self.coke.pk, 3, 6000)])
+
+    def test_rebuild_should_equal_the_increments(self):
+        self.place_orders()
+        incremental = read(DAY, DAY)
+        self.assertEqual(incremental, recompute(DAY, DAY))
+        RestaurantDailySales.objects.update(orders=0)
+        rebuild(DAY - datetime.timedelta(days=3), DAY, chunk_days=2)
+        self.assertEqual(read(DAY, DAY), incremental)
+
+    def test_check_should_find_the_mismatches(self):
+        self.place_orders()
+        self.assertEqual(check(), [])
+        call_command('check_sales', stdout=StringIO())
+        MenuDailySales.objects.filter(menu=self.coke).update(quantity=4)
+        mismatches = check()
+        self.assertEqual([(mismatch.restaurant, mismatch.day)
+                          for mismatch in mismatches],
+                         [(self.restaurant.pk, DAY)])
+        with self.assertRaises(CommandError):
+            call_command('check_sales', stdout=StringIO(), stderr=StringIO())
+
+    def test_rebuild_should_recompute_in_the_transaction(self):
+        depth = len(connection.savepoint_ids)
+        depths = []
+
+        def recompute_in_transaction(*args):
+            depths.append(len(connection.savepoint_ids))
+            return recompute(*args)
+
+        with mock.patch.object(rollups,
+                               'recompute',
+                               side_effect=recompute_in_transaction):
+            rebuild(DAY, DAY)
+        self.assertEqual(depths, [depth + 1])
+
+    @skipUnless(connection.vendor == 'postgresql',
+                'the advisory locks are of postgresql')
+    def test_rebuild_should_lock_its_days(self):
+        with CaptureQueriesContext(connection) as context:
+            rebuild(DAY - datetime.timedelta(days=2), DAY)
+        statements = [query['sql'] for query in context.captured_queries]
+        locks = [
+            i for i, sql in enumerate(statements)
+            if sql.startswith('SELECT pg_advisory_xact_lock(')
+        ]
+        self.assertEqual(len(locks), 3)
+        recomputation = next(i for i, sql in enumerate(statements)
+                             if 'order_order' in sql)
+        self.assertLess(locks[-1], recomputation)
+
+    def test_check_should_sample_in_the_database(self):
+        self.place_orders()
+        with CaptureQueriesContext(connection) as context:
+            check(sample_size=1)
+        sample = context.captured_queries[0]['sql']
+        self.assertIn('ORDER BY RAND', sample.upper())
+        self.assertIn('LIMIT 1', sample)
+
+
+@skipUnless(connection.vendor == 'postgresql',
+            'the advisory locks are of postgresql')
+class TestConcurrentSalesRollups(TransactionTestCase):
+    """
+    the rebuild of some days should hold the increments of those days only,
+    the payments of the other days should not wait for it
+    """
+    def setUp(self):
+        owner = User.objects.create_user(phone_number='01043214321',
+                                         name='김사장',
+                                         password='thePas123Q',
+                                         role=UserRole.STORE_OWNER)
+        orderer = User.objects.create_user(phone_number='01012341234',
+                                           name='홍길동',
+                                           password='thePas123Q')
+        restaurant = create_sample_restaurant(owner)
+        menus = list(MenuInformation.objects.filter(restaurant=restaurant))
+        self.orders = {
+            day: create_sample_order(orderer, menus[:1], (1, ),
+                                     LATE_NIGHT - (DAY - day))
+            for day in (DAY, DAY + datetime.timedelta(days=1))
+        }
+
+    def pay(self, day: datetime.date) -> bool:
+        """
+        pays the order of the day from another connection, returns whether it was done without waiting
+        """
+        done = []
+
+        def pay():
+            try:
+                with transaction.atomic():
+                    with connection.cursor() as cursor:
+                        cursor.execute("SET LOCAL lock_timeout = '1s'")
+                    transition(Order.objects.get(pk=self.orders[day].pk),
+                               OrderStatus.PAID)
+                done.append(True)
+            except OperationalError:
+                done.append(False)
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=pay)
+        thread.start()
+        thread.join()
+        return done[0]
+
+    def test_increment_of_other_day_should_not_wait(self):
+        with transaction.atomic():
+            lock_day(DAY, shared=False)  # like a rebuild of the day
+            self.assertTrue(self.pay(DAY + datetime.timedelta(days=1)))
+            self.assertFalse(self.pay(DAY))
+        self.assertTrue(self.pay(DAY))
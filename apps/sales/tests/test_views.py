@@ -0,0 +1,93 @@
+from rest_framework.test import APITestCase
+from apps.common.test import create_sample_restaurant, create_sample_user_and_get_token
+from apps.restaurant.models import MenuInformation
+from apps.sales.models import MenuDailySales, RestaurantDailySales
+from apps.user.models import User, UserRole
+
+
+class TestSalesView(APITestCase):
+    ENDPOINT = '/api/sales'
+    """
+    Test the API of the daily sales of a restaurant
+
+    1. the store owner should read the sales of their restaurant from the rollups
+    2. the sales of the restaurants of others should not be found
+    3. the range of the days should be limited
+    """
+    def setUp(self):
+        self.owner = User.objects.create_user(phone_number='01043214321',
+                                              name='김사장',
+                                              password='thePas123Q',
+                                              role=UserRole.STORE_OWNER)
+        response = self.client.post('/api/token', {
+            'phone_number': '01043214321',
+            'password': 'thePas123Q',
+        })
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' +
+                                response.data['access'])
+        self.restaurant = create_sample_restaurant(self.owner)
+        chicken, coke = MenuInformation.objects.filter(
+            restaurant=self.restaurant).order_by('id')
+        for day, orders in (('2026-03-01', 1), ('2026-03-02', 2),
+                            ('2026-04-01', 5)):
+            RestaurantDailySales.objects.create(restaurant=self.restaurant,
+                                                day=day,
+                                                orders=orders,
+                                                revenue=orders * 18000)
+            MenuDailySales.objects.create(menu=chicken,
+                                          restaurant=self.restaurant,
+                                          day=day,
+                                          quantity=orders,
+                                          revenue=orders * 18000)
+            MenuDailySales.objects.create(menu=coke,
+                                          restaurant=self.restaurant,
+                                          day=day,
+                                          quantity=1,
+                                          revenue=2000)
+        self.chicken, self.coke = chicken, coke
+
+    def get(self, **params):
+        return self.client.get(self.ENDPOINT, {
+            'restaurant': self.restaurant.pk,
+            'since': '2026-03-01',
+            'until': '2026-03-31',
+            **params
+        })
+
+    def test_owner_should_read_the_sales(self):
+        with self.assertNumQueries(3):
+            response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([(day['day'], day['orders'])
+                          for day in response.data['days']],
+                         [('2026-03-01', 1), ('2026-03-02', 2)])
+        self.assertEqual(response.data['menus'], [
+            {
+                'menu': self.chicken.pk,
+                'quantity': 3,
+                'revenue': 54000
+            },
+            {
+                'menu': self.coke.pk,
+                'quantity': 2,
+                'revenue': 4000
+            },
+        ])
+
+    def test_sales_of_others_should_not_be_found(self):
+        other = User.objects.create_user(phone_number='01011112222',
+                                         name='이사장',
+                                         password='thePas123Q',
+                                         role=UserRole.STORE_OWNER)
+        restaurant = create_sample_restaurant(other, name='팡팡피자')
+        self.assertEqual(self.get(restaurant=restaurant.pk).status_code, 404)
+
+    def test_too_long_range_should_fail(self):
+        self.assertEqual(self.get(until='2027-03-31').status_code, 400)
+        self.assertEqual(self.get(until='2026-02-01').status_code, 400)
+
+    def test_client_should_not_read_the_sales(self):
+        _, token = create_sample_user_and_get_token(self.client,
+                                                    '01012341234')
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + token)
+        self.assertEqual(self.get().status_code, 403)
@@ -0,0 +1,66 @@
+from django.db.models import Sum
+from django.http import StreamingHttpResponse
+from django.http.request import HttpRequest
+from rest_framework import permissions, viewsets
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from apps.order.permissions import IsStoreOwner
+from apps.restaurant.models import Restaurant
+from apps.sales.export import CONTENT_TYPES, export, get_orders
+from apps.sales.models import MenuDailySales, RestaurantDailySales
+from apps.sales.serializers import ExportQuerySerializer, SalesQuerySerializer, SalesSerializer
+
+
+class SalesView(viewsets.GenericViewSet):
+    """
+    the daily sales of a restaurant of the store owner, read from the rollups only
+    """
+    serializer_class = SalesSerializer
+    permission_classes = (IsStoreOwner, )
+    pagination_class = None
+    query_budget = 3
+
+    def list(self, request: HttpRequest, *args, **kwargs):
+        query = SalesQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        restaurant, since, until = (query.validated_data[field]
+                                    for field in ('restaurant', 'since',
+                                                  'until'))
+        if not Restaurant.objects.filter(pk=restaurant,
+                                         owner=request.user).exists():
+            raise NotFound()
+
+        days = RestaurantDailySales.objects.filter(
+            restaurant=restaurant, day__gte=since,
+            day__lte=until).order_by('day')
+        menus = MenuDailySales.objects.filter(
+            restaurant=restaurant, day__gte=since, day__lte=until).values(
+                'menu').annotate(quantity=Sum('quantity'),
+                                 revenue=Sum('revenue')).order_by(
+                                     '-revenue', 'menu')
+        serializer = self.get_serializer({'days': days, 'menus': menus})
+        return Response(serializer.data)
+
+
+class OrderExportView(APIView):
+    """
+    streams the paid orders of the days with their selections for the settlements, to the staff only
+    """
+    permission_classes = (permissions.IsAdminUser, )
+
+    def get(self, request: HttpRequest):
+        query = ExportQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        since, until, output, compress = (query.validated_data[field]
+                                          for field in ('since', 'until',
+                                                        'output', 'gzip'))
+        filename = f'orders-{since}-{until}.{output}'
+        if compress:
+            filename += '.gz'
+        response = StreamingHttpResponse(
+            export(get_orders(since, until), output, compress),
+            content_type='application/gzip'
+            if compress else CONTENT_TYPES[output])
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
@@ -0,0 +1,62 @@
+import copy
+from django.utils.translation import ugettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+from apps.user.cache import user_cache
+from apps.user.models import User
+
+# the fields of the user copied into the tokens, next to the user id claim
+USER_CLAIMS = ('role', 'is_active', 'is_verified')
+
+
+def stamp_user_claims(token: Token, user: User) -> Token:
+    for claim in USER_CLAIMS:
+        token[claim] = getattr(user, claim)
+    return token
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication which doesn't query the user on every request
+
+    the user is taken from the in-process user cache, or built from the claims of the access token.
+    in the latter case only the id, role, is_active and is_verified fields are loaded,
+    the other fields are deferred and fetched by django when they are accessed.
+    tokens issued without the user claims fall back to the database lookup.
+    """
+    def get_user(self, validated_token: Token) -> User:
+        if any(claim not in validated_token for claim in USER_CLAIMS):
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _('Token contained no recognizable user identification'))
+
+        if not validated_token['is_active']:
+            raise AuthenticationFailed(_('User is inactive'),
+                                       code='user_inactive')
+
+        user: User = user_cache.get(user_id)
+        if user is None:
+            return self.get_user_from_claims(user_id, validated_token)
+        if not user.is_active:  # deactivated after the token was issued
+            raise AuthenticationFailed(_('User is inactive'),
+                                       code='user_inactive')
+        return copy.copy(user)
+
+    def get_user_from_claims(self, user_id, validated_token: Token) -> User:
+        claims = {
+            api_settings.USER_ID_FIELD: user_id,
+            **{claim: validated_token[claim]
+               for claim in USER_CLAIMS},
+        }
+        fields = [
+            field.attname for field in User._meta.concrete_fields
+            if field.attname in claims
+        ]
+        return User.from_db('default', fields,
+                            [claims[field] for field in fields])
@@ -0,0 +1,25 @@
+import copy
+from django.conf import settings
+from apps.common.cache import TTLCache
+from apps.user.models import User
+
+# rows of the recently authenticated users, keyed by the user's pk
+# the entries are dropped by the signals in apps.user.signals when the user is saved or deleted
+user_cache = TTLCache(ttl=settings.USER_CACHE_TTL,
+                      max_size=settings.USER_CACHE_MAX_SIZE)
+
+
+def cache_user(user: User):
+    user_cache.set(user.pk, copy.copy(user))
+
+
+def get_cached_user(user_id) -> User:
+    """
+    returns the full row of the user, hitting the database only when the user is not cached.
+    a copy is returned so that changes on it never leak into the other requests.
+    """
+    user: User = user_cache.get(user_id)
+    if user is None:
+        user = User.objects.get(pk=user_id)
+        cache_user(user)
+    return copy.copy(user)
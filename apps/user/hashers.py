@@ -0,0 +1,182 @@
+"""
+the password hashers, and the pool of processes hashing the passwords off the request workers
+
+the new passwords are hashed by the first of PASSWORD_HASHERS, chosen by PASSWORD_HASHER,
+the old hashes are verified by the others and rehashed by the first one on the next login (see User.check_password).
+the memory-hard hashers cost less CPU than PBKDF2 for the same strength:
+1. ScryptPasswordHasher, like the one of django 4.0, by hashlib of the standard library
+2. Argon2PasswordHasher, needs argon2-cffi, tuned to a single lane so a login takes a single core
+
+with PASSWORD_HASHING_WORKERS set, the hashing runs in a process pool of that size in each gunicorn worker,
+so a burst of logins takes at most the gunicorn workers times PASSWORD_HASHING_WORKERS cores.
+the request thread still waits for its hash, so configs/gunicorn.py runs the gthread workers then:
+at most PASSWORD_HASHING_MAX_PENDING threads of a worker wait for its pool, the logins over that fail with 503,
+and the other threads serve the other requests meanwhile.
+the pool is started lazily from a request thread, so its processes are started by a forkserver,
+forking a multithreaded worker could copy a lock held by another thread into them.
+"""
+import base64
+import concurrent.futures
+import hashlib
+import multiprocessing
+import threading
+import typing
+import django
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.utils.crypto import constant_time_compare
+from django.utils.translation import gettext_noop as _
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class ScryptPasswordHasher(hashers.BasePasswordHasher):
+    """
+    the memory-hard scrypt, with about 16MB and 40ms a hash by the default work factor
+    """
+    algorithm = 'scrypt'
+    block_size = 8
+    maxmem = 0
+    parallelism = 1
+    work_factor = 2**14
+
+    def encode(self, password, salt, n=None, r=None, p=None):
+        assert password is not None
+        assert salt and '$' not in salt
+        n = n or self.work_factor
+        r = r or self.block_size
+        p = p or self.parallelism
+        hash_ = hashlib.scrypt(password.encode(),
+                               salt=salt.encode(),
+                               n=n,
+                               r=r,
+                               p=p,
+                               maxmem=self.maxmem,
+                               dklen=64)
+        hash_ = base64.b64encode(hash_).decode('ascii').strip()
+        return f'{self.algorithm}${n}${salt}${r}${p}${hash_}'
+
+    def decode(self, encoded):
+        algorithm, work_factor, salt, block_size, parallelism, hash_ = encoded.split(
+            '$', 6)
+        assert algorithm == self.algorithm
+        return {
+            'algorithm': algorithm,
+            'work_factor': int(work_factor),
+            'salt': salt,
+            'block_size': int(block_size),
+            'parallelism': int(parallelism),
+            'hash': hash_,
+        }
+
+    def verify(self, password, encoded):
+        decoded = self.decode(encoded)
+        encoded_2 = self.encode(password, decoded['salt'],
+                                decoded['work_factor'], decoded['block_size'],
+                                decoded['parallelism'])
+        return constant_time_compare(encoded, encoded_2)
+
+    def safe_summary(self, encoded):
+        decoded = self.decode(encoded)
+        return {
+            _('algorithm'): decoded['algorithm'],
+            _('work factor'): decoded['work_factor'],
+            _('block size'): decoded['block_size'],
+            _('parallelism'): decoded['parallelism'],
+            _('salt'): hashers.mask_hash(decoded['salt']),
+            _('hash'): hashers.mask_hash(decoded['hash']),
+        }
+
+    def must_update(self, encoded):
+        decoded = self.decode(encoded)
+        return (decoded['work_factor'], decoded['block_size'],
+                decoded['parallelism']) != (self.work_factor, self.block_size,
+                                            self.parallelism)
+
+    def harden_runtime(self, password, encoded):
+        # the work factor is already the same, or the hash is updated anyway
+        pass
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """
+    argon2 of django in a single lane, the default of 8 lanes takes 8 cores on a burst of logins
+    """
+    time_cost = 2
+    memory_cost = 65536  # KiB
+    parallelism = 1
+
+
+class PasswordHashingUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Too many passwords are being hashed, try again later.'
+    default_code = 'password_hashing_unavailable'
+
+
+def verify(password: str, encoded: str) -> typing.Tuple[bool, bool]:
+    """
+    whether the password is correct, and whether its hash should be updated
+    """
+    must_update = []
+    is_correct = hashers.check_password(password, encoded,
+                                        lambda _: must_update.append(True))
+    return is_correct, bool(must_update)
+
+
+class PasswordHashingPool:
+    """
+    the process pool of the process, started on the first password.
+    the processes start from the forkserver instead of a copy of the process, so they set django up themselves.
+    """
+    def __init__(self):
+        self.executor = None
+        self.pending = None
+        self.lock = threading.Lock()
+
+    def submit(self, function, *args):
+        with self.lock:
+            if self.executor is None:
+                self.executor = concurrent.futures.ProcessPoolExecutor(
+                    settings.PASSWORD_HASHING_WORKERS,
+                    mp_context=multiprocessing.get_context('forkserver'),
+                    initializer=django.setup)
+                self.pending = threading.BoundedSemaphore(
+                    settings.PASSWORD_HASHING_MAX_PENDING)
+        if not self.pending.acquire(blocking=False):
+            raise PasswordHashingUnavailable()
+        try:
+            return self.executor.submit(function, *args).result()
+        finally:
+            self.pending.release()
+
+    def shutdown(self):
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown()
+                self.executor = None
+
+
+pool = PasswordHashingPool()
+
+
+def make_password(password: typing.Optional[str]) -> str:
+    if password is None or not settings.PASSWORD_HASHING_WORKERS:
+        return hashers.make_password(password)
+    return pool.submit(hashers.make_password, password)
+
+
+def check_password(password: typing.Optional[str], encoded: str,
+                   setter: typing.Callable[[str], None]) -> bool:
+    """
+    like check_password of django, calls the setter with the password when its hash should be updated
+    """
+    if password is None or not hashers.is_password_usable(encoded):
+        return False
+    if settings.PASSWORD_HASHING_WORKERS:
+        is_correct, must_update = pool.submit(verify, password, encoded)
+    else:
+        is_correct, must_update = verify(password, encoded)
+    if must_update:  # only when correct
+        setter(password)
+    return is_correct
+
@@ -2,7 +2,9 @@ from django.db import models
 from django.utils.translation import ugettext_lazy as _
 from django.core.validators import MinLengthValidator
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
+from model_utils.fields import AutoLastModifiedField
 from apps.common.validators import numeric_validator
+from apps.user.hashers import check_password, make_password
 
 
 class UserRole(models.TextChoices):
@@ -75,9 +77,24 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_staff = models.BooleanField(default=False)
 
     date_joined = models.DateTimeField(auto_now_add=True)
+    modified = AutoLastModifiedField(_('modified'))
 
     USERNAME_FIELD = 'phone_number'
     REQUIRED_FIELDS = ['name']
 
+    # like the ones of django, hashing in the pool of apps.user.hashers when it is enabled
+    def set_password(self, raw_password):
+        self.password = make_password(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password):
+        def setter(raw_password):
+            self.set_password(raw_password)
+            # the rehash is not a change of the password
+            self._password = None
+            self.save(update_fields=['password'])
+
+        return check_password(raw_password, self.password, setter)
+
     class Meta:
         db_table = "pangpangeats_user"
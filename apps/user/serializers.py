@@ -1,5 +1,12 @@
 from django.contrib.auth.password_validation import validate_password
+from django.utils.translation import ugettext_lazy as _
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.user.authentication import stamp_user_claims
+from apps.user.cache import cache_user
 from apps.user.models import User, UserRole
 
 
@@ -13,4 +20,44 @@ class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ('phone_number', 'password', 'name', 'role', 'is_verified',
-                  'date_joined')
\ No newline at end of file
+                  'date_joined')
+
+
+class TokenObtainPairWithClaimsSerializer(TokenObtainPairSerializer):
+    """
+    issues the token pair with the user claims which StatelessJWTAuthentication relies on.
+    the user is already loaded here, so it is put into the user cache, too.
+    """
+    @classmethod
+    def get_token(cls, user: User) -> RefreshToken:
+        return stamp_user_claims(super().get_token(user), user)
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        cache_user(self.user)
+        return data
+
+
+class TokenRefreshWithClaimsSerializer(TokenRefreshSerializer):
+    """
+    re-stamps the user claims from the database while refreshing,
+    so the claims of the access tokens are never older than the lifetime of an access token.
+    """
+    def validate(self, attrs):
+        refresh = RefreshToken(attrs['refresh'])
+        try:
+            user: User = User.objects.get(
+                **{
+                    jwt_settings.USER_ID_FIELD:
+                    refresh[jwt_settings.USER_ID_CLAIM]
+                })
+        except (KeyError, User.DoesNotExist):
+            raise InvalidToken(_('Token contained no recognizable user'))
+        if not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'),
+                                       code='user_inactive')
+        cache_user(user)
+
+        stamp_user_claims(refresh, user)
+        attrs['refresh'] = str(refresh)
+        return super().validate(attrs)
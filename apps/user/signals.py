@@ -0,0 +1,18 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from apps.user.cache import cache_user, user_cache
+from apps.user.models import User
+
+
+@receiver(post_save, sender=User)
+def invalidate_cached_user(sender, instance: User, **kwargs):
+    if instance.is_active:
+        user_cache.delete(instance.pk)
+    else:
+        # keep the deactivated user cached, so the authentication rejects it without the token claims
+        cache_user(instance)
+
+
+@receiver(post_delete, sender=User)
+def delete_cached_user(sender, instance: User, **kwargs):
+    user_cache.delete(instance.pk)
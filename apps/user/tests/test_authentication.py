@@ -0,0 +1,92 @@
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+from apps.common.test import create_sample_user_and_get_token
+from apps.user.cache import user_cache
+from apps.user.models import User
+
+
+class TestStatelessJWTAuthentication(APITestCase):
+    """
+    Test the authentication which reads the user from the token claims
+
+    the authentication should work like:
+    1. the issued tokens should contain the role, is_active and is_verified claims
+    2. authenticating a request should not query the user
+    3. the cached user should be dropped when the user is saved
+    4. the deactivated user should be rejected
+    """
+    user: User
+    token: str
+
+    def setUp(self):
+        self.user, self.token = create_sample_user_and_get_token(
+            self.client, '01012341234')
+
+    def test_issued_token_should_contain_user_claims(self):
+        token = AccessToken(self.token)
+        self.assertEqual(token['user_id'], self.user.pk)
+        self.assertEqual(token['role'], self.user.role)
+        self.assertEqual(token['is_active'], True)
+        self.assertEqual(token['is_verified'], False)
+
+    def test_authentication_should_not_query_the_user(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + self.token)
+        user_cache.clear()
+        with self.assertNumQueries(1):  # only the credit cards are queried
+            response = self.client.get('/api/credit-cards')
+        self.assertEqual(response.status_code, 200)
+
+    def test_retrieving_profile_should_use_the_cached_user(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + self.token)
+        with self.assertNumQueries(0):  # cached while issuing the token
+            response = self.client.get('/api/users')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['phone_number'], '01012341234')
+
+        user_cache.clear()
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/users')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/users')
+        self.assertEqual(response.data['name'], '홍길동')
+
+    def test_saving_user_should_invalidate_the_cache(self):
+        self.assertIn(self.user.pk, user_cache)
+        self.user.name = '김철수'
+        self.user.save()
+        self.assertNotIn(self.user.pk, user_cache)
+
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + self.token)
+        response = self.client.get('/api/users')
+        self.assertEqual(response.data['name'], '김철수')
+
+    def test_deactivated_user_should_fail(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + self.token)
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get('/api/users')
+        self.assertEqual(response.status_code, 401)
+
+    def test_refreshing_token_of_deactivated_user_should_fail(self):
+        response = self.client.post(
+            '/api/token',
+            {
+                'phone_number': '01012341234',
+                'password': 'thePas123Q',
+            },
+        )
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        response = self.client.post(
+            '/api/token/refresh',
+            {
+                'refresh': response.data['refresh'],
+            },
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_token_without_user_claims_should_fall_back_to_database(self):
+        token = AccessToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/users')
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,97 @@
+import os
+import runpy
+from unittest import mock
+from django.conf import settings
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from apps.user.hashers import ScryptPasswordHasher, pool
+from apps.user.models import User, UserRole
+
+GUNICORN_CONFIG = os.path.join(settings.BASE_DIR, 'configs', 'gunicorn.py')
+
+
+class TestPasswordHashers(APITestCase):
+    ENDPOINT = '/api/token'
+    """
+    Test the password hashers and the hashing pool
+
+    the hashing should work like:
+    1. the new passwords should be hashed by scrypt
+    2. the old PBKDF2 hashes should be rehashed by scrypt on login
+    3. the wrong passwords should not be rehashed
+    4. the passwords should be hashed in the pool when it is enabled, by the processes not forked from the worker
+    5. the logins over the pending passwords of the pool should fail with 503
+    6. gunicorn should run the threaded workers with the pool, so the other threads go on while a thread waits
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(phone_number='01012341234',
+                                             name='홍길동',
+                                             password='thePas123Q',
+                                             role=UserRole.CLIENT)
+
+    def login(self, password='thePas123Q'):
+        return self.client.post(self.ENDPOINT, {
+            'phone_number': '01012341234',
+            'password': password,
+        })
+
+    def use_pbkdf2(self):
+        User.objects.filter(pk=self.user.pk).update(
+            password=make_password('thePas123Q', hasher='pbkdf2_sha256'))
+
+    def test_scrypt_should_success(self):
+        self.assertEqual(identify_hasher(self.user.password).algorithm,
+                         'scrypt')
+        hasher = ScryptPasswordHasher()
+        encoded = hasher.encode('thePas123Q', hasher.salt())
+        self.assertTrue(hasher.verify('thePas123Q', encoded))
+        self.assertFalse(hasher.verify('wrongPass1', encoded))
+        self.assertFalse(hasher.must_update(encoded))
+        hasher.work_factor = 2**15
+        self.assertTrue(hasher.must_update(encoded))
+
+    @override_settings(QUERY_BUDGET_MODE='raise')
+    def test_old_hash_should_be_rehashed_on_login(self):
+        self.use_pbkdf2()
+        with self.assertNumQueries(2):  # the user and the rehashed password, within the budget
+            response = self.login()
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('scrypt$'))
+        with self.assertNumQueries(1):
+            self.assertEqual(self.login().status_code, 200)
+
+    def test_wrong_password_should_not_be_rehashed(self):
+        self.use_pbkdf2()
+        response = self.login('wrongPass1')
+        self.assertEqual(response.status_code, 401)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$'))
+
+    @override_settings(PASSWORD_HASHING_WORKERS=1, QUERY_BUDGET_MODE='raise')
+    def test_pool_should_success(self):
+        self.addCleanup(pool.shutdown)
+        self.use_pbkdf2()
+        self.assertEqual(self.login().status_code, 200)
+        self.assertEqual(self.login('wrongPass1').status_code, 401)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('scrypt$'))
+        # the children of the forkserver
+        self.assertNotEqual(pool.submit(os.getppid), os.getpid())
+
+    @override_settings(PASSWORD_HASHING_WORKERS=1,
+                       PASSWORD_HASHING_MAX_PENDING=0)
+    def test_login_over_pending_should_fail(self):
+        self.addCleanup(pool.shutdown)
+        response = self.login()
+        self.assertEqual(response.status_code, 503)
+
+    def test_gunicorn_should_run_threads_with_the_pool(self):
+        with mock.patch.dict(os.environ, {'PASSWORD_HASHING_WORKERS': '2'}):
+            config = runpy.run_path(GUNICORN_CONFIG)
+        self.assertEqual(config['worker_class'], 'gthread')
+        self.assertGreater(config['threads'], 1)
+        with mock.patch.dict(os.environ, {'PASSWORD_HASHING_WORKERS': '0'}):
+            self.assertNotIn('worker_class',
+                             runpy.run_path(GUNICORN_CONFIG))
@@ -1,6 +1,7 @@
 from rest_framework.test import APITestCase
-from apps.common.test import create_sample_user_and_get_token
+from apps.common.test import assert_query_budget, create_sample_user_and_get_token
 from apps.user.models import UserRole, User
+from apps.user.views import TokenObtainPairWithClaimsView, TokenRefreshWithClaimsView
 
 
 class TestUserRegistration(APITestCase):
@@ -180,3 +181,43 @@ class TestRetrieveUserProfile(APITestCase):
     def test_retrieve_profile_should_fail_when_not_authenticated(self):
         response = self.client.get(self.ENDPOINT, )
         self.assertEqual(response.status_code, 401)
+
+
+class TestTokenQueryBudget(APITestCase):
+    TOKEN_ENDPOINT = '/api/token'
+    """
+    Test the queries of issuing and refreshing the tokens
+
+    the queries should:
+    1. be within the budgets of the token views
+    2. not grow with the users
+    """
+    def setUp(self):
+        self.user, _ = create_sample_user_and_get_token(
+            self.client, '01012341234')
+
+    def populate(self, size: int):
+        # the others can't log in, so they are not hashed
+        User.objects.bulk_create(
+            User(phone_number=f'0109999{i:04}',
+                 name='홍길동',
+                 password='!',
+                 role=UserRole.CLIENT)
+            for i in range(User.objects.count(), size))
+
+    def obtain(self):
+        return self.client.post(self.TOKEN_ENDPOINT, {
+            'phone_number': '01012341234',
+            'password': 'thePas123Q',
+        })
+
+    def test_obtain_should_be_within_budget(self):
+        assert_query_budget(self, TokenObtainPairWithClaimsView, None,
+                            self.populate, self.obtain)
+
+    def test_refresh_should_be_within_budget(self):
+        refresh = self.obtain().data['refresh']
+        assert_query_budget(
+            self, TokenRefreshWithClaimsView, None, self.populate,
+            lambda: self.client.post(f'{self.TOKEN_ENDPOINT}/refresh',
+                                     {'refresh': refresh}))
@@ -2,21 +2,40 @@ from django.http.request import HttpRequest
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from apps.common.mixins import ConditionalGetMixin
+from apps.common.throttling import IPThrottle, PhoneNumberThrottle
+from apps.user.cache import get_cached_user
 from apps.user.models import User
-from apps.user.serializers import UserSerializer
+from apps.user.serializers import UserSerializer, TokenObtainPairWithClaimsSerializer, TokenRefreshWithClaimsSerializer
 
 
-class UserView(viewsets.GenericViewSet):
+class UserView(ConditionalGetMixin, viewsets.GenericViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
+    query_budgets = {
+        'list': 1,  # on a miss of the user cache
+        'register': 2,
+    }
+    throttle_scope = 'register'
 
     def get_permissions(self):
         if self.action == 'register':
             return (permissions.AllowAny(), )
         return (permissions.IsAuthenticated(), )
 
+    def get_throttles(self):
+        if self.action == 'register':
+            return (IPThrottle(), PhoneNumberThrottle())
+        return ()
+
     def list(self, request: HttpRequest):  # retrieve requested user's profile
-        user: User = request.user
+        # request.user may hold only the fields from the token claims
+        user: User = get_cached_user(request.user.pk)
+        response = self.get_not_modified_response(
+            request, self.get_object_validators(user))
+        if response is not None:
+            return response
         serializer = self.get_serializer(user)
         return Response(serializer.data)
 
@@ -25,4 +44,18 @@ class UserView(viewsets.GenericViewSet):
         serializer: UserSerializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         serializer.save()
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
\ No newline at end of file
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class TokenObtainPairWithClaimsView(TokenObtainPairView):
+    serializer_class = TokenObtainPairWithClaimsSerializer
+    query_budget = 2  # the user, and the update of an old hash rehashed by apps.user.hashers
+    throttle_classes = (IPThrottle, PhoneNumberThrottle)
+    throttle_scope = 'login'
+
+
+class TokenRefreshWithClaimsView(TokenRefreshView):
+    serializer_class = TokenRefreshWithClaimsSerializer
+    query_budget = 1
+    throttle_classes = (IPThrottle, )
+    throttle_scope = 'refresh'
@@ -0,0 +1,66 @@
+"""
+benchmarks of the hot paths, run from the repository root like:
+    python -m benchmarks.nearby --count 100000
+
+the database of DJANGO_SETTINGS_MODULE is never touched,
+a test database is created for the run and destroyed afterwards.
+"""
+import contextlib
+import os
+import statistics
+import time
+import typing
+
+
+def setup():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'pangpangeats.settings')
+    import django
+    django.setup()
+
+
+def setup_test_environment():
+    """
+    like the one of django, with the rate limits off as the walks log in many clients from the same address
+    """
+    from django.conf import settings
+    from django.test.utils import setup_test_environment
+    setup_test_environment()
+    settings.RATE_LIMIT_ENABLED = False
+
+
+@contextlib.contextmanager
+def test_database(verbosity: int = 0):
+    from django.test.utils import setup_databases, teardown_databases
+    old_config = setup_databases(verbosity=verbosity, interactive=False)
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity=verbosity)
+
+
+class Timing(typing.NamedTuple):
+    median: float  # milliseconds
+    p95: float
+    maximum: float
+
+    def __str__(self):
+        return f'median {self.median:8.2f}ms  p95 {self.p95:8.2f}ms  max {self.maximum:8.2f}ms'
+
+
+def percentile(values: typing.Sequence[float], fraction: float) -> float:
+    """
+    the nearest rank percentile of the sorted values
+    """
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def measure(function: typing.Callable[[], typing.Any],
+            repeat: int) -> Timing:
+    elapsed = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        function()
+        elapsed.append((time.perf_counter() - started_at) * 1000)
+    elapsed.sort()
+    return Timing(statistics.median(elapsed), percentile(elapsed, 0.95),
+                  elapsed[-1])
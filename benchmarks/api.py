@@ -0,0 +1,431 @@
+"""
+the latency of the endpoints of api/urls.py over a seeded dataset
+
+    python -m benchmarks.api --iterations 200 --output before.json
+    python -m benchmarks.api --iterations 200 --output after.json --compare before.json
+
+each iteration walks through the endpoints like a client and the store owner of its restaurant do:
+the tokens, the profile, the credit cards, the restaurants, the cart, the orders and the sales.
+every request is timed, and the throughput, the p50/p95/p99 latencies and the queries per request
+of each endpoint are printed and saved as JSON with the commit.
+--compare flags the endpoints whose p95 grew by more than --threshold, or which run more queries,
+against the results of another run, and exits with 1 on any of them.
+
+in process, the dataset is seeded into a test database by the seed command,
+and the requests go through the whole middleware stack by django.test.Client.
+against a running server instead, seeded beforehand with the same counts on an empty database:
+
+    python manage.py seed --users 10000 --restaurants 1000 --menus 10 --orders 100000
+    RATE_LIMIT_ENABLED=false gunicorn pangpangeats.wsgi --workers 4 &
+    python -m benchmarks.api --url http://localhost:8000
+
+the queries are counted in process only. the throughput is of a single sequential client,
+an iteration mutates its own client and cards, so each iteration takes another seeded client.
+"""
+import argparse
+import contextlib
+import datetime
+import http.client
+import json
+import statistics
+import subprocess
+import time
+import typing
+from urllib.parse import urlencode, urlsplit
+from benchmarks import percentile, setup, setup_test_environment, test_database
+
+PASSWORD = 'thePas123Q'  # apps.common.seed.PASSWORD, without loading django against a server
+PREPARING = 3  # apps.order.models.OrderStatus.PREPARING
+CENTER = {'latitude': 37.5665, 'longitude': 126.9780}
+CARD = {
+    'owner_first_name': '길동',
+    'owner_last_name': '홍',
+    'alias': '벤치마크 카드',
+    'card_number': '4111111111111111',
+    'cvc': '123',
+    'expiry_year': datetime.date.today().year + 3,
+    'expiry_month': 12,
+}
+
+
+class Response(typing.NamedTuple):
+    status: int
+    data: typing.Any
+    queries: typing.Optional[int] = None
+
+
+class Sample(typing.NamedTuple):
+    elapsed: float  # milliseconds
+    ok: bool
+    queries: typing.Optional[int]
+
+
+class RequestFailed(Exception):
+    pass
+
+
+class InProcessClient:
+    def __init__(self, count_queries: bool = True):
+        from django.test import Client
+        self.client = Client()
+        self.count_queries = count_queries
+
+    def request(self, method: str, path: str, data: typing.Any,
+                token: typing.Optional[str]) -> Response:
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        extra = {'HTTP_AUTHORIZATION': f'Bearer {token}'} if token else {}
+        queries = CaptureQueriesContext(connection)
+        with queries if self.count_queries else contextlib.nullcontext():
+            response = self.client.generic(
+                method,
+                path,
+                json.dumps(data) if data is not None else '',
+                content_type='application/json',
+                **extra)
+        return Response(response.status_code, parse(response.content),
+                        len(queries) if self.count_queries else None)
+
+
+class HttpClient:
+    """
+    a keep-alive connection to the server, reopened when the server closes it
+    """
+    def __init__(self, url: str):
+        parts = urlsplit(url)
+        self.host = parts.netloc
+        self.prefix = parts.path.rstrip('/')
+        self.connection = http.client.HTTPConnection(self.host)
+
+    def request(self, method: str, path: str, data: typing.Any,
+                token: typing.Optional[str]) -> Response:
+        headers = {'Content-Type': 'application/json'}
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        body = json.dumps(data).encode() if data is not None else None
+        for retry in (False, True):
+            try:
+                self.connection.request(method, self.prefix + path, body,
+                                        headers)
+                response = self.connection.getresponse()
+                return Response(response.status, parse(response.read()))
+            except (http.client.RemoteDisconnected, ConnectionError):
+                self.connection.close()
+                if retry:
+                    raise
+
+
+def parse(content: bytes) -> typing.Any:
+    try:
+        return json.loads(content) if content else None
+    except ValueError:
+        return content[:200]
+
+
+class Session:
+    """
+    times the requests by the names of the endpoints
+    """
+    def __init__(self, client: typing.Union[InProcessClient, HttpClient]):
+        self.client = client
+        self.samples: typing.Dict[str, typing.List[Sample]] = {}
+        self.recording = True
+
+    def request(self,
+                name: str,
+                method: str,
+                path: str,
+                data: typing.Any = None,
+                token: str = None,
+                expected: int = 200) -> typing.Any:
+        started_at = time.perf_counter()
+        response = self.client.request(method, path, data, token)
+        elapsed = (time.perf_counter() - started_at) * 1000
+        if self.recording:
+            self.samples.setdefault(name, []).append(
+                Sample(elapsed, response.status == expected, response.queries))
+        if response.status != expected:
+            raise RequestFailed(
+                f'{name}: {method} {path} returned {response.status} {response.data}'
+            )
+        return response.data
+
+
+class Dataset(typing.NamedTuple):
+    """
+    the keys of the rows inserted by the seed command on an empty database
+    """
+    owners: range
+    clients: range
+    cards: range
+    restaurants: range
+    menus: range
+
+    @classmethod
+    def of(cls, users: int, restaurants: int, menus: int) -> 'Dataset':
+        owners = max(1, restaurants // 2)
+        return cls(owners=range(1, owners + 1),
+                   clients=range(owners + 1, owners + users + 1),
+                   cards=range(1, users + 1),
+                   restaurants=range(1, restaurants + 1),
+                   menus=range(1, restaurants * menus + 1))
+
+    def get_phone_number(self, user_id: int) -> str:
+        return f'010{user_id:08d}'
+
+
+def login(session: Session, phone_number: str) -> dict:
+    return session.request('token obtain', 'POST', '/api/token', {
+        'phone_number': phone_number,
+        'password': PASSWORD,
+    })
+
+
+def walk(session: Session, dataset: Dataset, index: int, owner_token: str):
+    """
+    an iteration of the endpoints by the client at the index, ordering from the first restaurant
+    """
+    card = dataset.cards[index]
+    restaurant = dataset.restaurants[0]
+    menu = dataset.menus[0]
+    tokens = login(session,
+                   dataset.get_phone_number(dataset.clients[index]))
+    session.request('token refresh', 'POST', '/api/token/refresh',
+                    {'refresh': tokens['refresh']})
+    token = tokens['access']
+    session.request('token verify', 'POST', '/api/token/verify',
+                    {'token': token})
+    session.request('users', 'GET', '/api/users', token=token)
+
+    session.request('credit-cards list', 'GET', '/api/credit-cards',
+                    token=token)
+    session.request('credit-cards retrieve', 'GET',
+                    f'/api/credit-cards/{card}', token=token)
+    session.request('credit-cards create',
+                    'POST',
+                    '/api/credit-cards',
+                    CARD,
+                    token=token,
+                    expected=201)
+    session.request('credit-cards update',
+                    'PATCH',
+                    f'/api/credit-cards/{card}', {'alias': f'카드 {index}'},
+                    token=token)
+
+    session.request('restaurants list', 'GET', '/api/restaurants')
+    session.request('restaurants retrieve', 'GET',
+                    f'/api/restaurants/{restaurant}')
+    session.request(
+        'restaurants nearby', 'GET',
+        '/api/restaurants/nearby?' + urlencode({
+            **CENTER, 'radius': 3000
+        }))
+
+    # 20 of any menu are over the minimum order costs of the seeded restaurants
+    session.request('cart update',
+                    'PUT',
+                    f'/api/cart/{menu}', {'amount': 20},
+                    token=token)
+    session.request('cart list', 'GET', '/api/cart', token=token)
+    paid = session.request('cart checkout',
+                           'POST',
+                           '/api/cart/checkout', {'credit_card': card},
+                           token=token,
+                           expected=201)
+    session.request('orders pay',
+                    'POST',
+                    f'/api/orders/{paid["id"]}/pay',
+                    token=token)
+    canceled = session.request('orders create',
+                               'POST',
+                               '/api/orders', {
+                                   'credit_card': card,
+                                   'selections': [{
+                                       'menu': menu,
+                                       'amount': 20
+                                   }]
+                               },
+                               token=token,
+                               expected=201)
+    session.request('orders cancel',
+                    'POST',
+                    f'/api/orders/{canceled["id"]}/cancel',
+                    token=token)
+    session.request('orders list', 'GET', '/api/orders', token=token)
+    session.request('orders retrieve',
+                    'GET',
+                    f'/api/orders/{paid["id"]}',
+                    token=token)
+
+    session.request('store-orders list',
+                    'GET',
+                    '/api/store-orders',
+                    token=owner_token)
+    session.request('store-orders status',
+                    'POST',
+                    f'/api/store-orders/{paid["id"]}/status',
+                    {'status': PREPARING},
+                    token=owner_token)
+    today = datetime.date.today()
+    session.request('sales',
+                    'GET',
+                    '/api/sales?' + urlencode({
+                        'restaurant': restaurant,
+                        'since': today - datetime.timedelta(days=30),
+                        'until': today,
+                    }),
+                    token=owner_token)
+
+    session.request('credit-cards destroy',
+                    'DELETE',
+                    f'/api/credit-cards/{card}',
+                    token=token,
+                    expected=204)
+
+
+def run(session: Session, dataset: Dataset, iterations: int,
+        warmup: int) -> int:
+    """
+    walks the iterations after the unrecorded warmup ones, returns the number of the failed iterations.
+    """
+    # the owner of the first restaurant, see apps.common.seed.Seeder.create_restaurants()
+    owner_token = login(session, dataset.get_phone_number(
+        dataset.owners[0]))['access']
+    failed = 0
+    for index in range(warmup + iterations):
+        session.recording = index >= warmup
+        try:
+            walk(session, dataset, index, owner_token)
+        except RequestFailed as error:
+            if not failed:
+                print(error)
+            failed += 1
+    return failed
+
+
+def summarize(samples: typing.List[Sample]) -> dict:
+    elapsed = sorted(sample.elapsed for sample in samples)
+    queries = [
+        sample.queries for sample in samples if sample.queries is not None
+    ]
+    return {
+        'requests': len(samples),
+        'errors': sum(not sample.ok for sample in samples),
+        'throughput': round(len(samples) / sum(elapsed) * 1000, 1),
+        'mean': round(statistics.mean(elapsed), 3),
+        'p50': round(percentile(elapsed, 0.50), 3),
+        'p95': round(percentile(elapsed, 0.95), 3),
+        'p99': round(percentile(elapsed, 0.99), 3),
+        'queries': round(statistics.mean(queries), 2) if queries else None,
+    }
+
+
+def compare(results: dict, baseline: dict,
+            threshold: float) -> typing.List[str]:
+    regressions = []
+    for name, current in results['endpoints'].items():
+        previous = baseline['endpoints'].get(name)
+        if previous is None:
+            continue
+        if current['p95'] > previous['p95'] * (1 + threshold):
+            regressions.append(
+                f'{name}: p95 {previous["p95"]:.2f}ms -> {current["p95"]:.2f}ms'
+            )
+        if None not in (current['queries'], previous['queries']
+                        ) and current['queries'] > previous['queries']:
+            regressions.append(
+                f'{name}: {previous["queries"]} -> {current["queries"]} queries'
+            )
+    return regressions
+
+
+def get_commit() -> typing.Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                              capture_output=True,
+                              text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results: dict):
+    print(f'{"endpoint":<24}{"requests":>9}{"errors":>7}{"req/s":>9}'
+          f'{"p50":>9}{"p95":>9}{"p99":>9}{"queries":>8}')
+    for name, result in results['endpoints'].items():
+        queries = '-' if result['queries'] is None else result['queries']
+        print(f'{name:<24}{result["requests"]:>9}{result["errors"]:>7}'
+              f'{result["throughput"]:>9}{result["p50"]:>9.2f}'
+              f'{result["p95"]:>9.2f}{result["p99"]:>9.2f}{queries:>8}')
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument('--url', help='the server to run against')
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--restaurants', type=int, default=1000)
+    parser.add_argument('--menus', type=int, default=10)
+    parser.add_argument('--orders',
+                        type=int,
+                        default=100000,
+                        help='seeded in process only')
+    parser.add_argument('--output', help='the file to save the results to')
+    parser.add_argument('--compare', help='the results of another run')
+    parser.add_argument('--threshold',
+                        type=float,
+                        default=0.2,
+                        help='the growth of p95 flagged by --compare')
+    args = parser.parse_args()
+    if args.warmup + args.iterations > args.users:
+        parser.exit(1, 'an iteration needs its own client, raise --users\n')
+
+    dataset = Dataset.of(args.users, args.restaurants, args.menus)
+    started_at = time.perf_counter()
+    if args.url is None:
+        setup()
+        from django.core.management import call_command
+        setup_test_environment()
+        with test_database():
+            call_command('seed',
+                         users=args.users,
+                         restaurants=args.restaurants,
+                         menus=args.menus,
+                         orders=args.orders)
+            started_at = time.perf_counter()
+            session = Session(InProcessClient())
+            failed = run(session, dataset, args.iterations, args.warmup)
+    else:
+        session = Session(HttpClient(args.url))
+        failed = run(session, dataset, args.iterations, args.warmup)
+    print(f'{args.iterations} iterations in '
+          f'{time.perf_counter() - started_at:.1f}s, {failed} failed')
+
+    results = {
+        'commit': get_commit(),
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'target': args.url or 'in-process',
+        'options': vars(args),
+        'endpoints': {
+            name: summarize(samples)
+            for name, samples in session.samples.items()
+        },
+    }
+    print_results(results)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, ensure_ascii=False, indent=2)
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        for regression in regressions:
+            print('regression', regression)
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""
+the delivery distances and estimates computed with numpy against the python fallback
+
+    python -m benchmarks.delivery --repeat 20
+"""
+import argparse
+import random
+from benchmarks import measure, setup
+
+SIZES = (20, 100, 1000, 10000, 100000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup()
+    from apps.common.geohash import haversine_many, numpy
+    from apps.restaurant.delivery import estimate_many
+
+    if numpy is None:
+        parser.exit(1, 'numpy is not installed\n')
+    random.seed(0)
+    for size in SIZES:
+        latitudes = [random.uniform(37.42, 37.70) for _ in range(size)]
+        longitudes = [random.uniform(126.76, 127.18) for _ in range(size)]
+        costs = [random.choice((0, 1000, 3000)) for _ in range(size)]
+
+        def run(use_numpy: bool):
+            distances = haversine_many(37.5665,
+                                       126.9780,
+                                       latitudes,
+                                       longitudes,
+                                       use_numpy=use_numpy)
+            return estimate_many(distances, costs, use_numpy=use_numpy)
+
+        print(f'{size} restaurants')
+        print('  numpy ', measure(lambda: run(True), args.repeat))
+        print('  python', measure(lambda: run(False), args.repeat))
+
+
+if __name__ == '__main__':
+    main()
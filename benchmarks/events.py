@@ -0,0 +1,165 @@
+"""
+the idle event streams held by a single ASGI process
+
+    python -m benchmarks.events --streams 5000
+
+opens the streams on pangpangeats.asgi in process, measures their memory,
+then publishes an event to each of them from another thread, like the WSGI workers do, and measures the delivery.
+the database is not touched, the streams are authenticated by the claims of the tokens.
+
+against a running server, for the sockets and the proxies too:
+
+    uvicorn pangpangeats.asgi:application --port 8001 &
+    python -m benchmarks.events --streams 5000 --url http://localhost:8001/api/events --token <access token>
+
+the streams are held for --hold seconds and the ones still open are counted, raise `ulimit -n` beforehand.
+"""
+import argparse
+import asyncio
+import threading
+import time
+import tracemalloc
+import typing
+from urllib.parse import urlsplit
+from benchmarks import setup
+
+
+class Client:
+    """
+    the in-memory ends of a stream
+    """
+    def __init__(self):
+        self.requests: asyncio.Queue = asyncio.Queue()
+        self.requests.put_nowait({'type': 'http.request'})
+        self.started = asyncio.Event()
+        self.received = asyncio.Event()
+        self.status = None
+
+    async def receive(self) -> dict:
+        return await self.requests.get()
+
+    async def send(self, message: dict):
+        if message['type'] == 'http.response.start':
+            self.status = message['status']
+        elif message['body'].startswith(b'event: '):
+            self.received.set()
+        elif message['body'].startswith(b'retry: '):
+            self.started.set()
+
+    def disconnect(self):
+        self.requests.put_nowait({'type': 'http.disconnect'})
+
+
+def get_token(user_id: int) -> str:
+    from rest_framework_simplejwt.tokens import AccessToken
+    from apps.user.models import UserRole
+    token = AccessToken()
+    token['user_id'] = user_id
+    token.payload.update(role=UserRole.CLIENT,
+                         is_active=True,
+                         is_verified=True)
+    return str(token)
+
+
+async def hold_in_process(streams: int):
+    from apps.common.pubsub import Event, get_broker
+    from apps.order.events import user_channel
+    from pangpangeats.asgi import application
+
+    tokens = [get_token(user_id) for user_id in range(1, streams + 1)]
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    started_at = time.perf_counter()
+    clients, tasks = [], []
+    for token in tokens:
+        client = Client()
+        scope = {
+            'type': 'http',
+            'method': 'GET',
+            'path': '/api/events',
+            'query_string': b'',
+            'headers': [(b'authorization', f'Bearer {token}'.encode())],
+        }
+        tasks.append(
+            asyncio.ensure_future(
+                application(scope, client.receive, client.send)))
+        clients.append(client)
+    await asyncio.gather(*(client.started.wait() for client in clients))
+    opened = time.perf_counter() - started_at
+    memory = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    rejected = sum(client.status != 200 for client in clients)
+    if rejected:
+        raise SystemExit(f'{rejected} streams were rejected')
+    print(f'{streams} streams opened in {opened:.2f}s, '
+          f'{memory / streams / 1024:.1f}KiB per idle stream')
+
+    def publish():
+        broker = get_broker()
+        for user_id in range(1, streams + 1):
+            broker.publish(user_channel(user_id), Event('order.status', '{}'))
+
+    started_at = time.perf_counter()
+    threading.Thread(target=publish).start()
+    await asyncio.gather(*(client.received.wait() for client in clients))
+    print(f'an event to each stream delivered in '
+          f'{(time.perf_counter() - started_at) * 1000:.1f}ms')
+
+    for client in clients:
+        client.disconnect()
+    await asyncio.gather(*tasks)
+
+
+async def open_stream(url: str, token: str) -> typing.Optional[tuple]:
+    parts = urlsplit(url)
+    try:
+        reader, writer = await asyncio.open_connection(parts.hostname,
+                                                       parts.port or 80)
+    except OSError:
+        return None
+    writer.write(f'GET {parts.path} HTTP/1.1\r\n'
+                 f'Host: {parts.netloc}\r\n'
+                 f'Authorization: Bearer {token}\r\n'
+                 'Accept: text/event-stream\r\n\r\n'.encode())
+    status = await reader.readline()
+    if b' 200 ' not in status:
+        writer.close()
+        return None
+    return reader, writer
+
+
+async def hold_over_network(streams: int, url: str, token: str, hold: float):
+    started_at = time.perf_counter()
+    opened = await asyncio.gather(*(open_stream(url, token)
+                                    for _ in range(streams)))
+    opened = [stream for stream in opened if stream is not None]
+    print(f'{len(opened)}/{streams} streams opened in '
+          f'{time.perf_counter() - started_at:.2f}s')
+    await asyncio.sleep(hold)
+    alive = sum(not reader.at_eof() for reader, _ in opened)
+    print(f'{alive} streams alive after {hold:.0f}s')
+    for _, writer in opened:
+        writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument('--streams', type=int, default=5000)
+    parser.add_argument('--url')
+    parser.add_argument('--token')
+    parser.add_argument('--hold', type=float, default=60)
+    args = parser.parse_args()
+
+    if args.url is None:
+        setup()
+        asyncio.run(hold_in_process(args.streams))
+    elif args.token is None:
+        parser.exit(1, '--token is required with --url\n')
+    else:
+        asyncio.run(
+            hold_over_network(args.streams, args.url, args.token, args.hold))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+the streaming export of the orders over a synthetic month
+
+    python -m benchmarks.export --count 1000000
+
+the orders are spread over DAYS days, and the export of a single day is compared with the export of all of them,
+so the peak memory should stay the same while the rows grow by DAYS times.
+the peak is of the python allocations, traced by tracemalloc.
+"""
+import argparse
+import datetime
+import random
+import time
+import tracemalloc
+from benchmarks import setup, test_database
+
+DAYS = 10
+FIRST_DAY = datetime.date(2026, 3, 1)
+
+
+def create_orders(count: int, batch_size: int = 10000):
+    from apps.common.test import create_sample_restaurant
+    from apps.order.models import Order, OrderStatus, Selection
+    from apps.sales.rollups import get_day_range
+    from apps.user.models import User, UserRole
+
+    owner = User.objects.create_user(phone_number='01000000000',
+                                     name='사장님',
+                                     password='thePas123Q',
+                                     role=UserRole.STORE_OWNER)
+    restaurant = create_sample_restaurant(owner)
+    menus = list(restaurant.menuinformation_set.all())
+    start, end = get_day_range(FIRST_DAY,
+                               FIRST_DAY + datetime.timedelta(days=DAYS - 1))
+    step = (end - start) / count
+    random.seed(0)
+    for first in range(1, count + 1, batch_size):
+        pks = range(first, min(first + batch_size, count + 1))
+        Order.objects.bulk_create(
+            Order(pk=pk,
+                  orderer=owner,
+                  restaurant=restaurant,
+                  total_cost=22000,
+                  status=OrderStatus.PAID,
+                  created=start + step * (pk - 1)) for pk in pks)
+        Selection.objects.bulk_create(
+            Selection(pk=pk * 2 - index,
+                      orderer=owner,
+                      menu=menu,
+                      amount=random.randint(1, 3),
+                      request='',
+                      unit_price=menu.price,
+                      menu_name=menu.name,
+                      restaurant_name=restaurant.name) for pk in pks
+            for index, menu in enumerate(menus))
+        Order.selections.through.objects.bulk_create(
+            Order.selections.through(order_id=pk, selection_id=pk * 2 - index)
+            for pk in pks for index in range(len(menus)))
+
+
+def run(since: datetime.date, until: datetime.date, output: str,
+        compress: bool) -> str:
+    from apps.sales.export import export, get_orders
+
+    tracemalloc.start()
+    started_at = time.perf_counter()
+    size = 0
+    for block in export(get_orders(since, until), output, compress):
+        size += len(block)
+    elapsed = time.perf_counter() - started_at
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return (f'{elapsed:7.2f}s  {size / 2**20:8.1f}MiB written  '
+            f'peak {peak / 2**20:6.1f}MiB')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=1000000)
+    args = parser.parse_args()
+
+    setup()
+    with test_database():
+        create_orders(args.count)
+        last_day = FIRST_DAY + datetime.timedelta(days=DAYS - 1)
+        for output, compress in (('csv', False), ('ndjson', False),
+                                 ('csv', True)):
+            name = output + (' gzip' if compress else '')
+            for until in (FIRST_DAY, last_day):
+                days = (until - FIRST_DAY).days + 1
+                print(f'{name:<10} {days:2} days',
+                      run(FIRST_DAY, until, output, compress))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+the logins a second on a core by the password hashers, in the request worker and in the hashing pool
+
+    python -m benchmarks.hashers --seconds 5 --workers 2
+
+a login is counted as the verification of its password by User.check_password, which takes the most of /api/token.
+in the request worker a single thread verifies the passwords,
+in the pool --workers x 4 threads wait for the pool of --workers processes, so the rate is divided by the workers.
+argon2 is skipped without argon2-cffi.
+"""
+import argparse
+import os
+import threading
+import time
+from benchmarks import setup
+
+HASHERS = ('pbkdf2', 'scrypt', 'argon2')
+
+
+def get_rate(check, seconds: float, threads: int) -> float:
+    deadline = time.perf_counter() + seconds
+    counts = [0] * threads
+
+    def run(index: int):
+        while time.perf_counter() < deadline:
+            assert check()
+            counts[index] += 1
+
+    started_at = time.perf_counter()
+    runners = [
+        threading.Thread(target=run, args=(index, ))
+        for index in range(threads)
+    ]
+    for runner in runners:
+        runner.start()
+    for runner in runners:
+        runner.join()
+    return sum(counts) / (time.perf_counter() - started_at)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    setup()
+    from django.conf import settings
+    from django.test import override_settings
+    from apps.user.hashers import pool
+    from apps.user.models import User
+
+    for name in HASHERS:
+        hasher = settings.PASSWORD_HASHER_CLASSES[name]
+        with override_settings(PASSWORD_HASHERS=[hasher],
+                               PASSWORD_HASHING_WORKERS=0):
+            user = User(phone_number='01012341234')
+            try:
+                user.set_password('thePas123Q')
+            except ValueError as error:  # the library of the hasher is missing
+                print(f'{name:7}skipped, {error}')
+                continue
+            check = lambda: user.check_password('thePas123Q')  # noqa: E731
+            inline = get_rate(check, args.seconds, 1)
+        with override_settings(PASSWORD_HASHERS=[hasher],
+                               PASSWORD_HASHING_WORKERS=args.workers,
+                               PASSWORD_HASHING_MAX_PENDING=args.workers * 4):
+            try:
+                check()  # starts the pool
+                pooled = get_rate(check, args.seconds,
+                                  args.workers * 4) / args.workers
+            finally:
+                pool.shutdown()
+        print(f'{name:7}{inline:8.1f} logins/s/core in the request worker, '
+              f'{pooled:8.1f} in the pool')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+the overhead of the metrics of apps.common.metrics on the requests
+
+    python -m benchmarks.metrics --rounds 100
+
+walks the endpoints of benchmarks.api over a seeded test database in process,
+alternating the walks with MetricsMiddleware on and off, and compares the median time of a walk.
+the token obtain is left out of the walks, its password hashing would hide the overhead.
+exits with 1 when the overhead is --max-overhead or more.
+"""
+import argparse
+import io
+import statistics
+from benchmarks import setup, setup_test_environment, test_database
+from benchmarks.api import Dataset, InProcessClient, Session, login, walk
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rounds', type=int, default=100)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--restaurants', type=int, default=100)
+    parser.add_argument('--orders', type=int, default=10000)
+    parser.add_argument('--max-overhead', type=float, default=0.02)
+    args = parser.parse_args()
+
+    setup()
+    from django.core.management import call_command
+    from django.test import override_settings
+    setup_test_environment()
+
+    # a walk takes its own client
+    users = (args.warmup + args.rounds) * 2
+    dataset = Dataset.of(users, args.restaurants, 10)
+    with test_database():
+        call_command('seed',
+                     users=users,
+                     restaurants=args.restaurants,
+                     menus=10,
+                     orders=args.orders,
+                     stdout=io.StringIO())
+        owner_token = login(Session(InProcessClient()),
+                            dataset.get_phone_number(
+                                dataset.owners[0]))['access']
+        walks = {False: [], True: []}
+        index = 0
+        for round_ in range(args.warmup + args.rounds):
+            # the order alternates too, against the drift of the later walks
+            for enabled in ((False, True) if round_ % 2 else (True, False)):
+                with override_settings(METRICS_ENABLED=enabled):
+                    session = Session(InProcessClient(count_queries=False))
+                    walk(session, dataset, index, owner_token)
+                index += 1
+                if round_ >= args.warmup:
+                    walks[enabled].append(
+                        sum(sample.elapsed
+                            for name, samples in session.samples.items()
+                            if name != 'token obtain' for sample in samples))
+        requests = sum(
+            len(samples) for name, samples in session.samples.items()
+            if name != 'token obtain')
+
+    off, on = statistics.median(walks[False]), statistics.median(walks[True])
+    overhead = (on - off) / off
+    print(f'a walk of {requests} requests: {off:.2f}ms without the metrics, '
+          f'{on:.2f}ms with them')
+    print(f'overhead {overhead * 100:+.2f}%, '
+          f'{(on - off) / requests * 1000:+.1f}us per request')
+    if overhead >= args.max_overhead:
+        raise SystemExit(
+            f'the overhead is over {args.max_overhead * 100:.0f}%')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+the nearby restaurant search with the geohash cells against the full scan
+
+    python -m benchmarks.nearby --count 100000 --repeat 20
+"""
+import argparse
+import random
+from benchmarks import measure, setup, test_database
+
+# around Seoul
+LATITUDES = (37.42, 37.70)
+LONGITUDES = (126.76, 127.18)
+RADIUSES = (500, 1000, 3000, 5000)
+
+
+def create_restaurants(count: int, batch_size: int = 5000):
+    from apps.common.geohash import encode
+    from apps.restaurant.models import BusinessInformation, Location, Restaurant
+    from apps.user.models import User, UserRole
+
+    owner = User.objects.create_user(phone_number='01000000000',
+                                     name='사장님',
+                                     password='thePas123Q',
+                                     role=UserRole.STORE_OWNER)
+    random.seed(0)
+    for start in range(1, count + 1, batch_size):
+        pks = range(start, min(start + batch_size, count + 1))
+        locations = []
+        for pk in pks:
+            latitude = random.uniform(*LATITUDES)
+            longitude = random.uniform(*LONGITUDES)
+            # bulk_create() skips Location.save(), so the geohash is set here
+            locations.append(
+                Location(pk=pk,
+                         address=f'주소 {pk}',
+                         latitude=latitude,
+                         longitude=longitude,
+                         geohash=encode(latitude, longitude,
+                                        Location.GEOHASH_PRECISION)))
+        Location.objects.bulk_create(locations)
+        BusinessInformation.objects.bulk_create(
+            BusinessInformation(pk=pk,
+                                owner_name='홍길동',
+                                business_name=f'식당 {pk}',
+                                business_registration_number='1234567890')
+            for pk in pks)
+        Restaurant.objects.bulk_create(
+            Restaurant(pk=pk,
+                       owner=owner,
+                       name=f'식당 {pk}',
+                       picture='restaurant_pictures/sample.jpg',
+                       minimum_order_cost=15000,
+                       minimum_delivery_cost=3000,
+                       telephone_number='0212341234',
+                       description='',
+                       notice='',
+                       origin_information='',
+                       nuturition_facts='',
+                       allergens_facts='',
+                       location_id=pk,
+                       business_information_id=pk) for pk in pks)
+
+
+def full_scan(latitude: float, longitude: float, radius: float) -> list:
+    from apps.common.geohash import haversine
+    from apps.restaurant.models import Restaurant
+
+    nearby = []
+    for restaurant_id, restaurant_latitude, restaurant_longitude in Restaurant.objects.values_list(
+            'id', 'location__latitude', 'location__longitude'):
+        distance = haversine(latitude, longitude, restaurant_latitude,
+                             restaurant_longitude)
+        if distance <= radius:
+            nearby.append((distance, restaurant_id))
+    nearby.sort()
+    return nearby
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--skip-full-scan', action='store_true')
+    args = parser.parse_args()
+
+    setup()
+    from apps.restaurant.nearby import find_nearby, get_candidates
+    from apps.restaurant.models import Restaurant
+
+    with test_database():
+        print(f'creating {args.count} restaurants')
+        create_restaurants(args.count)
+        random.seed(1)
+        centers = [(random.uniform(*LATITUDES), random.uniform(*LONGITUDES))
+                   for _ in range(args.repeat)]
+        for radius in RADIUSES:
+            points = iter(centers * 2)
+            found = [
+                len(find_nearby(*center, radius))
+                for center in centers
+            ]
+            candidates = [
+                get_candidates(Restaurant.objects.all(), *center,
+                               radius).count() for center in centers
+            ]
+            print(f'radius {radius}m: {sum(found) / len(found):.0f} found '
+                  f'of {sum(candidates) / len(candidates):.0f} candidates')
+            print('  geohash  ',
+                  measure(lambda: find_nearby(*next(points), radius),
+                          args.repeat))
+            if not args.skip_full_scan:
+                print('  full scan',
+                      measure(lambda: full_scan(*next(points), radius),
+                              args.repeat))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+the overhead of the rate limits of apps.common.throttling on the allowed requests
+
+    python -m benchmarks.ratelimit --repeat 2000
+
+1. the time of taking a token from the buckets in the process and in the shared table, by distinct keys
+2. the median time of /api/token/refresh with the rate limits on and off, alternating,
+   the cheapest of the limited endpoints with no password hashing, so the overhead is the most visible.
+   the limits are raised so every request is allowed, and the buckets are in the shared table like on gunicorn.
+"""
+import argparse
+import statistics
+import time
+from benchmarks import measure, setup, setup_test_environment, test_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    setup()
+    from django.test import override_settings
+    from rest_framework.test import APIClient
+    from apps.common import buckets
+    from apps.user.models import User, UserRole
+    setup_test_environment()
+
+    for name, table in (('local', buckets.LocalBuckets()),
+                        ('shared', buckets.SharedBuckets(65536))):
+        keys = iter(range(args.repeat * 10))
+        timing = measure(
+            lambda: table.take(f'login_ip:{next(keys)}', 0.5, 30,
+                               time.monotonic()), args.repeat)
+        print(f'take a token {name:6} median {timing.median * 1000:.2f}us')
+
+    buckets.share()
+    with test_database():
+        User.objects.create_user(phone_number='01012341234',
+                                 name='홍길동',
+                                 password='thePas123Q',
+                                 role=UserRole.CLIENT)
+        client = APIClient()
+        refresh = client.post('/api/token', {
+            'phone_number': '01012341234',
+            'password': 'thePas123Q',
+        }).data['refresh']
+
+        def request():
+            response = client.post('/api/token/refresh', {'refresh': refresh})
+            assert response.status_code == 200, response.status_code
+
+        elapsed = {False: [], True: []}
+        for round_ in range(args.repeat):
+            for enabled in ((False, True) if round_ % 2 else (True, False)):
+                with override_settings(RATE_LIMIT_ENABLED=enabled,
+                                       RATE_LIMITS={'refresh_ip': '1000000/s'}):
+                    elapsed[enabled].append(measure(request, 1).median)
+
+    off, on = statistics.median(elapsed[False]), statistics.median(
+        elapsed[True])
+    print(f'/api/token/refresh median {off * 1000:.1f}us without the limits, '
+          f'{on * 1000:.1f}us with them, {(on - off) / off * 100:+.2f}%')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+the JSON renderer and parser of apps.common by orjson against the stdlib json of rest_framework
+
+    python -m benchmarks.renderers --repeat 200
+
+the payloads are the restaurant documents of RestaurantDetailSerializer with 10 to 500 menus named in Korean,
+and a page of 20 restaurants of RestaurantSerializer, serialized once from a test database.
+the rendering is timed from the serialized data, the parsing from the rendered bytes.
+"""
+import argparse
+import io
+from benchmarks import measure, setup, test_database
+
+MENUS = (10, 50, 200, 500)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    setup()
+    from rest_framework import parsers, renderers
+    from apps.common.parsers import JSONParser
+    from apps.common.renderers import JSONRenderer, orjson
+    from apps.common.test import create_sample_restaurant
+    from apps.restaurant.models import MenuInformation
+    from apps.restaurant.serializers import RestaurantDetailSerializer, RestaurantSerializer
+    from apps.user.models import User, UserRole
+
+    if orjson is None:
+        parser.exit(1, 'orjson is not installed\n')
+    with test_database():
+        owner = User.objects.create_user(phone_number='01000000000',
+                                         name='사장님',
+                                         password='thePas123Q',
+                                         role=UserRole.STORE_OWNER)
+        payloads = []
+        for menus in MENUS:
+            restaurant = create_sample_restaurant(owner,
+                                                  name=f'팡팡치킨{menus}',
+                                                  menu_prices=())
+            MenuInformation.objects.bulk_create(
+                MenuInformation(restaurant=restaurant,
+                                name=f'바삭한 후라이드 치킨 {i}',
+                                description='국내산 닭고기를 매일 아침 손질해 두 번 튀겨 낸 치킨',
+                                picture='menu_pictures/sample.jpg',
+                                price=18000 + i * 500) for i in range(menus))
+            payloads.append((f'detail of {menus} menus',
+                             RestaurantDetailSerializer(restaurant).data))
+        for i in range(20 - len(MENUS)):
+            create_sample_restaurant(owner, name=f'팡팡피자{i}')
+        payloads.append(
+            ('page of 20 restaurants',
+             RestaurantSerializer(owner.restaurant_set.all()[:20],
+                                  many=True).data))
+
+    for name, data in payloads:
+        rendered = renderers.JSONRenderer().render(data)
+        assert JSONRenderer().render(data) == rendered
+        print(f'{name}, {len(rendered)} bytes')
+        print('  render stdlib',
+              measure(lambda: renderers.JSONRenderer().render(data),
+                      args.repeat))
+        print('  render orjson',
+              measure(lambda: JSONRenderer().render(data), args.repeat))
+        print(
+            '  parse  stdlib',
+            measure(lambda: parsers.JSONParser().parse(io.BytesIO(rendered)),
+                    args.repeat))
+        print('  parse  orjson',
+              measure(lambda: JSONParser().parse(io.BytesIO(rendered)),
+                      args.repeat))
+
+
+if __name__ == '__main__':
+    main()
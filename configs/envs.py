@@ -1,4 +1,5 @@
-from os import environ
+import tempfile
+from os import environ, path
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -12,4 +13,40 @@ DB_HOST = environ.get("POSTGRES_HOST", "localhost")
 DB_PORT = environ.get("POSTGRES_PORT", "5432")
 DB_NAME = environ.get("POSTGRES_DB", "postgres")
 DB_USER = environ.get("POSTGRES_USER", "postgres")
-DB_PASSWORD = environ.get("POSTGRES_PASSWORD", "postgres")
\ No newline at end of file
+DB_PASSWORD = environ.get("POSTGRES_PASSWORD", "postgres")
+
+# keep the connections in a per-process pool (apps.common.db.backends.postgresql_pool)
+DB_POOL_ENABLED = environ.get("POSTGRES_POOL_ENABLED", "true") == "true"
+DB_POOL_MAX_SIZE = int(environ.get("POSTGRES_POOL_MAX_SIZE", "4"))
+# lifetime of the persistent connections when the pool is disabled
+DB_CONN_MAX_AGE = int(environ.get("POSTGRES_CONN_MAX_AGE", "60"))
+
+# the shared cache, like "django.core.cache.backends.memcached.PyMemcacheCache" with "memcached:11211"
+CACHE_BACKEND = environ.get("CACHE_BACKEND",
+                            "django.core.cache.backends.locmem.LocMemCache")
+CACHE_LOCATION = environ.get("CACHE_LOCATION", "")
+
+# the broker of the events pushed to the clients, "apps.common.pubsub.PostgresBroker" across the processes
+EVENT_BROKER = environ.get("EVENT_BROKER", "apps.common.pubsub.LocalBroker")
+
+# the requests over the query budgets of their views are "log"ged or "raise"d, not checked when empty
+QUERY_BUDGET_MODE = environ.get("QUERY_BUDGET_MODE", "")
+
+# the metrics of the requests at /metrics, shared by the gunicorn workers through PROMETHEUS_MULTIPROC_DIR
+METRICS_ENABLED = environ.get("METRICS_ENABLED", "true") == "true"
+
+# the breakdown of the time of each request in the Server-Timing header
+SERVER_TIMING_ENABLED = environ.get("SERVER_TIMING_ENABLED", "true") == "true"
+
+# the profiles of the requests of the staff with the X-Profile header, shared by the workers in the same directory
+PROFILE_DIR = environ.get("PROFILE_DIR",
+                          path.join(tempfile.gettempdir(), "profiles"))
+
+# the hasher of the new passwords, "scrypt", "argon2" (needs argon2-cffi) or "pbkdf2"
+PASSWORD_HASHER = environ.get("PASSWORD_HASHER", "scrypt")
+# the processes hashing the passwords off the request workers in each worker, 0 to hash in the request workers.
+# configs/gunicorn.py runs the gthread workers of GUNICORN_THREADS threads then
+PASSWORD_HASHING_WORKERS = int(environ.get("PASSWORD_HASHING_WORKERS", "0"))
+
+# the rate limits of the login, the registration and the token refresh, shared by the gunicorn workers
+RATE_LIMIT_ENABLED = environ.get("RATE_LIMIT_ENABLED", "true") == "true"
@@ -0,0 +1,32 @@
+"""
+the settings of gunicorn, like:
+    gunicorn -c configs/gunicorn.py pangpangeats.wsgi:application --bind 0.0.0.0:8000
+
+with PROMETHEUS_MULTIPROC_DIR set, the workers share the metrics of apps.common.metrics through the files of the directory,
+which is emptied when gunicorn starts, and the files of the dead workers are marked to drop their gauges.
+the token buckets of the rate limits are shared by the workers in the memory mapped by the master before the forks.
+with PASSWORD_HASHING_WORKERS set, the workers are gthread workers of GUNICORN_THREADS threads,
+so the other threads serve the other requests while a thread waits for the password hashing pool of apps.user.hashers.
+"""
+import os
+import shutil
+
+if int(os.environ.get('PASSWORD_HASHING_WORKERS', '0')):
+    worker_class = 'gthread'
+    threads = int(os.environ.get('GUNICORN_THREADS', '8'))
+
+
+def on_starting(server):
+    from apps.common import buckets
+    buckets.share()
+
+    directory = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if directory:
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory)
+
+
+def child_exit(server, worker):
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -1,2 +1,2 @@
 python3 manage.py migrate;\
-gunicorn pangpangeats.wsgi:application --bind 0.0.0.0:8000
\ No newline at end of file
+gunicorn -c configs/gunicorn.py pangpangeats.wsgi:application --bind 0.0.0.0:8000
\ No newline at end of file
@@ -3,6 +3,9 @@ ASGI config for pangpangeats project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+the event streams (apps.order.events) are served by this application only,
+the other paths are passed to django.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/3.1/howto/deployment/asgi/
 """
@@ -13,4 +16,17 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'pangpangeats.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from apps.order import events  # noqa: E402, the apps should be loaded first
+
+STREAMS = {
+    '/api/events': events.stream,
+}
+
+
+async def application(scope, receive, send):
+    stream = STREAMS.get(scope.get('path')) if scope['type'] == 'http' else None
+    if stream is None:
+        return await django_application(scope, receive, send)
+    return await stream(scope, receive, send)
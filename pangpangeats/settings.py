@@ -43,13 +43,18 @@ INSTALLED_APPS = [
     'model_utils',
     'safedelete',
     # my apps
+    'apps.common',
     'apps.user',
     'apps.credit_card',
     'apps.restaurant',
     'apps.order',
+    'apps.sales',
 ]
 
 MIDDLEWARE = [
+    'apps.common.metrics.MetricsMiddleware',  # first, to time the whole stack
+    'apps.common.profiling.ProfilingMiddleware',
+    'apps.common.timing.TimingMiddleware',  # the timings read by the metrics
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -57,6 +62,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'apps.common.budget.QueryBudgetMiddleware',
 ]
 
 ROOT_URLCONF = 'pangpangeats.urls'
@@ -79,6 +85,8 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'pangpangeats.wsgi.application'
 
+TEST_RUNNER = 'apps.common.test.TestRunner'
+
 # Database
 # https://docs.djangoproject.com/en/3.1/ref/settings/#databases
 
@@ -90,9 +98,49 @@ DATABASES = {
         'NAME': envs.DB_NAME,
         'USER': envs.DB_USER,
         'PASSWORD': envs.DB_PASSWORD,
+        'CONN_MAX_AGE': envs.DB_CONN_MAX_AGE,
+    }
+}
+
+if envs.DB_POOL_ENABLED:
+    # connections are returned to the pool at the end of every request, instead of being persisted by django
+    DATABASES['default'].update({
+        'ENGINE': 'apps.common.db.backends.postgresql_pool',
+        'CONN_MAX_AGE': 0,
+        'POOL': {
+            'MAX_SIZE': envs.DB_POOL_MAX_SIZE,
+            'MAX_LIFETIME': 600,  # seconds
+            'MAX_IDLE': 60,
+            'HEALTH_CHECK_INTERVAL': 10,
+            'TIMEOUT': 5,
+        },
+    })
+
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': envs.CACHE_BACKEND,
+        'LOCATION': envs.CACHE_LOCATION,
     }
 }
 
+# the new passwords are hashed by PASSWORD_HASHER, the others verify the old hashes rehashed on the next login,
+# see apps.user.hashers
+PASSWORD_HASHER_CLASSES = {
+    'scrypt': 'apps.user.hashers.ScryptPasswordHasher',
+    'argon2': 'apps.user.hashers.Argon2PasswordHasher',
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+}
+PASSWORD_HASHERS = [PASSWORD_HASHER_CLASSES[envs.PASSWORD_HASHER]] + [
+    hasher for hasher in (*PASSWORD_HASHER_CLASSES.values(),
+                          'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher')
+    if hasher != PASSWORD_HASHER_CLASSES[envs.PASSWORD_HASHER]
+]
+PASSWORD_HASHING_WORKERS = envs.PASSWORD_HASHING_WORKERS  # 0 to hash in the request workers
+PASSWORD_HASHING_MAX_PENDING = 4  # the threads of a gunicorn worker waiting for its pool, of GUNICORN_THREADS
+
 # Password validation
 # https://docs.djangoproject.com/en/3.1/ref/settings/#auth-password-validators
 
@@ -142,9 +190,107 @@ REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS':
     'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_AUTHENTICATION_CLASSES':
-    ('rest_framework_simplejwt.authentication.JWTAuthentication', )
+    ('apps.user.authentication.StatelessJWTAuthentication', ),
+    'DEFAULT_PAGINATION_CLASS':
+    'apps.common.pagination.KeysetPagination',
+    # by orjson when it is installed, see apps.common.renderers and apps.common.parsers
+    'DEFAULT_RENDERER_CLASSES': (
+        'apps.common.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'apps.common.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    'PAGE_SIZE':
+    20,
+    # X-Forwarded-For is set by nginx to the address of the client taken by real_ip from the load balancer
+    'NUM_PROXIES':
+    1,
 }
 
+# the rate limits of the views by their throttle_scope, see apps.common.throttling
+RATE_LIMIT_ENABLED = envs.RATE_LIMIT_ENABLED
+RATE_LIMITS = {
+    'login_ip': '30/min',
+    'login_phone_number': '5/min',
+    'register_ip': '10/min',
+    'register_phone_number': '3/min',
+    'refresh_ip': '60/min',
+}
+
+# in-process cache of the authenticated users, see apps.user.cache
+USER_CACHE_TTL = 60  # seconds
+USER_CACHE_MAX_SIZE = 4096
+
+# hard deletion of the soft deleted rows, see apps.common.purge
+# the orders come before the selections, which are purged only after their orders are gone
+SOFT_DELETE_PURGE_MODELS = (
+    'order.Order',
+    'order.Selection',
+    'restaurant.MenuInformation',
+    'credit_card.CreditCard',
+)
+SOFT_DELETE_RETENTION_DAYS = 30
+SOFT_DELETE_PURGE_LOCK_TIMEOUT = '2s'
+
+# cache of the rendered restaurant documents, see apps.restaurant.cache
+RESTAURANT_CACHE_ALIAS = 'default'
+RESTAURANT_CACHE_TIMEOUT = 60 * 60  # seconds
+
+# radius of /api/restaurants/nearby, see apps.restaurant.nearby
+NEARBY_RESTAURANT_DEFAULT_RADIUS = 3000  # meters
+NEARBY_RESTAURANT_MAX_RADIUS = 20000
+
+# delivery estimates of the listed restaurants, see apps.restaurant.delivery
+DELIVERY_FEE_BASE_DISTANCE = 1500  # meters covered by the minimum delivery cost
+DELIVERY_FEE_PER_KM = 500
+DELIVERY_FEE_UNIT = 100
+DELIVERY_ROAD_FACTOR = 1.3  # road distance over the straight line
+DELIVERY_SPEED = 20  # km/h
+DELIVERY_PREPARATION_MINUTES = 15
+
+# the Idempotency-Key header of the mutating endpoints, see apps.common.idempotency
+IDEMPOTENCY_KEY_TTL = 24 * 60 * 60  # seconds
+IDEMPOTENCY_KEY_WAIT_TIMEOUT = '10s'  # for the request holding the same key
+
+# the selections of an order, see apps.order.checkout
+ORDER_MAX_SELECTIONS = 50
+
+# the carts kept in the cache until the checkout, see apps.order.cart
+CART_CACHE_ALIAS = 'default'
+CART_TTL = 7 * 24 * 60 * 60  # seconds after the last change
+CART_MAX_ITEMS = ORDER_MAX_SELECTIONS
+
+# the daily sales of the restaurants, see apps.sales.rollups
+SALES_TIME_ZONE = 'Asia/Seoul'  # of the days
+SALES_MAX_DAYS = 366  # read at once by /api/sales
+EXPORT_MAX_DAYS = 31  # exported at once by /api/exports/orders, see apps.sales.export
+EXPORT_CHUNK_SIZE = 2000  # orders fetched and prefetched at once
+
+# the server-sent events of pangpangeats.asgi, see apps.common.sse
+EVENT_BROKER = envs.EVENT_BROKER
+EVENT_STREAM_HEARTBEAT = 15  # seconds
+EVENT_STREAM_QUEUE_SIZE = 100  # events a client may fall behind by
+EVENT_STREAM_RETRY = 3000  # milliseconds before the clients reconnect
+EVENT_STREAM_TICKET_TTL = 30  # seconds a ticket of apps.common.sse may open a stream in
+
+# the query budgets of the views checked at runtime, see apps.common.budget
+QUERY_BUDGET_MODE = envs.QUERY_BUDGET_MODE  # '', 'log' or 'raise'
+
+# the metrics of the requests served at /metrics, see apps.common.metrics
+METRICS_ENABLED = envs.METRICS_ENABLED
+
+# the Server-Timing header of the responses, see apps.common.timing
+SERVER_TIMING_ENABLED = envs.SERVER_TIMING_ENABLED
+
+# the profiles of the requests on demand of the staff, see apps.common.profiling
+PROFILE_DIR = envs.PROFILE_DIR
+PROFILE_RATE_LIMIT = 6  # profiles a minute in each process
+PROFILE_SAMPLE_INTERVAL = 0.005  # seconds between the samples
+PROFILE_MAX_FILES = 100
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "PANGPANG EATS API",
     "DESCRIPTION": "PANGPANG EATS API",
@@ -17,10 +17,12 @@ from django.urls import path, include
 from django.contrib import admin
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
 from api import urls as api_urls
+from apps.common.views import metrics
 
 urlpatterns = [
     path('api/', include(api_urls)),
     path('admin/', admin.site.urls),
+    path('metrics', metrics),
     path('schema/', SpectacularAPIView.as_view(), name='schema'),
     path('schema/swagger-ui/',
          SpectacularSwaggerView.as_view(),